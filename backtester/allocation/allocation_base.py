@@ -3,6 +3,7 @@ import pandas as pd
 from typing import Union
 import datetime
 import quantkit.mathstats.regression.ols_regression as lr
+import quantkit.backtester.allocation.allocation_ledger as allocation_ledger
 
 
 class Allocation(object):
@@ -34,7 +35,9 @@ class Allocation(object):
         self.return_engine = return_engine
         self.portfolio_leverage = portfolio_leverage
         self.allocations = None
-        self.allocations_history = dict()
+        self.allocations_history = allocation_ledger.AllocationLedger(
+            self.num_total_assets
+        )
         self.ex_post_betas = pd.DataFrame(
             columns=["Mkt-RF", "SMB", "HML", "RMW", "CMA", "r_squared"]
         )
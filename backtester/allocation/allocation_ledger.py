@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import datetime
+from collections.abc import Mapping
+
+
+class AllocationLedger(Mapping):
+    """
+    History of allocations stored in a preallocated (dates x assets) array
+    Can be used like a dictionary of date -> allocation,
+    the array grows by doubling its capacity when full
+
+    Parameters
+    ----------
+    num_assets: int
+        number of assets in universe
+    capacity: int, optional
+        number of preallocated dates
+    """
+
+    def __init__(self, num_assets: int, capacity: int = 64) -> None:
+        self.num_assets = num_assets
+        self.matrix = np.full((max(capacity, 1), num_assets), np.nan)
+        self.dates = list()
+        self.locs = dict()
+
+    def __setitem__(self, date: datetime.date, allocation: np.ndarray) -> None:
+        loc = self.locs.get(date)
+        if loc is None:
+            loc = len(self.dates)
+            if loc == self.matrix.shape[0]:
+                self.grow()
+            self.locs[date] = loc
+            self.dates.append(date)
+        self.matrix[loc] = allocation
+
+    def __getitem__(self, date: datetime.date) -> np.ndarray:
+        return self.matrix[self.locs[date]]
+
+    def __iter__(self):
+        return iter(self.dates)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def grow(self) -> None:
+        """
+        Double capacity of allocation array
+        """
+        new_matrix = np.full(
+            (2 * self.matrix.shape[0], self.num_assets), np.nan, dtype=float
+        )
+        new_matrix[: self.matrix.shape[0]] = self.matrix
+        self.matrix = new_matrix
+
+    def previous(self, date: datetime.date) -> np.ndarray:
+        """
+        Allocation before date, NaN for first date
+
+        Parameters
+        ----------
+        date : datetime.date
+            date of allocation
+
+        Returns
+        -------
+        np.array
+            previous allocation in the order of universe
+        """
+        loc = self.locs[date]
+        if loc == 0:
+            return np.full(self.num_assets, np.nan)
+        return self.matrix[loc - 1]
+
+    @property
+    def allocations(self) -> np.ndarray:
+        """
+        All allocations
+
+        Returns
+        -------
+        np.array
+            allocations, one row per date in the order of universe
+        """
+        return self.matrix[: len(self.dates)]
+
+    def to_frame(self, columns: list = None) -> pd.DataFrame:
+        """
+        All allocations as DataFrame
+
+        Parameters
+        ----------
+        columns: list, optional
+            asset names in the order of universe
+
+        Returns
+        -------
+        pd.DataFrame
+            allocations with dates as index and assets as columns
+        """
+        return pd.DataFrame(
+            self.allocations.copy(), index=list(self.dates), columns=columns
+        )
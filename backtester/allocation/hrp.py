@@ -215,7 +215,10 @@ class HierarchicalRiskParity(allocation_base.Allocation):
             list of selected assets (their location in universe as integer)
         """
         risk_metrics = self.risk_engine.risk_metrics_optimizer
-        risk_metrics = risk_metrics[np.ix_(selected_assets, selected_assets)]
+        # clustering needs dense matrix, also for factored covariance
+        risk_metrics = np.asarray(
+            risk_metrics[np.ix_(selected_assets, selected_assets)]
+        )
         self.optimizer = HRPOptimizer(
             universe=selected_assets,
             cov_matrix=risk_metrics,
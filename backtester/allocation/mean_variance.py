@@ -2,7 +2,6 @@ import quantkit.backtester.allocation.portfolio_optimizer as portfolio_optimizer
 import quantkit.backtester.allocation.allocation_base as allocation_base
 import pandas as pd
 import numpy as np
-import cvxpy as cvx
 from typing import Union
 import datetime
 
@@ -24,8 +23,8 @@ class MeanVarianceOptimizer(portfolio_optimizer.PortfolioOptimizer):
     ----------
     universe: list
         investment universe
-    cov_matrix: np.array
-        covariance matrix
+    cov_matrix: np.array | FactorCovarianceMatrix
+        covariance matrix, dense or in factored form
     risk_averse_lambda: float, optional
         lambda determining weighting between return and risk
     min_weights: float | np.array
@@ -45,8 +44,7 @@ class MeanVarianceOptimizer(portfolio_optimizer.PortfolioOptimizer):
         max_weights: Union[float, np.ndarray] = 1.0,
     ) -> None:
         super().__init__(universe)
-        # PSD: positive semi-definite
-        self.cov_matrix = cvx.atoms.affine.wraps.psd_wrap(cov_matrix)
+        self.cov_matrix = cov_matrix
         self.exp_returns = self._get_parameter(shape=self.asset_count)
         self.risk_averse_lambda = self._get_parameter(
             value=risk_averse_lambda, pos=True
@@ -65,7 +63,7 @@ class MeanVarianceOptimizer(portfolio_optimizer.PortfolioOptimizer):
         argmax_w (w^T*R - \lambda w^T\Sigma w)
         """
         return_term = self.weights.T @ self.exp_returns
-        risk_term = self._quad_form(self.weights, self.cov_matrix)
+        risk_term = self._portfolio_variance(self.cov_matrix)
         self._objective = self._maximize(
             return_term - self.risk_averse_lambda * risk_term
         )
@@ -206,8 +204,8 @@ class VolTargetOptimizer(portfolio_optimizer.PortfolioOptimizer):
         investment universe
     vol_target: float
         volatility target
-    cov_matrix: np.array
-        covariance matrix
+    cov_matrix: np.array | FactorCovarianceMatrix
+        covariance matrix, dense or in factored form
     min_weights: float | np.array
         lower bound for weights
     max_weights: float | list, np.array
@@ -223,8 +221,7 @@ class VolTargetOptimizer(portfolio_optimizer.PortfolioOptimizer):
         max_weights: Union[float, np.ndarray] = 1.0,
     ) -> None:
         super().__init__(universe)
-        # PSD: positive semi-definite
-        self.cov_matrix = cvx.atoms.affine.wraps.psd_wrap(cov_matrix)
+        self.cov_matrix = cov_matrix
         self.vol_target = vol_target
         self.exp_returns = self._get_parameter(shape=self.asset_count)
         self.min_weights = min_weights
@@ -258,7 +255,7 @@ class VolTargetOptimizer(portfolio_optimizer.PortfolioOptimizer):
         )
         self._add_constraint(self._sum(self.weights) == 1)
         self._add_constraint(
-            self._quad_form(self.weights, self.cov_matrix) <= self.vol_target**2
+            self._portfolio_variance(self.cov_matrix) <= self.vol_target**2
         )
 
 
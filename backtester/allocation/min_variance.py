@@ -2,7 +2,6 @@ import quantkit.backtester.allocation.allocation_base as allocation_base
 import quantkit.backtester.allocation.portfolio_optimizer as portfolio_optimizer
 import numpy as np
 import scipy as sp
-import cvxpy as cvx
 from typing import Union
 import datetime
 
@@ -24,8 +23,8 @@ class MinVarianceOptimizer(portfolio_optimizer.PortfolioOptimizer):
     ----------
     universe: list
         investment universe
-    cov_matrix: np.array
-        covariance matrix
+    cov_matrix: np.array | FactorCovarianceMatrix
+        covariance matrix, dense or in factored form
     min_weights: float | np.array
         lower bound for weights
     max_weights: float | list, np.array
@@ -43,8 +42,7 @@ class MinVarianceOptimizer(portfolio_optimizer.PortfolioOptimizer):
         leverage: float = None,
     ) -> None:
         super().__init__(universe, leverage=leverage)
-        # PSD: positive semi-definite
-        self.cov_matrix = cvx.atoms.affine.wraps.psd_wrap(cov_matrix)
+        self.cov_matrix = cov_matrix
         self.min_weights = min_weights
         self.max_weights = max_weights
         self.add_objective()
@@ -58,7 +56,7 @@ class MinVarianceOptimizer(portfolio_optimizer.PortfolioOptimizer):
         ----
         argmin_w (1/2 w^T\Sigma w)
         """
-        risk_term = 0.5 * self._quad_form(self.weights, self.cov_matrix)
+        risk_term = 0.5 * self._portfolio_variance(self.cov_matrix)
         self._objective = self._minimize(risk_term)
 
     def add_constraints(self) -> None:
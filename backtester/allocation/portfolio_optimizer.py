@@ -1,5 +1,7 @@
 import quantkit.mathstats.optimizer.convex_optimizer as convex_optimizer
+import quantkit.mathstats.covariance.factor_covariance as factor_covariance
 import numpy as np
+import cvxpy as cvx
 from typing import Union
 
 
@@ -53,6 +55,33 @@ class PortfolioOptimizer(convex_optimizer.CVXPYOptimizer):
         if max_weights is not None:
             self._add_constraint(self.weights + 1e-6 <= max_weights)
 
+    def _portfolio_variance(self, cov_matrix):
+        r"""
+        Portfolio variance w^T\Sigma w as cvxpy expression
+        For a covariance matrix in factored form \Sigma = L L' + diag(d),
+        ||L'w||^2 + d w^2 is used without creating the dense matrix
+
+        Parameters
+        ----------
+        cov_matrix: np.array | FactorCovarianceMatrix
+            covariance matrix
+
+        Returns
+        -------
+        cvxpy expression
+            portfolio variance
+        """
+        if isinstance(cov_matrix, factor_covariance.FactorCovarianceMatrix):
+            return cvx.sum_squares(
+                cov_matrix.factor_loadings.T @ self.weights
+            ) + self._sum(
+                self._multiply(cov_matrix.specific_variance, cvx.square(self.weights))
+            )
+        # PSD: positive semi-definite
+        return self._quad_form(
+            self.weights, cvx.atoms.affine.wraps.psd_wrap(cov_matrix)
+        )
+
     def _solve(self) -> None:
         """
         Solve the problem by optimizing the objective function using the constraints
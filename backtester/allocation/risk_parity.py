@@ -1,7 +1,6 @@
 import quantkit.backtester.allocation.portfolio_optimizer as portfolio_optimizer
 import quantkit.backtester.allocation.allocation_base as allocation_base
 import numpy as np
-import cvxpy as cvx
 from typing import Union
 import datetime
 
@@ -24,8 +23,8 @@ class TraditionalRPOptimizer(portfolio_optimizer.PortfolioOptimizer):
     ----------
     universe: list
         investment universe
-    cov_matrix: np.array
-        covariance matrix
+    cov_matrix: np.array | FactorCovarianceMatrix
+        covariance matrix, dense or in factored form
     risk_budgets, np.array
         amount of total risk each asset can take in final portfolio
     long_only: bool, optional
@@ -47,8 +46,7 @@ class TraditionalRPOptimizer(portfolio_optimizer.PortfolioOptimizer):
     ) -> None:
         super().__init__(universe, long_only, leverage, verbose=verbose)
         self.risk_budgets = risk_budgets
-        # PSD: positive semi-definite
-        self.cov_matrix = cvx.atoms.affine.wraps.psd_wrap(cov_matrix)
+        self.cov_matrix = cov_matrix
         # Having theta to save computational complexity
         self.theta = self._get_variable(nonneg=True)
 
@@ -64,7 +62,7 @@ class TraditionalRPOptimizer(portfolio_optimizer.PortfolioOptimizer):
         ----
         argmin_w (0.5*w^T\Sigma w - b*log(w))
         """
-        risk_term = 0.5 * self._quad_form(self.weights, self.cov_matrix)
+        risk_term = 0.5 * self._portfolio_variance(self.cov_matrix)
         log_term = self.risk_budgets @ self._log(self.weights)
         self._objective = self._minimize(risk_term - log_term)
 
@@ -0,0 +1,485 @@
+import quantkit.backtester.runner_backtester as runner_backtester
+import quantkit.backtester.data_loader.synthetic_datasource as synthetic_datasource
+import quantkit.utils.mapping_configs as mapping_configs
+import quantkit.utils.logging as logging
+import quantkit.mathstats.mean.simple_mean as simple_mean
+import quantkit.mathstats.mean.expo_weighted_mean as expo_weighted_mean
+import quantkit.mathstats.mean.rolling_mean as rolling_mean
+import quantkit.mathstats.sum.rolling_cumsum as rolling_cumsum
+import quantkit.mathstats.covariance.simple_covariance as simple_covariance
+import quantkit.mathstats.covariance.expo_covariance as expo_covariance
+import quantkit.mathstats.extremum.rolling_extremum as rolling_extremum
+import pandas as pd
+import numpy as np
+from collections import defaultdict
+from copy import deepcopy
+import datetime
+import platform
+import tracemalloc
+import argparse
+import json
+import time
+import gc
+
+allocation_models = [
+    "equal_weight",
+    "market_weight",
+    "min_variance",
+    "constrained_mean_variance",
+    "risk_parity",
+    "hrp",
+]
+
+default_params = {
+    "prices_datasource": {"frequency": "DAY", "rebalance": "MONTH"},
+    "default_weights_constraint": [0.0, 1.0],
+    "weight_constraint": {},
+    "allocation_limit": {"limited_assets": [], "limit": 0.0, "allocate_to": "equal"},
+    "trans_cost": 0.001,
+    "backtest_mode": "streaming",
+    "strategies": {
+        "momentum": {
+            "type": "momentum",
+            "return_engine": "cumprod",
+            "risk_engine": "log_normal",
+            "return_window_size": 252,
+            "risk_window_size": 63,
+            "top_n": 20,
+            "stop_loss": "high_low",
+            "stop_loss_threshold": 0.1,
+            "portfolio_leverage": 1,
+            "allocation_models": allocation_models,
+        },
+        "mean_reversion": {
+            "type": "mean_reversion",
+            "return_engine": "log_normal",
+            "risk_engine": "log_normal",
+            "return_window_size": 21,
+            "risk_window_size": 63,
+            "decile": 5,
+            "fraud_threshold": 0.8,
+            "stop_loss": "buy_low",
+            "stop_loss_threshold": 0.1,
+            "portfolio_leverage": 1,
+            "allocation_models": allocation_models,
+        },
+        "pick_all": {
+            "type": "pick_all",
+            "return_engine": "cumprod",
+            "risk_engine": "log_normal",
+            "window_size": 63,
+            "stop_loss": None,
+            "stop_loss_threshold": 0.0,
+            "portfolio_leverage": 1,
+            "allocation_models": allocation_models,
+        },
+    },
+}
+
+
+class SyntheticRunner(runner_backtester.Runner):
+    """
+    Backtester on synthetic data, no database access needed
+    """
+
+    def init(
+        self,
+        params: dict,
+        n_tickers: int,
+        n_days: int,
+        seed: int = 0,
+    ) -> None:
+        """
+        - create synthetic datasources
+        - initialize strategies
+
+        Parameters
+        ----------
+        params: dict
+            backtester params, as in configs/backtester.json
+        n_tickers: int
+            number of tickers in universe
+        n_days: int
+            number of business days of returns
+        seed: int, optional
+            seed of random number generator
+        """
+        self.params = deepcopy(params)
+        self.annualize_factor = mapping_configs.annualize_factor_d.get(
+            self.params["prices_datasource"]["frequency"], 252
+        )
+        self.rebalance_window = mapping_configs.rebalance_window_d.get(
+            self.params["prices_datasource"]["rebalance"]
+        )
+
+        self.strategies = dict()
+        self.return_engines = dict()
+        self.risk_engines = dict()
+        self.checkpoint_params = dict()
+        self.resume_date = None
+
+        datasources = synthetic_datasource.synthetic_datasources(
+            n_tickers=n_tickers,
+            n_days=n_days,
+            rebalance=self.params["prices_datasource"]["rebalance"],
+            seed=seed,
+        )
+        for name, datasource in datasources.items():
+            setattr(self, name, datasource)
+        self.init_strategies()
+
+
+kernels = {
+    "simple_mean": (
+        lambda n: simple_mean.SimpleMean(n, geo_base=1, retention="none"),
+        lambda calculator, row: calculator.update(row),
+    ),
+    "expo_weighted_mean": (
+        lambda n: expo_weighted_mean.ExponentialWeightedMean(
+            n, geo_base=1, retention="none"
+        ),
+        lambda calculator, row: calculator.update(row, batch_weight=0.94),
+    ),
+    "rolling_mean": (
+        lambda n: rolling_mean.RollingMean(n, window_size=63, geo_base=1),
+        lambda calculator, row: calculator.update(
+            row, calculator.windowed_outgoing_row[0]
+        ),
+    ),
+    "rolling_cumsum": (
+        lambda n: rolling_cumsum.RollingCumSum(n, window_size=63),
+        lambda calculator, row: calculator.update(
+            row, calculator.windowed_outgoing_row[0]
+        ),
+    ),
+    "rolling_max": (
+        lambda n: rolling_extremum.RollingMax(n, window_size=63),
+        lambda calculator, row: calculator.update(row),
+    ),
+    "covariance": (
+        lambda n: simple_covariance.Covariance(n, geo_base=1),
+        lambda calculator, row: calculator.update(row),
+    ),
+    "expo_covariance": (
+        lambda n: expo_covariance.ExponentialWeightedCovariance(n, geo_base=1),
+        lambda calculator, row: calculator.update(row, batch_weight=0.94),
+    ),
+}
+
+
+class Benchmark(object):
+    """
+    Benchmark backtester throughput on synthetic data
+    Times init, run_strategies, each engine's assign, each allocation model's
+    update and allocate, and each strategy's backtest, and tracks peak memory.
+
+    Parameters
+    ----------
+    params: dict, optional
+        backtester params, default strategies with all allocation models
+    trace_memory: bool, optional
+        track peak memory with tracemalloc, slows down the backtest
+    seed: int, optional
+        seed of random number generator
+
+    Usage
+    -----
+    From command line:
+
+        python -m quantkit.backtester.benchmark --tickers 50 500 --days 2520
+            --rebalance MONTH --output benchmark.json
+    """
+
+    def __init__(
+        self, params: dict = None, trace_memory: bool = True, seed: int = 0
+    ) -> None:
+        self.params = deepcopy(default_params if params is None else params)
+        self.trace_memory = trace_memory
+        self.seed = seed
+        self.results = list()
+        self.kernel_results = list()
+
+    def instrument(self, obj, method: str, key: str) -> None:
+        """
+        Replace method of object with a timed version
+
+        Parameters
+        ----------
+        obj
+            object to time
+        method: str
+            name of method
+        key: str
+            name of timing
+        """
+        func = getattr(obj, method)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            self.timings[key] += time.perf_counter() - start
+            self.calls[key] += 1
+            return result
+
+        setattr(obj, method, timed)
+
+    def instrument_runner(self, runner: SyntheticRunner) -> None:
+        """
+        Time engines, allocation models and strategies of runner
+
+        Parameters
+        ----------
+        runner: SyntheticRunner
+            initialized runner
+        """
+        engines = [(f"return_engine.{n}", e) for n, e in runner.return_engines.items()]
+        engines += [(f"risk_engine.{n}", e) for n, e in runner.risk_engines.items()]
+        engines += [("portfolio_return_engine", runner.portfolio_return_engine)]
+        for name, engine in engines:
+            for method in ["assign", "assign_block"]:
+                self.instrument(engine, method, f"{name}.{method}")
+
+        for strat, strat_obj in runner.strategies.items():
+            self.instrument(strat_obj, "backtest", f"strategy.{strat}.backtest")
+            for allo, allo_obj in strat_obj.allocation_engines_d.items():
+                for method in ["update", "allocate"]:
+                    self.instrument(
+                        allo_obj, method, f"allocation.{strat}.{allo}.{method}"
+                    )
+
+    def run_case(
+        self,
+        n_tickers: int,
+        n_days: int,
+        rebalance: str = "MONTH",
+        backtest_mode: str = "streaming",
+    ) -> dict:
+        """
+        Benchmark one universe size, history length and rebalance frequency
+
+        Parameters
+        ----------
+        n_tickers: int
+            number of tickers in universe
+        n_days: int
+            number of business days of returns
+        rebalance: str, optional
+            rebalance frequency
+        backtest_mode: str, optional
+            "streaming" or "vectorized"
+
+        Returns
+        -------
+        dict
+            timings in seconds, number of calls and peak memory
+        """
+        self.timings = defaultdict(float)
+        self.calls = defaultdict(int)
+        params = deepcopy(self.params)
+        params["prices_datasource"]["rebalance"] = rebalance
+        params["backtest_mode"] = backtest_mode
+        params.pop("parallel", None)
+
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        runner = SyntheticRunner()
+        runner.init(params, n_tickers=n_tickers, n_days=n_days, seed=self.seed)
+        self.timings["init"] = time.perf_counter() - start
+
+        self.instrument_runner(runner)
+        start = time.perf_counter()
+        runner.run()
+        self.timings["run_strategies"] = time.perf_counter() - start
+
+        peak_memory = None
+        if self.trace_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1] / 1024**2
+            tracemalloc.stop()
+
+        result = dict(
+            n_tickers=n_tickers,
+            n_days=n_days,
+            rebalance=rebalance,
+            backtest_mode=backtest_mode,
+            n_rebalances=len(runner.prices_datasource.rebalance_dates),
+            peak_memory_mb=peak_memory,
+            timings=dict(self.timings),
+            calls=dict(self.calls),
+        )
+        self.results.append(result)
+        del runner
+        return result
+
+    def run(
+        self,
+        tickers: list,
+        days: list,
+        rebalances: list = ["MONTH"],
+        backtest_modes: list = ["streaming"],
+    ) -> list:
+        """
+        Benchmark all combinations of universe sizes, history lengths,
+        rebalance frequencies and backtest modes
+
+        Parameters
+        ----------
+        tickers: list
+            numbers of tickers in universe
+        days: list
+            numbers of business days of returns
+        rebalances: list, optional
+            rebalance frequencies
+        backtest_modes: list, optional
+            backtest modes
+
+        Returns
+        -------
+        list
+            result of each case
+        """
+        for n_tickers in tickers:
+            for n_days in days:
+                for rebalance in rebalances:
+                    for backtest_mode in backtest_modes:
+                        result = self.run_case(
+                            n_tickers, n_days, rebalance, backtest_mode
+                        )
+                        logging.log(
+                            f"{n_tickers} tickers, {n_days} days, {rebalance}, "
+                            f"{backtest_mode}: init {result['timings']['init']:.2f}s, "
+                            f"run {result['timings']['run_strategies']:.2f}s"
+                        )
+        return self.results
+
+    def run_kernels(self, tickers: list, n_updates: int = 252) -> list:
+        """
+        Microbenchmark of single row updates of streaming calculators
+        Times an update and measures peak memory of temporary arrays
+        allocated during updates, after a warm up of the calculator.
+        Peak memory is independent of the number of variables, apart from
+        the iteration buffer of numpy for broadcasting (at most 8192 elements).
+
+        Parameters
+        ----------
+        tickers: list
+            numbers of variables
+        n_updates: int, optional
+            number of timed updates
+
+        Returns
+        -------
+        list
+            time per update and peak temporary memory per calculator
+        """
+        rng = np.random.default_rng(self.seed)
+        for n_tickers in tickers:
+            returns = rng.normal(0.0005, 0.01, size=(2 * n_updates, n_tickers))
+            returns[rng.random(returns.shape) < 0.01] = np.nan
+            for name, (create, update) in kernels.items():
+                calculator = create(n_tickers)
+                for row in returns[:n_updates]:
+                    update(calculator, row)
+
+                gc.collect()
+                tracemalloc.start()
+                tracemalloc.reset_peak()
+                start_memory = tracemalloc.get_traced_memory()[0]
+                for row in returns[:10]:
+                    update(calculator, row)
+                peak_memory = tracemalloc.get_traced_memory()[1] - start_memory
+                tracemalloc.stop()
+
+                start = time.perf_counter()
+                for row in returns[n_updates:]:
+                    update(calculator, row)
+                seconds = (time.perf_counter() - start) / n_updates
+
+                result = dict(
+                    n_tickers=n_tickers,
+                    kernel=name,
+                    microseconds_per_update=seconds * 1e6,
+                    peak_temporary_bytes=peak_memory,
+                )
+                self.kernel_results.append(result)
+                logging.log(
+                    f"{name}, {n_tickers} tickers: {seconds * 1e6:.1f}us per update, "
+                    f"{peak_memory} bytes temporary memory"
+                )
+        return self.kernel_results
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Timings of all cases in long format
+
+        Returns
+        -------
+        pd.DataFrame
+            one row per case and timing
+        """
+        rows = list()
+        for result in self.results:
+            case = dict(
+                [(k, v) for k, v in result.items() if k not in ["timings", "calls"]]
+            )
+            for key, seconds in result["timings"].items():
+                rows.append(
+                    dict(
+                        **case,
+                        timing=key,
+                        seconds=seconds,
+                        calls=result["calls"].get(key, 1),
+                    )
+                )
+        return pd.DataFrame(rows)
+
+    def to_json(self, path: str) -> None:
+        """
+        Write results and machine information to json file
+
+        Parameters
+        ----------
+        path: str
+            file path
+        """
+        output = dict(
+            created=datetime.datetime.now().isoformat(),
+            machine=dict(
+                platform=platform.platform(),
+                processor=platform.processor(),
+                python=platform.python_version(),
+                numpy=np.__version__,
+                pandas=pd.__version__,
+            ),
+            params=self.params,
+            results=self.results,
+            kernel_results=self.kernel_results,
+        )
+        with open(path, "w") as f:
+            json.dump(output, f, indent=4, default=str)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark backtester")
+    parser.add_argument("--tickers", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--days", type=int, nargs="+", default=[2520])
+    parser.add_argument("--rebalance", nargs="+", default=["MONTH"])
+    parser.add_argument("--mode", nargs="+", default=["streaming"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--kernels", action="store_true")
+    parser.add_argument("--output", default="benchmark.json")
+    args = parser.parse_args()
+
+    benchmark = Benchmark(trace_memory=not args.no_memory, seed=args.seed)
+    if args.kernels:
+        benchmark.run_kernels(tickers=args.tickers)
+    benchmark.run(
+        tickers=args.tickers,
+        days=args.days,
+        rebalances=args.rebalance,
+        backtest_modes=args.mode,
+    )
+    benchmark.to_json(args.output)
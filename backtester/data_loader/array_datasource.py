@@ -0,0 +1,92 @@
+import quantkit.backtester.data_loader.fundamentals_datasource as fundamentals_datasource
+import quantkit.backtester.data_loader.marketmultiple_datasource as marketmultiple_datasource
+import quantkit.backtester.data_loader.portfolio_datasource as portfolio_datasource
+import pandas as pd
+import numpy as np
+
+
+class PricesArraySource(object):
+    """
+    Provide price returns from a return matrix already in memory,
+    p.e. attached to shared memory in a worker process
+
+    Parameters
+    ----------
+    returns: np.array
+        zero base price returns, one row per date and one column per ticker
+    dates: list
+        dates of returns
+    tickers: list
+        list of ordered tickers
+    rebalance_dates: list
+        rebalance dates
+    """
+
+    def __init__(
+        self, returns: np.ndarray, dates: list, tickers: list, rebalance_dates: list
+    ) -> None:
+        self.return_data = pd.DataFrame(
+            returns, index=pd.DatetimeIndex(dates), columns=tickers, copy=False
+        )
+        self.rebalance_dates = list(rebalance_dates)
+
+
+class FundamentalsArraySource(fundamentals_datasource.FundamentalsDataSource):
+    """
+    Provide fundamental information from arrays already in memory,
+    p.e. attached to shared memory in a worker process
+
+    Parameters
+    ----------
+    fundamentals: dict
+        kpi's as np.array, one row per release date and one column per ticker
+    dates: list
+        release dates
+    """
+
+    def __init__(self, fundamentals: dict, dates: list) -> None:
+        self.current_loc = 0
+        self.fundamentals = fundamentals
+        self.dates = list(dates)
+
+
+class MarketMultipleArraySource(marketmultiple_datasource.MarketMultipleDataSource):
+    """
+    Provide market multiples from arrays already in memory,
+    p.e. attached to shared memory in a worker process
+
+    Parameters
+    ----------
+    multiples: dict
+        market multiples as np.array, one value per date
+    dates: list
+        dates of market multiples
+    """
+
+    def __init__(self, multiples: dict, dates: list) -> None:
+        self.current_loc = 0
+        self.multiples = multiples
+        self.dates = list(dates)
+
+
+class PortfolioArraySource(portfolio_datasource.PortfolioDataSource):
+    """
+    Provide index components from a universe matrix already in memory,
+    p.e. attached to shared memory in a worker process
+
+    Parameters
+    ----------
+    universe_matrix: np.array
+        portfolio weights, one row per date and one column per ticker
+    dates: list
+        dates of universe
+    tickers: list
+        list of ordered tickers
+    """
+
+    def __init__(self, universe_matrix: np.ndarray, dates: list, tickers: list) -> None:
+        self.current_loc = 0
+        self.universe_matrix = universe_matrix
+        self.dates = list(dates)
+        self.all_tickers = list(tickers)
+        self.tickers = dict()
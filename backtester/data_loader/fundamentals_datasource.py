@@ -163,6 +163,23 @@ class FundamentalsDataSource(ds.DataSources):
             return_dict[fund] = self.fundamentals[fund][self.current_loc]
         return return_dict
 
+    def append_row(self, date: datetime.date, fundamentals: dict) -> None:
+        """
+        Add fundamentals of a new release date
+
+        Parameters
+        ----------
+        date: datetimte.date
+            release date, after all existing dates
+        fundamentals: dict
+            kpi's as np.array in the order of universe
+        """
+        self.dates.append(date)
+        for fund in self.fundamentals:
+            self.fundamentals[fund] = np.vstack(
+                [self.fundamentals[fund], fundamentals[fund]]
+            )
+
     @property
     def df(self) -> pd.DataFrame:
         """
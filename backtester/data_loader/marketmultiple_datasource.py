@@ -94,6 +94,21 @@ class MarketMultipleDataSource(ds.DataSources):
             return_dict[kpi] = self.multiples[kpi][self.current_loc]
         return return_dict
 
+    def append_row(self, date: datetime.date, multiples: dict) -> None:
+        """
+        Add market multiples of a new date
+
+        Parameters
+        ----------
+        date: datetimte.date
+            date, after all existing dates
+        multiples: dict
+            market multiples as float
+        """
+        self.dates.append(date)
+        for kpi in self.multiples:
+            self.multiples[kpi] = np.append(self.multiples[kpi], multiples[kpi])
+
     @property
     def df(self) -> pd.DataFrame:
         """
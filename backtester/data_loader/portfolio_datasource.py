@@ -6,8 +6,8 @@ import numpy as np
 import pandas as pd
 import os
 
+quant_core_db = os.environ.get("QUANT_CORE_DB", "tcw_core_dev")
 
-quant_core_db = os.environ.get('QUANT_CORE_DB', 'tcw_core_dev')
 
 class PortfolioDataSource(portfolio_datasource.PortfolioDataSource):
     """
@@ -420,6 +420,20 @@ class PortfolioDataSource(portfolio_datasource.PortfolioDataSource):
             self.current_loc += 1
         return self.universe_matrix[self.current_loc]
 
+    def append_row(self, date: datetime.date, index_components: np.ndarray) -> None:
+        """
+        Add consitutents of index universe for a new date
+
+        Parameters
+        ----------
+        date: datetimte.date
+            date, after all existing dates
+        index_components: np.array
+            portfolio weights in the order of universe
+        """
+        self.dates.append(date)
+        self.universe_matrix = np.vstack([self.universe_matrix, index_components])
+
     def is_valid(self, date: datetime.date) -> bool:
         """
         check if inputs are valid
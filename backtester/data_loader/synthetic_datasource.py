@@ -0,0 +1,105 @@
+import quantkit.backtester.data_loader.array_datasource as array_datasource
+import quantkit.backtester.financial_infrastructure.securities as securities
+import quantkit.utils.mapping_configs as mapping_configs
+import pandas as pd
+import numpy as np
+
+fundamental_kpis = [
+    "marketcap",
+    "divyield",
+    "roe",
+    "fcfps",
+    "pe",
+    "ps",
+    "pb",
+    "roic",
+    "ebit",
+    "ev",
+]
+market_multiples = ["SPX_PE", "SPX_PB", "SPX_PS"]
+
+
+def synthetic_datasources(
+    n_tickers: int,
+    n_days: int,
+    rebalance: str = "MONTH",
+    seed: int = 0,
+    start_date: str = "2000-01-03",
+    nan_share: float = 0.0005,
+) -> dict:
+    """
+    Create prices, fundamentals, market multiple and portfolio datasources
+    with random data, p.e. for benchmarks without database access
+
+    Parameters
+    ----------
+    n_tickers: int
+        number of tickers in universe
+    n_days: int
+        number of business days of returns
+    rebalance: str, optional
+        rebalance frequency, as in mapping_configs.pandas_translation
+    seed: int, optional
+        seed of random number generator
+    start_date: str, optional
+        first date of returns
+    nan_share: float, optional
+        share of missing returns
+
+    Returns
+    -------
+    dict
+        datasources by runner attribute name
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start_date, periods=n_days)
+    tickers = [f"T{i:05d}" for i in range(n_tickers)]
+
+    returns = rng.normal(0.0003, 0.015, (n_days, n_tickers))
+    returns[rng.random(returns.shape) < nan_share] = np.nan
+    returns[0] = np.nan
+
+    # rebalance dates -> last trading day of period
+    periods = dates.to_period(mapping_configs.pandas_translation[rebalance])
+    rebalance_dates = list(pd.Series(dates).groupby(periods).max())
+
+    # fundamentals and index components change quarterly
+    quarter_dates = list(
+        pd.date_range(dates[0] - pd.offsets.QuarterBegin(), dates[-1], freq="QS")
+    )
+    n_quarters = len(quarter_dates)
+    fundamentals = dict(
+        [
+            (kpi, rng.lognormal(1, 1, (n_quarters, n_tickers)))
+            for kpi in fundamental_kpis
+        ]
+    )
+    fundamentals["ev"] -= 1
+    multiples = dict(
+        [(kpi, rng.lognormal(1, 0.5, n_quarters)) for kpi in market_multiples]
+    )
+    universe_matrix = (rng.random((n_quarters, n_tickers)) < 0.9).astype(float)
+
+    portfolio_datasource = array_datasource.PortfolioArraySource(
+        universe_matrix=universe_matrix, dates=quarter_dates, tickers=tickers
+    )
+    for ticker in tickers:
+        portfolio_datasource.tickers[ticker] = securities.SecurityStore(
+            isin=ticker, information=dict()
+        )
+
+    return dict(
+        prices_datasource=array_datasource.PricesArraySource(
+            returns=returns,
+            dates=dates,
+            tickers=tickers,
+            rebalance_dates=rebalance_dates,
+        ),
+        fundamentals_datasource=array_datasource.FundamentalsArraySource(
+            fundamentals=fundamentals, dates=quarter_dates
+        ),
+        marketmultiple_datasource=array_datasource.MarketMultipleArraySource(
+            multiples=multiples, dates=quarter_dates
+        ),
+        portfolio_datasource=portfolio_datasource,
+    )
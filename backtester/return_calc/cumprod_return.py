@@ -81,6 +81,38 @@ class CumProdReturn(return_metrics.ReturnMetrics):
             (np.log(annualized_return + 1)), outgoing_row, index=date
         )
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+
+        Returns
+        -------
+        np.array
+            forecasted returns after each date of the block
+        """
+        annualized_return = annualize_adjustments.compound_annualization(
+            price_returns, annualize_factor
+        )
+        return self.return_calculator.update_block(
+            np.log(annualized_return + 1), indexes=dates
+        )
+
     def is_valid(self):
         """
         check if inputs are valid
@@ -59,6 +59,35 @@ class LogEWMA(log_return.LogReturn):
             index=date,
         )
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        annualized_return = annualize_adjustments.compound_annualization(
+            price_returns, annualize_factor
+        )
+        self.return_calculator.update_block(
+            np.log(annualized_return + 1),
+            batch_weight=self.decay_factor,
+            indexes=dates,
+        )
+
 
 class RollingLogEWMA(LogEWMA):
     """
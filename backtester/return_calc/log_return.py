@@ -1,6 +1,7 @@
 import quantkit.backtester.return_calc.return_metrics as return_metrics
 import quantkit.mathstats.mean.rolling_mean as rolling_mean
 import quantkit.mathstats.mean.numpy_mean as numpy_mean
+import quantkit.mathstats.median.rolling_quantile as rolling_quantile
 import quantkit.utils.annualize_adjustments as annualize_adjustments
 import numpy as np
 import pandas as pd
@@ -77,6 +78,30 @@ class LogReturn(return_metrics.ReturnMetrics):
             **kwargs,
         )
 
+    def get_portfolio_returns(self, allocations: np.ndarray, **kwargs) -> pd.DataFrame:
+        """
+        Calculate 0 basis portfolio returns of several allocations in one pass
+        Return a DataFrame with returns in frequency for each date in rebalance window
+
+        Parameters
+        ----------
+        allocations: np.array
+            current allocations, one row per portfolio
+
+        Returns
+        -------
+        pd.DataFrame
+            returns, one column per portfolio
+        """
+        this_returns = np.exp(self.return_calculator.data_stream.values)
+        this_dates = self.return_calculator.data_stream.indexes
+        return super().get_portfolio_returns(
+            allocations=allocations,
+            this_returns=this_returns,
+            indexes=this_dates,
+            **kwargs,
+        )
+
     def assign(
         self,
         date: datetime.date,
@@ -108,6 +133,33 @@ class LogReturn(return_metrics.ReturnMetrics):
             index=date,
         )
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        annualized_return = annualize_adjustments.compound_annualization(
+            price_returns, annualize_factor
+        )
+        self.return_calculator.update_block(
+            np.log(annualized_return + 1), indexes=dates
+        )
+
     def is_valid(self):
         """
         check if inputs are valid
@@ -118,3 +170,37 @@ class LogReturn(return_metrics.ReturnMetrics):
             True if inputs are valid, false otherwise
         """
         return self.return_calculator.is_valid()
+
+
+class LogMedianReturn(LogReturn):
+    """
+    Return Calculation assuming
+        - returns are log normal distributed
+        - rolling historical window
+        - median instead of mean, robust to outliers
+
+    Parameters
+    ----------
+    universe: list
+        investment universe
+    frequency: str, optional
+        frequency of index return data
+    """
+
+    def __init__(self, universe: list, frequency: str = None, **kwargs) -> None:
+        super().__init__(universe, frequency=frequency, **kwargs)
+        self.return_calculator = rolling_quantile.RollingQuantile(
+            num_ind_variables=self.universe_size, **kwargs
+        )
+
+    @property
+    def return_metrics_optimizer(self) -> np.ndarray:
+        """
+        Forecaseted returns from return engine
+
+        Returns
+        -------
+        np.array
+            returns
+        """
+        return self.return_calculator.median
@@ -1,6 +1,5 @@
 import numpy as np
 import pandas as pd
-import copy
 import datetime
 
 
@@ -63,6 +62,31 @@ class ReturnMetrics(object):
         """
         raise NotImplementedError
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        for date, price_return in zip(dates, price_returns):
+            self.assign(
+                date=date, price_return=price_return, annualize_factor=annualize_factor
+            )
+
     def get_portfolio_return(
         self,
         allocation: np.ndarray,
@@ -101,6 +125,65 @@ class ReturnMetrics(object):
         pd.DataFrame
             return: float
         """
+        return ReturnMetrics.get_portfolio_returns(
+            self,
+            allocations=np.expand_dims(allocation, axis=0),
+            this_returns=this_returns,
+            stopped_securities_matrix=stopped_securities_matrix,
+            indexes=indexes,
+            next_allocations=(
+                None
+                if next_allocation is None
+                else np.expand_dims(next_allocation, axis=0)
+            ),
+            trans_cost=trans_cost,
+            leverage=leverage,
+            columns=["return"],
+        )
+
+    def get_portfolio_returns(
+        self,
+        allocations: np.ndarray,
+        this_returns: np.ndarray,
+        stopped_securities_matrix: np.ndarray,
+        indexes: np.ndarray,
+        next_allocations: np.ndarray = None,
+        trans_cost: float = 0.0,
+        leverage: float = 1.0,
+        columns: list = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Calculate 0 basis portfolio returns of several allocations in one pass
+        Cumulative returns, traded securities and stop costs of the rebalance window
+        are calculated once and shared between all allocations
+
+        Parameters
+        ----------
+        allocations: np.array
+            current allocations, one row per portfolio
+        this_returns: np.array
+            forecasted returns per asset
+        stopped_securities_matrix: np.array
+            matrix of stopped securities per trading period
+        indexes: np.array
+            index column for returned DataFrame
+            should be set to date range
+        next_allocations: np.array, optional
+            next allocations, one row per portfolio,
+            used to calculate turnover and transaction costs
+        trans_cost: float, optional
+            transaction cost in %
+        leverage: float, optional
+            portfolio leverage
+        columns: list, optional
+            portfolio names
+
+        Returns
+        -------
+        pd.DataFrame
+            returns, one column per portfolio
+        """
         n_obs = len(this_returns)
         traded_m = np.bitwise_not(stopped_securities_matrix)
         first_stop = (
@@ -112,30 +195,33 @@ class ReturnMetrics(object):
         cumulative_returns = np.where(
             np.isnan(cumulative_returns), 0, cumulative_returns
         )
-        allocation = allocation / leverage
-        ending_allocation = allocation * cumulative_returns
+        allocations = np.asarray(allocations) / leverage
+        # (portfolios x dates x assets)
+        ending_allocations = allocations[:, np.newaxis, :] * cumulative_returns
         # Normalize ending allocation
-        ending_allocation = (
-            ending_allocation.T / np.nansum(ending_allocation, axis=1)
-        ).T * leverage
-        stopped_ending = ending_allocation * traded_m
+        ending_allocations = (
+            ending_allocations
+            / np.nansum(ending_allocations, axis=2, keepdims=True)
+            * leverage
+        )
+        stopped_ending = ending_allocations * traded_m
 
-        actual_returns = allocation @ cumulative_returns.T
-        actual_returns = np.insert(actual_returns, 0, 1)
-        actual_returns = np.diff(actual_returns) / actual_returns[:-1]
+        actual_returns = allocations @ cumulative_returns.T
+        actual_returns = np.insert(actual_returns, 0, 1, axis=1)
+        actual_returns = np.diff(actual_returns, axis=1) / actual_returns[:, :-1]
 
         # Subtract transaction costs
-        next_allocation_m = copy.deepcopy(ending_allocation)
-        next_allocation_m[-1] = next_allocation
         trans_cost_m = np.zeros((n_obs, self.universe_size))
         trans_cost_m[-1] = trans_cost
         trans_cost_m = np.max([trans_cost_m, first_stop], axis=0)
-        if next_allocation is not None:
-            turnover = abs(next_allocation_m - stopped_ending)
-            this_trans_cost = (turnover * trans_cost_m).sum(axis=1)
+        if next_allocations is not None:
+            next_allocations_m = ending_allocations.copy()
+            next_allocations_m[:, -1] = next_allocations
+            turnover = abs(next_allocations_m - stopped_ending)
+            this_trans_cost = (turnover * trans_cost_m).sum(axis=2)
             actual_returns -= this_trans_cost
 
-        return pd.DataFrame(data=actual_returns, index=indexes, columns=["return"])
+        return pd.DataFrame(data=actual_returns.T, index=indexes, columns=columns)
 
     def is_valid(self):
         """
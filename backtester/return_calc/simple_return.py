@@ -114,6 +114,42 @@ class SimpleExp(return_metrics.ReturnMetrics):
             **kwargs,
         )
 
+    def get_portfolio_returns(
+        self, allocations: np.ndarray, is_window: bool = False, **kwargs
+    ) -> pd.DataFrame:
+        """
+        Calculate 0 basis portfolio returns of several allocations in one pass
+        Return a DataFrame with returns in frequency for each date in rebalance window
+
+        Parameters
+        ----------
+        allocations: np.array
+            current allocations, one row per portfolio
+        is_window: bool, optional
+            calculate portfolio return based on simple or windowed returns
+
+        Returns
+        -------
+        pd.DataFrame
+            returns, one column per portfolio
+        """
+        if is_window:
+            this_returns = self.return_calculator_window.data_stream.values
+            this_dates = self.return_calculator_window.data_stream.indexes
+        else:
+            this_returns = self.return_calculator.data_stream.values
+            this_dates = self.return_calculator.data_stream.indexes
+
+        # This is necessary due to the structure of streaming module
+        this_returns = this_returns[:, 0, :]
+
+        return super().get_portfolio_returns(
+            allocations=allocations,
+            this_returns=this_returns,
+            indexes=this_dates,
+            **kwargs,
+        )
+
     def assign(
         self,
         date: datetime.date,
@@ -145,6 +181,32 @@ class SimpleExp(return_metrics.ReturnMetrics):
             index=date,
         )
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        annualized_return = annualize_adjustments.compound_annualization(
+            price_returns, annualize_factor
+        )
+        self.return_calculator.update_block(annualized_return, indexes=dates)
+        self.return_calculator_window.update_block(annualized_return, indexes=dates)
+
     def is_valid(self):
         """
         check if inputs are valid
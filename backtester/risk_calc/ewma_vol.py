@@ -1,3 +1,4 @@
+import quantkit.backtester.risk_calc.risk_metrics as risk_metrics
 import quantkit.backtester.risk_calc.log_vol as log_vol
 import quantkit.mathstats.covariance.expo_covariance as expo_covariance
 import quantkit.mathstats.time_series.decay as decay
@@ -19,17 +20,25 @@ class LogNormalEWMA(log_vol.WindowLogNormalVol):
         frequency of index return data
     half_life: int, optional
         length of time it takes to decrease to half of original amount
+    dtype: type, optional
+        float dtype of stored returns, p.e. np.float32 to halve memory of windows,
+        covariance is accumulated in float64
     """
 
     def __init__(
-        self, universe: list, frequency: str = None, half_life: int = 12, **kwargs
+        self,
+        universe: list,
+        frequency: str = None,
+        half_life: int = 12,
+        dtype: type = np.float64,
+        **kwargs,
     ) -> None:
-        super().__init__(universe, frequency, **kwargs)
+        super().__init__(universe, frequency, dtype, **kwargs)
         self.cov_calculator = expo_covariance.ExponentialWeightedCovariance(
-            num_ind_variables=self.universe_size, **kwargs
+            num_ind_variables=self.universe_size, dtype=dtype, **kwargs
         )
         self.cov_calculator_intuitive = expo_covariance.ExponentialWeightedCovariance(
-            num_ind_variables=self.universe_size, **kwargs
+            num_ind_variables=self.universe_size, dtype=dtype, **kwargs
         )
         self.decay_factor = decay.decay_factor(half_life)
 
@@ -59,6 +68,35 @@ class LogNormalEWMA(log_vol.WindowLogNormalVol):
         #     annualized_return, batch_weight=self.decay_factor, index=date
         # )
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        annualized_return = annualize_adjustments.compound_annualization(
+            price_returns, annualize_factor
+        )
+        self.cov_calculator.update_block(
+            np.log(annualized_return + 1),
+            batch_weight=self.decay_factor,
+            indexes=dates,
+        )
+
 
 class RollingLogNormalEWMA(LogNormalEWMA):
     """
@@ -79,3 +117,195 @@ class RollingLogNormalEWMA(LogNormalEWMA):
     def __init__(self, universe: list, frequency: str = None, span: int = 36, **kwargs):
         super().__init__(universe, frequency, **kwargs)
         self.decay_factor = decay.decay_span(span)
+
+
+class LogNormalEWMABank(risk_metrics.RiskMetrics):
+    """
+    Exponential Weighted Moving Average Covariance Calculation for several decay factors
+    in one pass, assuming
+        - returns are log normal distributed
+
+    Log returns and their outer product are calculated once per date for all decay factors.
+    Strategies read the covariance of one decay factor with BankedLogNormalEWMA.
+
+    Parameters
+    ----------
+    universe: list
+        investment universe
+    frequency: str, optional
+        frequency of index return data
+    decay_factors: list, optional
+        decay factors, more can be added before first assign
+    dtype: type, optional
+        float dtype of log returns, p.e. np.float32,
+        covariance is accumulated in float64
+    """
+
+    def __init__(
+        self,
+        universe: list,
+        frequency: str = None,
+        decay_factors: list = None,
+        dtype: type = np.float64,
+        **kwargs,
+    ) -> None:
+        super().__init__(universe)
+        self.frequency = frequency
+        self.dtype = dtype
+        self.cov_calculator = expo_covariance.ExponentialWeightedCovarianceBank(
+            num_ind_variables=self.universe_size,
+            decay_factors=decay_factors,
+            dtype=dtype,
+        )
+        # number of consecutive observations without missing value per asset
+        self.valid_streak = np.zeros(self.universe_size, dtype=int)
+
+    def add_decay_factor(self, decay_factor: float) -> None:
+        """
+        Add decay factor to bank, only possible before first assign
+
+        Parameters
+        ----------
+        decay_factor: float
+            weight of previous observations, between 0 and 1
+        """
+        self.cov_calculator.add_decay_factor(decay_factor)
+
+    def assign(
+        self, date: datetime.date, price_return: np.ndarray, annualize_factor: int = 1.0
+    ) -> None:
+        """
+        Transform to log scale and assign returns to the actual calculator
+
+        Parameters
+        ----------
+        date: datetime.date
+            date of snapshot
+        price_return: np.array
+            zero base price return of universe
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        annualized_return = annualize_adjustments.compound_annualization(
+            price_return, annualize_factor
+        )
+        annualized_return = np.squeeze(annualized_return)
+        self.cov_calculator.update(np.log(annualized_return + 1))
+        self.valid_streak = np.where(
+            np.isnan(annualized_return), 0, self.valid_streak + 1
+        )
+
+    def is_valid(self):
+        """
+        check if inputs are valid
+
+        Returns
+        -------
+        bool
+            True if inputs are valid, false otherwise
+        """
+        return self.cov_calculator.is_valid()
+
+
+class BankedLogNormalEWMA(log_vol.LogNormalVol):
+    """
+    Exponential Weighted Moving Average Covariance of one decay factor of a
+    LogNormalEWMABank. Returns are assigned to the bank, assigning this engine does nothing.
+
+    Parameters
+    ----------
+    bank: LogNormalEWMABank
+        bank calculating covariance of all decay factors
+    decay_factor: float
+        weight of previous observations, added to bank
+    window_size: int, optional
+        number of observations without missing value for an asset to be valid
+    """
+
+    def __init__(
+        self,
+        bank: LogNormalEWMABank,
+        decay_factor: float,
+        window_size: int = 1,
+        **kwargs,
+    ) -> None:
+        risk_metrics.RiskMetrics.__init__(self, bank.universe)
+        self.frequency = bank.frequency
+        self.dtype = bank.dtype
+        self.bank = bank
+        self.decay_factor = decay_factor
+        self.window_size = window_size
+        self.bank.add_decay_factor(decay_factor)
+
+    @property
+    def cov(self) -> np.ndarray:
+        """
+        Forecaseted log normal exponential weighted covariance matrix from bank
+
+        Returns
+        -------
+        np.array
+            covariance matrix
+        """
+        return self.bank.cov_calculator.get_cov(self.decay_factor)
+
+    @property
+    def valid_assets(self) -> np.ndarray:
+        """
+        Assets without missing returns in last window_size observations
+
+        Returns
+        -------
+        np.array
+            boolean mask of universe
+        """
+        return self.bank.valid_streak >= self.window_size
+
+    def assign(
+        self, date: datetime.date, price_return: np.ndarray, annualize_factor: int = 1.0
+    ) -> None:
+        """
+        Returns are assigned to the bank
+
+        Parameters
+        ----------
+        date: datetime.date
+            date of snapshot
+        price_return: np.array
+            zero base price return of universe
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        pass
+
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Returns are assigned to the bank
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        pass
+
+    def is_valid(self):
+        """
+        check if inputs are valid
+
+        Returns
+        -------
+        bool
+            True if inputs are valid, false otherwise
+        """
+        return self.bank.cov_calculator.total_iterations >= self.window_size
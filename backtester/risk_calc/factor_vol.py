@@ -0,0 +1,132 @@
+import quantkit.backtester.risk_calc.risk_metrics as risk_metrics
+import quantkit.backtester.risk_calc.log_vol as log_vol
+import quantkit.mathstats.covariance.factor_covariance as factor_covariance
+import quantkit.utils.annualize_adjustments as annualize_adjustments
+import numpy as np
+import datetime
+
+
+class FactorVol(log_vol.LogNormalVol):
+    """
+    Statistical Factor Covariance Calculation assuming
+        - returns are log normal distributed
+        - covariance is explained by K statistical factors and specific risk
+        - exponential weights with span
+
+    The covariance matrix is returned in factored form (N x K loadings and
+    N specific variances), so optimizers don't need the dense (N x N) matrix.
+
+    Parameters
+    ----------
+    universe: list
+        investment universe
+    frequency: str, optional
+        frequency of index return data
+    num_factors: int, optional
+        number of statistical factors
+    window_size: int, optional
+        span of exponential weights
+    dtype: type, optional
+        float dtype of log returns, p.e. np.float32,
+        factors are calculated in float64
+    """
+
+    def __init__(
+        self,
+        universe: list,
+        frequency: str = None,
+        num_factors: int = 5,
+        window_size: int = 63,
+        dtype: type = np.float64,
+        **kwargs,
+    ) -> None:
+        # no dense covariance calculator of parent class
+        risk_metrics.RiskMetrics.__init__(self, universe)
+        self.frequency = frequency
+        self.dtype = dtype
+        self.window_size = window_size
+        self.cov_calculator = factor_covariance.FactorCovariance(
+            num_ind_variables=self.universe_size,
+            num_factors=num_factors,
+            span=window_size,
+            dtype=dtype,
+        )
+        # number of consecutive observations without missing value per asset
+        self.valid_streak = np.zeros(self.universe_size, dtype=int)
+
+    @property
+    def valid_assets(self) -> np.ndarray:
+        """
+        Assets without missing returns in last window_size observations
+
+        Returns
+        -------
+        np.array
+            boolean mask of universe
+        """
+        return self.valid_streak >= self.window_size
+
+    def assign(
+        self, date: datetime.date, price_return: np.ndarray, annualize_factor: int = 1.0
+    ) -> None:
+        """
+        Transform to log scale and assign returns to the actual calculator
+
+        Parameters
+        ----------
+        date: datetime.date
+            date of snapshot
+        price_return: np.array
+            zero base price return of universe
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        annualized_return = annualize_adjustments.compound_annualization(
+            price_return, annualize_factor
+        )
+        annualized_return = np.squeeze(annualized_return)
+        self.cov_calculator.update(np.log(annualized_return + 1))
+        self.valid_streak = np.where(
+            np.isnan(annualized_return), 0, self.valid_streak + 1
+        )
+
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        for date, price_return in zip(dates, price_returns):
+            self.assign(
+                date=date, price_return=price_return, annualize_factor=annualize_factor
+            )
+
+    def get_portfolio_risk(self, allocation: np.ndarray) -> float:
+        """
+        calculate 0 basis risk from factored covariance matrix
+
+        Parameters
+        ----------
+        allocation: np.array
+            allocation factor at the order of factors
+
+        Returns
+        -------
+        float
+            portfolio risk
+        """
+        return np.sqrt(allocation @ (self.risk_metrics_optimizer @ allocation))
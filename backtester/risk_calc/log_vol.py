@@ -18,13 +18,23 @@ class LogNormalVol(risk_metrics.RiskMetrics):
         investment universe
     frequency: str, optional
         frequency of index return data
+    dtype: type, optional
+        float dtype of stored returns, p.e. np.float32 to halve memory of windows,
+        covariance is accumulated in float64
     """
 
-    def __init__(self, universe: list, frequency: str = None, **kwargs) -> None:
+    def __init__(
+        self,
+        universe: list,
+        frequency: str = None,
+        dtype: type = np.float64,
+        **kwargs,
+    ) -> None:
         super().__init__(universe)
         self.frequency = frequency
+        self.dtype = dtype
         self.cov_calculator = numpy_covariance.NumpyCovariance(
-            num_ind_variables=self.universe_size, **kwargs
+            num_ind_variables=self.universe_size, dtype=dtype, **kwargs
         )
 
     @property
@@ -98,6 +108,31 @@ class LogNormalVol(risk_metrics.RiskMetrics):
         annualized_return = np.squeeze(annualized_return)
         self.cov_calculator.update(np.log(annualized_return + 1), index=date)
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        annualized_return = annualize_adjustments.compound_annualization(
+            price_returns, annualize_factor
+        )
+        self.cov_calculator.update_block(np.log(annualized_return + 1), indexes=dates)
+
     def get_portfolio_risk(self, allocation: np.ndarray) -> float:
         """
         calculate 0 basis return and risk
@@ -143,10 +178,19 @@ class WindowLogNormalVol(LogNormalVol):
         investment universe
     frequency: str, optional
         frequency of index return data
+    dtype: type, optional
+        float dtype of stored returns, p.e. np.float32 to halve memory of windows,
+        covariance is accumulated in float64
     """
 
-    def __init__(self, universe: list, frequency: str = None, **kwargs) -> None:
-        super().__init__(universe, frequency, **kwargs)
+    def __init__(
+        self,
+        universe: list,
+        frequency: str = None,
+        dtype: type = np.float64,
+        **kwargs,
+    ) -> None:
+        super().__init__(universe, frequency, dtype, **kwargs)
         self.cov_calculator = numpy_covariance.NumpyWindowCovariance(
-            num_ind_variables=self.universe_size, **kwargs
+            num_ind_variables=self.universe_size, dtype=dtype, **kwargs
         )
@@ -28,6 +28,19 @@ class RiskMetrics(object):
         """
         raise NotImplementedError
 
+    @property
+    def valid_assets(self) -> np.ndarray:
+        """
+        Assets without missing returns in window of risk engine,
+        from missing value counters of data stream
+
+        Returns
+        -------
+        np.array
+            boolean mask of universe
+        """
+        return self.cov_calculator.data_stream.valid_mask.squeeze()
+
     @property
     def risk_metrics_intuitive(self) -> np.ndarray:
         """
@@ -60,6 +73,31 @@ class RiskMetrics(object):
         """
         raise NotImplementedError
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        for date, price_return in zip(dates, price_returns):
+            self.assign(
+                date=date, price_return=price_return, annualize_factor=annualize_factor
+            )
+
     @property
     def is_valid(self):
         """
@@ -18,18 +18,41 @@ class SimpleVol(risk_metrics.RiskMetrics):
         investment universe
     frequency: str, optional
         frequency of index return data
+    dtype: type, optional
+        float dtype of stored returns, p.e. np.float32 to halve memory of windows,
+        covariance is accumulated in float64
     """
 
-    def __init__(self, universe: list, frequency: int = None, **kwargs) -> int:
+    def __init__(
+        self,
+        universe: list,
+        frequency: int = None,
+        dtype: type = np.float64,
+        **kwargs,
+    ) -> int:
         super().__init__(universe)
         self.frequency = frequency
+        self.dtype = dtype
         self.cov_calculator = simple_covariance.Covariance(
-            num_ind_variables=self.universe_size, **kwargs
+            num_ind_variables=self.universe_size, dtype=dtype, **kwargs
         )
         self.window_cov_calculator = numpy_covariance.NumpyWindowCovariance(
-            num_ind_variables=self.universe_size, **kwargs
+            num_ind_variables=self.universe_size, dtype=dtype, **kwargs
         )
 
+    @property
+    def valid_assets(self) -> np.ndarray:
+        """
+        Assets without missing returns in window of rolling covariance,
+        from missing value counters of its data stream
+
+        Returns
+        -------
+        np.array
+            boolean mask of universe
+        """
+        return self.window_cov_calculator.data_stream.valid_mask.squeeze()
+
     @property
     def risk_metrics_optimizer(self) -> np.ndarray:
         """
@@ -149,6 +172,32 @@ class SimpleVol(risk_metrics.RiskMetrics):
         self.cov_calculator.update(annualized_return, index=date)
         self.window_cov_calculator.update(annualized_return, index=date)
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        annualized_return = annualize_adjustments.compound_annualization(
+            price_returns, annualize_factor
+        )
+        self.cov_calculator.update_block(annualized_return, indexes=dates)
+        self.window_cov_calculator.update_block(annualized_return, indexes=dates)
+
     def get_portfolio_risk(
         self, allocation: np.ndarray, is_window: bool = True
     ) -> float:
@@ -53,11 +53,56 @@ class HighToLow(stop_loss.StopLoss):
             factor depending on data frequency
         """
         super().assign(date, price_return, annualize_factor, **kwargs)
-        self.highs = np.nanmax(
-            [self.highs, self.return_engine.return_metrics_optimizer], axis=0
-        )
+        self.highs = np.fmax(self.highs, self.return_engine.return_metrics_optimizer)
         self.stopped_securities_matrix.append(self.stopped_securities)
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        if len(dates) == 0:
+            return
+
+        self.latest_return = price_returns[-1]
+        cumsums = self.return_engine.assign_block(
+            dates=dates, price_returns=price_returns, annualize_factor=annualize_factor
+        )
+
+        # running high of cumulative returns since rebalance date
+        highs = np.fmax.accumulate(
+            np.concatenate([np.expand_dims(self.highs, axis=0), cumsums]), axis=0
+        )[1:]
+        self.highs = highs[-1]
+
+        # once stopped, security stays stopped until engine is reset
+        stopped = np.logical_or.accumulate(
+            np.concatenate(
+                [
+                    np.expand_dims(self.prev_stopped, axis=0),
+                    (cumsums - highs) < self.stop_threshold,
+                ]
+            ),
+            axis=0,
+        )[1:]
+        self.prev_stopped = stopped[-1]
+        self.stopped_securities_matrix.extend(stopped)
+
     @property
     def stopped_securities(self) -> np.ndarray:
         """
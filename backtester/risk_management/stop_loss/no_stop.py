@@ -51,6 +51,30 @@ class NoStop(stop_loss.StopLoss):
         """
         self.stopped_securities_matrix.append(self.stopped_securities)
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        self.stopped_securities_matrix.extend(
+            np.full(shape=(len(dates), self.num_total_assets), fill_value=False)
+        )
+
     @property
     def stopped_securities(self) -> np.ndarray:
         """
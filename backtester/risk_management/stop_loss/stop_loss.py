@@ -66,6 +66,31 @@ class StopLoss(object):
             date=date, price_return=price_return, annualize_factor=annualize_factor
         )
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        for date, price_return in zip(dates, price_returns):
+            self.assign(
+                date=date, price_return=price_return, annualize_factor=annualize_factor
+            )
+
     @property
     def stopped_securities(self) -> np.ndarray:
         """
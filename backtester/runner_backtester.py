@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from copy import deepcopy
+from copy import deepcopy, copy
 import quantkit.runner as loader
 import quantkit.utils.logging as logging
 import quantkit.utils.mapping_configs as mapping_configs
@@ -23,6 +23,16 @@ import quantkit.backtester.return_calc.cumprod_return as cumprod_return
 import quantkit.backtester.risk_calc.log_vol as log_vol
 import quantkit.backtester.risk_calc.ewma_vol as ewma_vol
 import quantkit.backtester.risk_calc.simple_vol as simple_vol
+import quantkit.backtester.risk_calc.factor_vol as factor_vol
+import quantkit.mathstats.time_series.decay as decay
+import quantkit.backtester.data_loader.array_datasource as array_datasource
+import quantkit.utils.shared_arrays as shared_arrays
+import quantkit.utils.return_statistics as return_statistics
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import pickle
+import glob
+import os
 import sys
 
 
@@ -50,6 +60,8 @@ class Runner(loader.Runner):
         self.strategies = dict()
         self.return_engines = dict()
         self.risk_engines = dict()
+        self.checkpoint_params = self.params.get("checkpoint", dict())
+        self.resume_date = None
 
         # connect portfolio datasource
         self.portfolio_datasource = portfolio_datasource.PortfolioDataSource(
@@ -192,150 +204,188 @@ class Runner(loader.Runner):
         )
 
         weight_constraint = self.get_weights_constraints_d()
+        self.params["allocation_limit"]["limited_assets"] = np.array(
+            [
+                self.portfolio_datasource.all_tickers.index(i)
+                for i in self.params["allocation_limit"]["limited_assets"]
+            ]
+        )
+        self.params["allocation_limit"]["allocate_to"] = (
+            "equal"
+            if self.params["allocation_limit"]["allocate_to"] == "equal"
+            else np.array(
+                [
+                    self.portfolio_datasource.all_tickers.index(i)
+                    for i in self.params["allocation_limit"]["allocate_to"]
+                ]
+            )
+        )
 
         for strategy, strat_params in self.params["strategies"].items():
-            risk_return_engine_kwargs = dict(
-                frequency=self.params["prices_datasource"]["frequency"],
-                ddof=1,
-                geo_base=1,
-                adjust=True,
-                half_life=12,
-                span=36,
-            )
-            # return engine
-            return_engine = strat_params["return_engine"]
-            window_size = (
-                strat_params["return_window_size"]
-                if "return_window_size" in strat_params
-                else strat_params["window_size"]
-            )
-            if return_engine == "log_normal":
-                return_engine = f"log_normal_{window_size}"
-                self.return_engines[return_engine] = self.return_engines.get(
-                    return_engine,
-                    log_return.LogReturn(
-                        universe=self.portfolio_datasource.all_tickers,
-                        window_size=window_size,
-                        **risk_return_engine_kwargs,
-                    ),
+            self.init_strategy(strategy, strat_params, weight_constraint)
+
+    def init_strategy(
+        self, strategy: str, strat_params: dict, weight_constraint: dict
+    ) -> None:
+        """
+        Initialize strategy and its return and risk engine
+        Engines with same type and parameters are shared between strategies
+
+        Parameters
+        ----------
+        strategy: str
+            name of strategy
+        strat_params: dict
+            strategy parameters as defined in params file
+        weight_constraint: dict
+            weight range for each asset
+        """
+        strat_params = dict(strat_params)
+        risk_return_engine_kwargs = dict(
+            frequency=self.params["prices_datasource"]["frequency"],
+            ddof=1,
+            geo_base=1,
+            adjust=True,
+            half_life=strat_params.get("half_life", 12),
+            span=strat_params.get("span", 36),
+        )
+        # return engine
+        return_engine = strat_params["return_engine"]
+        window_size = (
+            strat_params["return_window_size"]
+            if "return_window_size" in strat_params
+            else strat_params["window_size"]
+        )
+        if return_engine == "log_normal":
+            return_engine = f"log_normal_{window_size}"
+            if return_engine not in self.return_engines:
+                self.return_engines[return_engine] = log_return.LogReturn(
+                    universe=self.portfolio_datasource.all_tickers,
+                    window_size=window_size,
+                    **risk_return_engine_kwargs,
                 )
-            elif return_engine == "ewma":
-                self.return_engines[return_engine] = self.return_engines.get(
-                    return_engine,
-                    ewma_return.LogEWMA(
-                        universe=self.portfolio_datasource.all_tickers,
-                        **risk_return_engine_kwargs,
-                    ),
+        elif return_engine == "log_median":
+            return_engine = f"log_median_{window_size}"
+            if return_engine not in self.return_engines:
+                self.return_engines[return_engine] = log_return.LogMedianReturn(
+                    universe=self.portfolio_datasource.all_tickers,
+                    window_size=window_size,
+                    **risk_return_engine_kwargs,
                 )
-            elif return_engine == "ewma_rolling":
-                self.return_engines[return_engine] = self.return_engines.get(
-                    return_engine,
-                    ewma_return.RollingLogEWMA(
-                        universe=self.portfolio_datasource.all_tickers,
-                        **risk_return_engine_kwargs,
-                    ),
+        elif return_engine == "ewma":
+            return_engine = f"ewma_{risk_return_engine_kwargs['half_life']}"
+            if return_engine not in self.return_engines:
+                self.return_engines[return_engine] = ewma_return.LogEWMA(
+                    universe=self.portfolio_datasource.all_tickers,
+                    **risk_return_engine_kwargs,
                 )
-            elif return_engine == "simple":
-                return_engine = f"simple_{window_size}"
-                self.return_engines[return_engine] = self.return_engines.get(
-                    return_engine,
-                    simple_return.SimpleExp(
-                        universe=self.portfolio_datasource.all_tickers,
-                        window_size=window_size,
-                        **risk_return_engine_kwargs,
-                    ),
+        elif return_engine == "ewma_rolling":
+            return_engine = f"ewma_rolling_{risk_return_engine_kwargs['span']}"
+            if return_engine not in self.return_engines:
+                self.return_engines[return_engine] = ewma_return.RollingLogEWMA(
+                    universe=self.portfolio_datasource.all_tickers,
+                    **risk_return_engine_kwargs,
                 )
-            elif return_engine == "cumprod":
-                return_engine = f"cumprod_{window_size}"
-                self.return_engines[return_engine] = self.return_engines.get(
-                    return_engine,
-                    cumprod_return.CumProdReturn(
-                        universe=self.portfolio_datasource.all_tickers,
-                        window_size=window_size,
-                        **risk_return_engine_kwargs,
-                    ),
+        elif return_engine == "simple":
+            return_engine = f"simple_{window_size}"
+            if return_engine not in self.return_engines:
+                self.return_engines[return_engine] = simple_return.SimpleExp(
+                    universe=self.portfolio_datasource.all_tickers,
+                    window_size=window_size,
+                    **risk_return_engine_kwargs,
                 )
-            strat_params["return_engine"] = self.return_engines[return_engine]
-
-            # risk engine
-            risk_engine = strat_params["risk_engine"]
-            window_size = (
-                strat_params["risk_window_size"]
-                if "risk_window_size" in strat_params
-                else strat_params["window_size"]
-            )
-            if risk_engine == "log_normal":
-                risk_engine = f"log_normal_{window_size}"
-                self.risk_engines[risk_engine] = self.risk_engines.get(
-                    risk_engine,
-                    log_vol.WindowLogNormalVol(
-                        universe=self.portfolio_datasource.all_tickers,
-                        window_size=window_size,
-                        **risk_return_engine_kwargs,
-                    ),
+        elif return_engine == "cumprod":
+            return_engine = f"cumprod_{window_size}"
+            if return_engine not in self.return_engines:
+                self.return_engines[return_engine] = cumprod_return.CumProdReturn(
+                    universe=self.portfolio_datasource.all_tickers,
+                    window_size=window_size,
+                    **risk_return_engine_kwargs,
+                )
+        strat_params["return_engine"] = self.return_engines[return_engine]
+
+        # risk engine
+        risk_engine = strat_params["risk_engine"]
+        window_size = (
+            strat_params["risk_window_size"]
+            if "risk_window_size" in strat_params
+            else strat_params["window_size"]
+        )
+        # reduced precision engines are not shared with float64 engines
+        risk_dtype = strat_params.get("risk_dtype", "float64")
+        dtype_suffix = "" if risk_dtype == "float64" else f"_{risk_dtype}"
+        if risk_engine == "log_normal":
+            risk_engine = f"log_normal_{window_size}{dtype_suffix}"
+            if risk_engine not in self.risk_engines:
+                self.risk_engines[risk_engine] = log_vol.WindowLogNormalVol(
+                    universe=self.portfolio_datasource.all_tickers,
+                    window_size=window_size,
+                    dtype=np.dtype(risk_dtype),
+                    **risk_return_engine_kwargs,
                 )
-            elif risk_engine == "ewma":
-                self.risk_engines[risk_engine] = self.risk_engines.get(
-                    risk_engine,
-                    ewma_vol.LogNormalEWMA(
-                        universe=self.portfolio_datasource.all_tickers,
-                        **risk_return_engine_kwargs,
-                    ),
+        elif risk_engine in ["ewma", "ewma_rolling"]:
+            # exponential weighted engines of same dtype share one bank of decay factors
+            if risk_engine == "ewma":
+                half_life = risk_return_engine_kwargs["half_life"]
+                decay_factor = decay.decay_factor(half_life)[0]
+                risk_engine = f"ewma_{half_life}_{window_size}{dtype_suffix}"
+            else:
+                span = risk_return_engine_kwargs["span"]
+                decay_factor = 1 - decay.decay_span(span)
+                risk_engine = f"ewma_rolling_{span}_{window_size}{dtype_suffix}"
+            bank = f"ewma_bank{dtype_suffix}"
+            if bank not in self.risk_engines:
+                self.risk_engines[bank] = ewma_vol.LogNormalEWMABank(
+                    universe=self.portfolio_datasource.all_tickers,
+                    dtype=np.dtype(risk_dtype),
+                    **risk_return_engine_kwargs,
                 )
-            elif risk_engine == "ewma_rolling":
-                self.risk_engines[risk_engine] = self.risk_engines.get(
-                    risk_engine,
-                    ewma_vol.RollingLogNormalEWMA(
-                        universe=self.portfolio_datasource.all_tickers,
-                        **risk_return_engine_kwargs,
-                    ),
+            if risk_engine not in self.risk_engines:
+                self.risk_engines[risk_engine] = ewma_vol.BankedLogNormalEWMA(
+                    bank=self.risk_engines[bank],
+                    decay_factor=decay_factor,
+                    window_size=window_size,
                 )
-            elif risk_engine == "simple":
-                risk_engine = f"simple_{window_size}"
-                self.risk_engines[risk_engine] = self.risk_engines.get(
-                    risk_engine,
-                    simple_vol.SimpleVol(
-                        universe=self.portfolio_datasource.all_tickers,
-                        window_size=window_size,
-                        **risk_return_engine_kwargs,
-                    ),
+        elif risk_engine == "simple":
+            risk_engine = f"simple_{window_size}{dtype_suffix}"
+            if risk_engine not in self.risk_engines:
+                self.risk_engines[risk_engine] = simple_vol.SimpleVol(
+                    universe=self.portfolio_datasource.all_tickers,
+                    window_size=window_size,
+                    dtype=np.dtype(risk_dtype),
+                    **risk_return_engine_kwargs,
                 )
-            strat_params["risk_engine"] = self.risk_engines[risk_engine]
+        elif risk_engine == "factor":
+            num_factors = strat_params.get("num_factors", 5)
+            risk_engine = f"factor_{window_size}_{num_factors}{dtype_suffix}"
+            if risk_engine not in self.risk_engines:
+                self.risk_engines[risk_engine] = factor_vol.FactorVol(
+                    universe=self.portfolio_datasource.all_tickers,
+                    window_size=window_size,
+                    num_factors=num_factors,
+                    dtype=np.dtype(risk_dtype),
+                    **risk_return_engine_kwargs,
+                )
+        strat_params["risk_engine"] = self.risk_engines[risk_engine]
 
-            strat_params["portfolio_return_engine"] = self.portfolio_return_engine
+        strat_params["portfolio_return_engine"] = self.portfolio_return_engine
 
-            strat_params["frequency"] = self.params["prices_datasource"]["frequency"]
-            strat_params["rebalance"] = self.params["prices_datasource"]["rebalance"]
-            strat_params["universe"] = self.portfolio_datasource.all_tickers
-            strat_params["trans_cost"] = self.params["trans_cost"]
-            strat_params["weight_constraint"] = weight_constraint
-            self.params["allocation_limit"]["limited_assets"] = np.array(
-                [
-                    self.portfolio_datasource.all_tickers.index(i)
-                    for i in self.params["allocation_limit"]["limited_assets"]
-                ]
-            )
-            self.params["allocation_limit"]["allocate_to"] = (
-                "equal"
-                if self.params["allocation_limit"]["allocate_to"] == "equal"
-                else np.array(
-                    [
-                        self.portfolio_datasource.all_tickers.index(i)
-                        for i in self.params["allocation_limit"]["allocate_to"]
-                    ]
-                )
-            )
-            strat_params["scaling"] = self.params["allocation_limit"]
-            if strat_params["type"] == "momentum":
-                self.strategies[strategy] = momentum.Momentum(strat_params)
-            elif strat_params["type"] == "mean_reversion":
-                self.strategies[strategy] = mean_reversion.MeanReversion(strat_params)
-            elif strat_params["type"] == "pick_all":
-                self.strategies[strategy] = pick_all.PickAll(strat_params)
-            elif strat_params["type"] == "relative_value":
-                self.strategies[strategy] = relative_value.RelativeValue(strat_params)
-            elif strat_params["type"] == "magic_formula":
-                self.strategies[strategy] = magic_formula.MagicFormula(strat_params)
+        strat_params["frequency"] = self.params["prices_datasource"]["frequency"]
+        strat_params["rebalance"] = self.params["prices_datasource"]["rebalance"]
+        strat_params["universe"] = self.portfolio_datasource.all_tickers
+        strat_params["trans_cost"] = self.params["trans_cost"]
+        strat_params["weight_constraint"] = weight_constraint
+        strat_params["scaling"] = self.params["allocation_limit"]
+        if strat_params["type"] == "momentum":
+            self.strategies[strategy] = momentum.Momentum(strat_params)
+        elif strat_params["type"] == "mean_reversion":
+            self.strategies[strategy] = mean_reversion.MeanReversion(strat_params)
+        elif strat_params["type"] == "pick_all":
+            self.strategies[strategy] = pick_all.PickAll(strat_params)
+        elif strat_params["type"] == "relative_value":
+            self.strategies[strategy] = relative_value.RelativeValue(strat_params)
+        elif strat_params["type"] == "magic_formula":
+            self.strategies[strategy] = magic_formula.MagicFormula(strat_params)
 
     def get_weights_constraints_d(self) -> dict:
         """
@@ -358,34 +408,220 @@ class Runner(loader.Runner):
             w_consts_d[this_id] = w_consts_d.get(this_id, weight_constraint)
         return w_consts_d
 
-    def run_strategies(self) -> None:
+    def get_snapshot(self, date, price_return: np.ndarray) -> dict:
+        """
+        Collect returns, index components, fundamentals and market multiples for date
+
+        Parameters
+        ----------
+        date: datetime.date
+            date of snapshot
+        price_return: np.array
+            zero base price return of universe
+
+        Returns
+        -------
+        dict
+            keyword arguments for strategy assign and backtest
+        """
+        current_multiples = self.marketmultiple_datasource.outgoing_row(date)
+        current_fundamentals = self.fundamentals_datasource.outgoing_row(date)
+        index_components = self.portfolio_datasource.outgoing_row(date)
+
+        assign_dict = {
+            "date": date,
+            "price_return": price_return,
+            "index_comp": index_components,
+            "market_caps": current_fundamentals["marketcap"],
+            "divyield": current_fundamentals["divyield"],
+            "roe": current_fundamentals["roe"],
+            "fcfps": current_fundamentals["fcfps"],
+            "pe": current_fundamentals["pe"],
+            "ps": current_fundamentals["ps"],
+            "pb": current_fundamentals["pb"],
+            "roic": current_fundamentals["roic"],
+            "ebit": current_fundamentals["ebit"],
+            "ev": current_fundamentals["ev"],
+            "spx_pe": current_multiples["SPX_PE"],
+            "spx_pb": current_multiples["SPX_PB"],
+            "spx_ps": current_multiples["SPX_PS"],
+        }
+        return assign_dict
+
+    def rebalance(self, date, assign_dict: dict, backtest: bool = True) -> None:
+        """
+        Backtest all strategies on rebalance date and reset stop loss and portfolio engines
+
+        Parameters
+        ----------
+        date: datetime.date
+            rebalance date
+        assign_dict: dict
+            snapshot of rebalance date
+        backtest: bool, optional
+            optimize strategies, otherwise only reset engines
+        """
+        if backtest:
+            logging.log(f"Optimizing {date.strftime('%Y-%m-%d')}")
+        for strat, strat_obj in self.strategies.items():
+            if (
+                backtest
+                and self.marketmultiple_datasource.is_valid(date)
+                and self.fundamentals_datasource.is_valid(date)
+                and self.portfolio_datasource.is_valid(date)
+                and strat_obj.is_valid()
+            ):
+                strat_obj.backtest(**assign_dict)
+
+            # reset stop loss engine
+            strat_obj.stop_loss.reset_engine()
+
+        # reset portfolio engines
+        self.portfolio_return_engine.reset_engine()
+
+    def get_return_data(self) -> pd.DataFrame:
+        """
+        Price returns not yet assigned, all dates after resume date
+
+        Returns
+        -------
+        pd.DataFrame
+            zero base price returns of universe
+        """
+        return_data = self.prices_datasource.return_data
+        if self.resume_date is not None:
+            return_data = return_data[return_data.index > self.resume_date]
+        return return_data
+
+    def get_state(self, date) -> dict:
+        """
+        State of engines, strategies and datasource cursors after date
+
+        Parameters
+        ----------
+        date: datetime.date
+            last assigned date
+
+        Returns
+        -------
+        dict
+            state of backtest
+        """
+        return dict(
+            date=date,
+            strategies=self.strategies,
+            return_engines=self.return_engines,
+            risk_engines=self.risk_engines,
+            portfolio_return_engine=self.portfolio_return_engine,
+            current_locs=dict(
+                portfolio=self.portfolio_datasource.current_loc,
+                fundamentals=self.fundamentals_datasource.current_loc,
+                marketmultiple=self.marketmultiple_datasource.current_loc,
+            ),
+        )
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restore state of engines, strategies and datasource cursors,
+        backtest continues after state date
+
+        Parameters
+        ----------
+        state: dict
+            state of backtest, as returned by get_state
+        """
+        self.strategies = state["strategies"]
+        self.return_engines = state["return_engines"]
+        self.risk_engines = state["risk_engines"]
+        self.portfolio_return_engine = state["portfolio_return_engine"]
+        self.portfolio_datasource.current_loc = state["current_locs"]["portfolio"]
+        self.fundamentals_datasource.current_loc = state["current_locs"]["fundamentals"]
+        self.marketmultiple_datasource.current_loc = state["current_locs"][
+            "marketmultiple"
+        ]
+        self.resume_date = state["date"]
+
+    def save_checkpoint(self, date) -> None:
+        """
+        Save state of engines, strategies and datasource cursors on rebalance date
+        Checkpoints are only saved if a path is set in checkpoint params,
+        p.e. {"path": "checkpoints", "frequency": 12, "keep": 1}
+
+        Parameters
+        ----------
+        date: datetime.date
+            rebalance date
+        """
+        path = self.checkpoint_params.get("path")
+        if not path:
+            return
+        n_rebalance = self.prices_datasource.rebalance_dates.index(date) + 1
+        if n_rebalance % self.checkpoint_params.get("frequency", 1):
+            return
+
+        state = self.get_state(date)
+        os.makedirs(path, exist_ok=True)
+        file_name = os.path.join(path, f"checkpoint_{date.strftime('%Y%m%d')}.pkl")
+        with open(f"{file_name}.tmp", "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{file_name}.tmp", file_name)
+        logging.log(f"Checkpoint {file_name}")
+
+        keep = self.checkpoint_params.get("keep", 1)
+        if keep:
+            for old_file in self.get_checkpoints()[:-keep]:
+                os.remove(old_file)
+
+    def get_checkpoints(self) -> list:
+        """
+        All saved checkpoints
+
+        Returns
+        -------
+        list
+            checkpoint files, sorted by date
+        """
+        path = self.checkpoint_params.get("path")
+        if not path:
+            return list()
+        return sorted(glob.glob(os.path.join(path, "checkpoint_*.pkl")))
+
+    def load_checkpoint(self, file_name: str = None) -> None:
+        """
+        Restore state of engines, strategies and datasource cursors from checkpoint,
+        backtest continues after checkpoint date
+
+        Parameters
+        ----------
+        file_name: str, optional
+            checkpoint file, default latest checkpoint
+        """
+        if file_name is None:
+            checkpoints = self.get_checkpoints()
+            if not checkpoints:
+                raise RuntimeError("No checkpoint found to resume from..")
+            file_name = checkpoints[-1]
+        with open(file_name, "rb") as f:
+            self.set_state(pickle.load(f))
+        logging.log(f"Resume from {file_name}")
+
+    def run_strategies(
+        self, assign_weights: bool = True, return_data: pd.DataFrame = None
+    ) -> None:
         """
         Run and backtest all strategies
+
+        Parameters
+        ----------
+        assign_weights: bool, optional
+            assign allocations to security objects after backtest
+        return_data: pd.DataFrame, optional
+            price returns to assign, default all returns after resume date
         """
-        for date, row in self.prices_datasource.return_data.iterrows():
+        return_data = self.get_return_data() if return_data is None else return_data
+        for date, row in return_data.iterrows():
             r_array = np.array(row)
-            current_multiples = self.marketmultiple_datasource.outgoing_row(date)
-            current_fundamentals = self.fundamentals_datasource.outgoing_row(date)
-            index_components = self.portfolio_datasource.outgoing_row(date)
-
-            assign_dict = {
-                "date": date,
-                "price_return": r_array,
-                "index_comp": index_components,
-                "market_caps": current_fundamentals["marketcap"],
-                "divyield": current_fundamentals["divyield"],
-                "roe": current_fundamentals["roe"],
-                "fcfps": current_fundamentals["fcfps"],
-                "pe": current_fundamentals["pe"],
-                "ps": current_fundamentals["ps"],
-                "pb": current_fundamentals["pb"],
-                "roic": current_fundamentals["roic"],
-                "ebit": current_fundamentals["ebit"],
-                "ev": current_fundamentals["ev"],
-                "spx_pe": current_multiples["SPX_PE"],
-                "spx_pb": current_multiples["SPX_PB"],
-                "spx_ps": current_multiples["SPX_PS"],
-            }
+            assign_dict = self.get_snapshot(date, r_array)
 
             for return_engine, return_object in self.return_engines.items():
                 return_object.assign(
@@ -404,38 +640,542 @@ class Runner(loader.Runner):
                 strat_obj.assign(**assign_dict)
 
             if date in self.prices_datasource.rebalance_dates:
-                logging.log(f"Optimizing {date.strftime('%Y-%m-%d')}")
-                for strat, strat_obj in self.strategies.items():
-                    if (
-                        self.marketmultiple_datasource.is_valid(date)
-                        and self.fundamentals_datasource.is_valid(date)
-                        and self.portfolio_datasource.is_valid(date)
-                        and strat_obj.is_valid()
-                    ):
-                        strat_obj.backtest(**assign_dict)
+                self.rebalance(date, assign_dict)
+                self.save_checkpoint(date)
+
+        if assign_weights:
+            self.assign_allocations()
+
+    def append(
+        self,
+        return_data: pd.DataFrame,
+        rebalance_dates: list = None,
+        fundamentals: dict = None,
+        index_components: dict = None,
+        market_multiples: dict = None,
+    ) -> None:
+        """
+        Live mode: advance a warm runner by new dates only
+        New fundamentals, index components and market multiples are added to the
+        datasources, engines and strategies are only updated with the new returns.
+        Strategies are only optimized if a new date is a rebalance date.
+
+        Parameters
+        ----------
+        return_data: pd.DataFrame
+            zero base price returns of universe for new dates, after all assigned dates
+        rebalance_dates: list, optional
+            new rebalance dates
+        fundamentals: dict, optional
+            new release dates, mapped to their kpi's as np.array in order of universe
+        index_components: dict, optional
+            new dates, mapped to portfolio weights as np.array in order of universe
+        market_multiples: dict, optional
+            new dates, mapped to their market multiples as float
+        """
+        for date, values in (fundamentals or dict()).items():
+            self.fundamentals_datasource.append_row(date, values)
+        for date, values in (index_components or dict()).items():
+            self.portfolio_datasource.append_row(date, values)
+        for date, values in (market_multiples or dict()).items():
+            self.marketmultiple_datasource.append_row(date, values)
+        if rebalance_dates:
+            self.prices_datasource.rebalance_dates += list(rebalance_dates)
+
+        rebalanced = any(
+            date in self.prices_datasource.rebalance_dates for date in return_data.index
+        )
+        self.run_strategies(assign_weights=rebalanced, return_data=return_data)
+
+    def assign_block(self, dates: pd.DatetimeIndex, returns: np.ndarray) -> dict:
+        """
+        Assign a block of returns to all engines and strategies at once
+
+        Parameters
+        ----------
+        dates: pd.DatetimeIndex
+            dates of block
+        returns: np.array
+            zero base price returns of universe, one row per date
+
+        Returns
+        -------
+        dict
+            snapshot of last date in block
+        """
+        assign_dict = self.get_snapshot(dates[-1], returns[-1])
 
-                    # reset stop loss engine
-                    strat_obj.stop_loss.reset_engine()
+        for return_engine, return_object in self.return_engines.items():
+            return_object.assign_block(
+                dates=dates, price_returns=returns, annualize_factor=1
+            )
+
+        for risk_engine, risk_object in self.risk_engines.items():
+            risk_object.assign_block(
+                dates=dates, price_returns=returns, annualize_factor=1
+            )
+
+        self.portfolio_return_engine.assign_block(
+            dates=dates, price_returns=returns, annualize_factor=1
+        )
+
+        for strat, strat_obj in self.strategies.items():
+            strat_obj.assign_block(dates=dates, price_returns=returns, **assign_dict)
+        return assign_dict
+
+    def run_strategies_vectorized(self, assign_weights: bool = True) -> None:
+        """
+        Run and backtest all strategies
+        Instead of streaming one date at a time, all returns between two rebalance dates
+        are assigned as one block and strategies are only visited on rebalance dates.
+        Allocations and portfolio returns are the same as in run_strategies.
+
+        Parameters
+        ----------
+        assign_weights: bool, optional
+            assign allocations to security objects after backtest
+        """
+        return_data = self.get_return_data()
+        dates = return_data.index
+        returns = return_data.to_numpy(dtype=float)
+        rebalance_dates = set(self.prices_datasource.rebalance_dates)
+
+        # each block ends on a rebalance date, last block ends on last date
+        block_ends = [i + 1 for i, date in enumerate(dates) if date in rebalance_dates]
+        if not block_ends or block_ends[-1] != len(dates):
+            block_ends.append(len(dates))
+
+        block_start = 0
+        for block_end in block_ends:
+            if block_end == block_start:
+                continue
+            assign_dict = self.assign_block(
+                dates[block_start:block_end], returns[block_start:block_end]
+            )
+
+            date = dates[block_end - 1]
+            if date in rebalance_dates:
+                self.rebalance(date, assign_dict)
+                self.save_checkpoint(date)
+            block_start = block_end
+
+        if assign_weights:
+            self.assign_allocations()
+
+    def share_data(self) -> tuple:
+        """
+        Copy returns, index components, fundamentals and market multiples
+        into shared memory, so that worker processes can read them without copying
+
+        Returns
+        -------
+        SharedArrays
+            arrays in shared memory, owned by this process
+        dict
+            dates and tickers of shared arrays
+        """
+        shared = shared_arrays.SharedArrays()
+        return_data = self.get_return_data()
+        shared.add("returns", return_data.to_numpy(dtype=float))
+        shared.add("universe_matrix", self.portfolio_datasource.universe_matrix)
+        for kpi, values in self.fundamentals_datasource.fundamentals.items():
+            shared.add(f"fundamentals_{kpi}", values)
+        for kpi, values in self.marketmultiple_datasource.multiples.items():
+            shared.add(f"multiples_{kpi}", values)
+
+        meta = dict(
+            dates=list(return_data.index),
+            tickers=list(return_data.columns),
+            rebalance_dates=list(self.prices_datasource.rebalance_dates),
+            all_tickers=list(self.portfolio_datasource.all_tickers),
+            portfolio_dates=list(self.portfolio_datasource.dates),
+            fundamentals=list(self.fundamentals_datasource.fundamentals),
+            fundamentals_dates=list(self.fundamentals_datasource.dates),
+            multiples=list(self.marketmultiple_datasource.multiples),
+            multiples_dates=list(self.marketmultiple_datasource.dates),
+        )
+        return shared, meta
+
+    def attach_data(self, shared: shared_arrays.SharedArrays, meta: dict) -> None:
+        """
+        Create datasources from arrays in shared memory
+
+        Parameters
+        ----------
+        shared: SharedArrays
+            arrays in shared memory
+        meta: dict
+            dates and tickers of shared arrays, as returned by share_data
+        """
+        self.prices_datasource = array_datasource.PricesArraySource(
+            returns=shared["returns"],
+            dates=meta["dates"],
+            tickers=meta["tickers"],
+            rebalance_dates=meta["rebalance_dates"],
+        )
+        self.portfolio_datasource = array_datasource.PortfolioArraySource(
+            universe_matrix=shared["universe_matrix"],
+            dates=meta["portfolio_dates"],
+            tickers=meta["all_tickers"],
+        )
+        self.fundamentals_datasource = array_datasource.FundamentalsArraySource(
+            fundamentals=dict(
+                [(kpi, shared[f"fundamentals_{kpi}"]) for kpi in meta["fundamentals"]]
+            ),
+            dates=meta["fundamentals_dates"],
+        )
+        self.marketmultiple_datasource = array_datasource.MarketMultipleArraySource(
+            multiples=dict(
+                [(kpi, shared[f"multiples_{kpi}"]) for kpi in meta["multiples"]]
+            ),
+            dates=meta["multiples_dates"],
+        )
+
+    def get_parallel_tasks(self, split: str) -> list:
+        """
+        Split strategies into independent backtests
+
+        Parameters
+        ----------
+        split: str
+            - "strategy": one task per strategy
+            - "allocation_model": one task per strategy and allocation model
+
+        Returns
+        -------
+        list
+            list of (strategy name, strategy object) tuples
+        """
+        tasks = list()
+        for strat, strat_obj in self.strategies.items():
+            if split == "strategy":
+                tasks.append((strat, strat_obj))
+            elif split == "allocation_model":
+                for allo, allo_obj in strat_obj.allocation_engines_d.items():
+                    task_obj = copy(strat_obj)
+                    task_obj.allocation_engines_d = {allo: allo_obj}
+                    tasks.append((strat, task_obj))
+            else:
+                raise RuntimeError(f"parallel split {split} is not defined..")
+        return tasks
+
+    def collect_results(self, results: list) -> None:
+        """
+        Merge results of worker processes into strategy objects
+
+        Parameters
+        ----------
+        results: list
+            list of (strategy name, result) tuples, as returned by backtest_worker
+        """
+        rebalance_dates = pd.DatetimeIndex(self.prices_datasource.rebalance_dates)
+        for strat, strat_obj in self.strategies.items():
+            strat_results = [result for name, result in results if name == strat]
+            all_portfolios = list()
+            for result in strat_results:
+                for allo, history in result["allocations_history"].items():
+                    strat_obj.allocation_engines_d[allo].allocations_history = history
+                all_portfolios.append(result["all_portfolios"])
+            if len(all_portfolios) == 1:
+                strat_obj.all_portfolios = all_portfolios[0]
+                continue
+
+            # restore streaming order: rebalance period, allocation model, date
+            all_portfolios = pd.concat(all_portfolios, axis=0)
+            models = list(strat_obj.allocation_engines_d)
+            model_loc = [
+                models.index(name.replace("ex_ante_", "", 1))
+                for name in all_portfolios["portfolio_name"]
+            ]
+            period = rebalance_dates.searchsorted(
+                pd.DatetimeIndex(all_portfolios.index)
+            )
+            order = np.lexsort(
+                (np.arange(len(all_portfolios)), np.array(model_loc), period)
+            )
+            strat_obj.all_portfolios = all_portfolios.iloc[order]
+
+    def run_strategies_parallel(
+        self,
+        workers: int,
+        split: str = "strategy",
+        backtest_mode: str = "streaming",
+        assign_weights: bool = True,
+    ) -> None:
+        """
+        Run and backtest strategies in worker processes
+        Price returns, index components, fundamentals and market multiples are
+        shared between processes, each worker updates its own copy of the engines.
+        Allocations and portfolio returns are the same as in run_strategies.
+
+        Parameters
+        ----------
+        workers: int
+            number of worker processes
+        split: str, optional
+            - "strategy": one task per strategy
+            - "allocation_model": one task per strategy and allocation model
+        backtest_mode: str, optional
+            backtest mode of workers, "streaming" or "vectorized"
+        assign_weights: bool, optional
+            assign allocations to security objects after backtest
+        """
+        tasks = self.get_parallel_tasks(split)
+        shared, meta = self.share_data()
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    (
+                        strat,
+                        executor.submit(
+                            backtest_worker,
+                            shared.specs,
+                            meta,
+                            {strat: strat_obj},
+                            backtest_mode,
+                        ),
+                    )
+                    for strat, strat_obj in tasks
+                ]
+                results = [(strat, future.result()[strat]) for strat, future in futures]
+        finally:
+            shared.unlink()
 
-                # reset portfolio engines
-                self.portfolio_return_engine.reset_engine()
+        self.collect_results(results)
+        if assign_weights:
+            self.assign_allocations()
 
-        # assign weights to security objects
+    def assign_allocations(self) -> None:
+        """
+        Assign weights of all strategies and allocation models to security objects
+        """
         for strat, strat_obj in self.strategies.items():
             for allo, allo_obj in strat_obj.allocation_engines_d.items():
-                allocation_df = pd.DataFrame.from_dict(
-                    allo_obj.allocations_history,
-                    orient="index",
-                    columns=self.portfolio_datasource.all_tickers,
+                allocation_df = allo_obj.allocations_history.to_frame(
+                    columns=self.portfolio_datasource.all_tickers
                 )
                 for sec in allocation_df.columns:
-                    self.portfolio_datasource.tickers[sec].allocation_df[
-                        f"{strat}_{allo}"
-                    ] = allocation_df[sec]
+                    sec_store = self.portfolio_datasource.tickers[sec]
+                    # extend existing allocations by new rebalance dates
+                    if len(sec_store.allocation_df.columns) and not (
+                        allocation_df.index.isin(sec_store.allocation_df.index).all()
+                    ):
+                        sec_store.allocation_df = sec_store.allocation_df.reindex(
+                            sec_store.allocation_df.index.union(allocation_df.index)
+                        )
+                    sec_store.allocation_df[f"{strat}_{allo}"] = allocation_df[sec]
 
-    def run(self) -> None:
+    def run(self, assign_weights: bool = True) -> None:
         """
         run calculations
+        - backtest_mode "streaming": assign one date at a time
+        - backtest_mode "vectorized": assign all dates between rebalance dates at once
+        - parallel workers > 1: backtest strategies in worker processes
+        - checkpoint resume: continue after latest saved checkpoint
+
+        Parameters
+        ----------
+        assign_weights: bool, optional
+            assign allocations to security objects after backtest
         """
         logging.log("Start Calculations")
-        self.run_strategies()
+        if self.checkpoint_params.get("resume", False) and self.get_checkpoints():
+            self.load_checkpoint()
+        backtest_mode = self.params.get("backtest_mode", "streaming")
+        parallel = self.params.get("parallel", dict())
+        if backtest_mode not in ["streaming", "vectorized"]:
+            raise RuntimeError(f"backtest_mode {backtest_mode} is not defined..")
+        if parallel.get("workers", 1) > 1:
+            self.run_strategies_parallel(
+                workers=parallel["workers"],
+                split=parallel.get("split", "strategy"),
+                backtest_mode=backtest_mode,
+                assign_weights=assign_weights,
+            )
+        elif backtest_mode == "streaming":
+            self.run_strategies(assign_weights=assign_weights)
+        else:
+            self.run_strategies_vectorized(assign_weights=assign_weights)
+
+    def init_sweep(self, grid: dict, strategies: list = None) -> pd.DataFrame:
+        """
+        Replace strategies with one strategy per parameter combination of grid
+        Engines with same type and parameters are shared between all combinations.
+        Allocation models are not part of the combinations, a list of allocation
+        models in grid is run in every combination and reported separately.
+
+        Parameters
+        ----------
+        grid: dict
+            list of values per strategy parameter,
+            p.e. {"return_window_size": [21, 63], "top_n": [10, 20]}
+            and optionally a list of allocation models.
+            window_size can't be swept if return_window_size and
+            risk_window_size are set for a strategy
+        strategies: list, optional
+            strategies in params file to sweep, default all strategies
+
+        Returns
+        -------
+        pd.DataFrame
+            strategy and parameters of each combination, index is sweep name
+        """
+        strategies = (
+            list(self.params["strategies"]) if strategies is None else strategies
+        )
+        grid = dict(grid)
+        allocation_models = grid.pop("allocation_models", None)
+        sweep_params = list(grid)
+        combinations = list(itertools.product(*grid.values()))
+
+        self.strategies = dict()
+        self.return_engines = dict()
+        self.risk_engines = dict()
+        weight_constraint = self.get_weights_constraints_d()
+
+        sweep = list()
+        for strategy in strategies:
+            # window_size is only used for engines without specific window size
+            strat_keys = set(self.params["strategies"][strategy]) | set(sweep_params)
+            if (
+                "window_size" in sweep_params
+                and {
+                    "return_window_size",
+                    "risk_window_size",
+                }
+                <= strat_keys
+            ):
+                raise RuntimeError(
+                    f"Sweep of window_size has no effect for strategy {strategy} with return_window_size and risk_window_size, sweep those instead.."
+                )
+            for i, combination in enumerate(combinations):
+                strat_params = dict(self.params["strategies"][strategy])
+                strat_params.update(zip(sweep_params, combination))
+                if allocation_models is not None:
+                    strat_params["allocation_models"] = allocation_models
+                sweep_name = f"{strategy}_sweep_{i}"
+                self.init_strategy(sweep_name, strat_params, weight_constraint)
+                sweep.append(
+                    dict(
+                        [("sweep", sweep_name), ("strategy", strategy)]
+                        + list(zip(sweep_params, combination))
+                    )
+                )
+        return pd.DataFrame(sweep).set_index("sweep")
+
+    def sweep_results(self, sweep: pd.DataFrame) -> pd.DataFrame:
+        """
+        Portfolio statistics of each parameter combination and allocation model
+
+        Parameters
+        ----------
+        sweep: pd.DataFrame
+            strategy and parameters of each combination, as returned by init_sweep
+
+        Returns
+        -------
+        pd.DataFrame
+            one row per parameter combination and allocation model
+        """
+        frequency = self.params["prices_datasource"]["frequency"]
+        results = list()
+        for sweep_name, sweep_params in sweep.iterrows():
+            strat_obj = self.strategies[sweep_name]
+            all_portfolios = strat_obj.all_portfolios
+            for allo in strat_obj.allocation_engines_d:
+                return_series = all_portfolios[
+                    all_portfolios["portfolio_name"] == f"ex_ante_{allo}"
+                ].astype({"return": float})
+                row = dict(sweep=sweep_name, **sweep_params, allocation_model=allo)
+                row.update(
+                    return_statistics.portfolio_stats(
+                        return_series, frequency=frequency
+                    )
+                )
+                results.append(row)
+        return pd.DataFrame(results)
+
+    def run_sweep(self, grid: dict, strategies: list = None) -> pd.DataFrame:
+        """
+        Backtest all parameter combinations of grid in one pass over the data
+        Each date is assigned once to every distinct engine, strategies with the
+        same engine parameters share their engines.
+
+        Parameters
+        ----------
+        grid: dict
+            list of values per strategy parameter,
+            p.e. {"return_window_size": [21, 63], "top_n": [10, 20]}
+        strategies: list, optional
+            strategies in params file to sweep, default all strategies
+
+        Returns
+        -------
+        pd.DataFrame
+            portfolio statistics, one row per parameter combination and allocation model
+        """
+        sweep = self.init_sweep(grid, strategies)
+        self.run(assign_weights=False)
+        return self.sweep_results(sweep)
+
+
+def backtest_worker(
+    specs: dict, meta: dict, strategies: dict, backtest_mode: str = "streaming"
+) -> dict:
+    """
+    Backtest strategies in a worker process on data in shared memory
+
+    Parameters
+    ----------
+    specs: dict
+        shared memory specs, as in SharedArrays.specs
+    meta: dict
+        dates and tickers of shared arrays, as returned by Runner.share_data
+    strategies: dict
+        strategy objects with their engines
+    backtest_mode: str, optional
+        "streaming" or "vectorized"
+
+    Returns
+    -------
+    dict
+        allocation histories and portfolio returns per strategy
+    """
+    shared = shared_arrays.SharedArrays.attach(specs)
+    try:
+        runner = Runner()
+        runner.checkpoint_params = dict()
+        runner.resume_date = None
+        runner.attach_data(shared, meta)
+        runner.strategies = strategies
+        runner.return_engines = dict()
+        runner.risk_engines = dict()
+        for strat, strat_obj in strategies.items():
+            runner.return_engines[id(strat_obj.return_engine)] = strat_obj.return_engine
+            runner.risk_engines[id(strat_obj.risk_engine)] = strat_obj.risk_engine
+            # engines reading from a bank need the bank to be assigned
+            bank = getattr(strat_obj.risk_engine, "bank", None)
+            if bank is not None:
+                runner.risk_engines[id(bank)] = bank
+            runner.portfolio_return_engine = strat_obj.portfolio_return_engine
+
+        if backtest_mode == "vectorized":
+            runner.run_strategies_vectorized(assign_weights=False)
+        else:
+            runner.run_strategies(assign_weights=False)
+
+        results = dict()
+        for strat, strat_obj in strategies.items():
+            results[strat] = dict(
+                allocations_history=dict(
+                    [
+                        (allo, allo_obj.allocations_history)
+                        for allo, allo_obj in strat_obj.allocation_engines_d.items()
+                    ]
+                ),
+                all_portfolios=strat_obj.all_portfolios,
+            )
+        del runner
+        return results
+    finally:
+        shared.close()
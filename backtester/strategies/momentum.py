@@ -38,14 +38,7 @@ class Momentum(strategy.Strategy):
         np.array
             array of indexes
         """
-        (tradeable,) = np.where(
-            (self.index_comp > 0)
-            & (
-                ~np.isnan(self.risk_engine.cov_calculator.data_stream.matrix)
-                .any(axis=0)
-                .squeeze()
-            )
-        )
+        (tradeable,) = np.where((self.index_comp > 0) & self.risk_engine.valid_assets)
         neg_sort = tradeable[np.argsort(-self.return_metrics_intuitive[tradeable])]
         return neg_sort[: self.top_n]
 
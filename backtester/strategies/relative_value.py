@@ -109,11 +109,7 @@ class RelativeValue(strategy.Strategy):
         """
         ss = np.arange(self.num_total_assets)
         return ss[
-            (
-                ~np.isnan(self.risk_engine.cov_calculator.data_stream.matrix)
-                .any(axis=0)
-                .squeeze()
-            )
+            self.risk_engine.valid_assets
             & (self.index_comp > 0)
             & (self.market_caps > self.market_cap_threshold)
             & (self.divyield > self.div_yield_threshold)
@@ -5,10 +5,12 @@ import quantkit.backtester.allocation.hrp as hrp
 import quantkit.backtester.allocation.equal_weight as equal_weight
 import quantkit.backtester.allocation.market_weight as market_weight
 import quantkit.backtester.allocation.original_weight as original_weight
+import quantkit.backtester.allocation.allocation_ledger as allocation_ledger
 import quantkit.backtester.risk_management.stop_loss.buy_to_low as buy_to_low
 import quantkit.backtester.risk_management.stop_loss.high_to_low as high_to_low
 import quantkit.backtester.risk_management.stop_loss.no_stop as no_stop
 import quantkit.utils.mapping_configs as mapping_configs
+import quantkit.utils.result_store as result_store
 import pandas as pd
 import numpy as np
 import datetime
@@ -71,7 +73,9 @@ class Strategy(object):
         **kwargs,
     ) -> None:
         self.rebalance = rebalance
-        self.all_portfolios = pd.DataFrame(columns=["portfolio_name", "return"])
+        self.portfolio_store = result_store.ResultStore(
+            columns={"portfolio_name": "category", "return": float}
+        )
         self.universe = universe
         self.num_total_assets = len(universe)
         self.trans_cost = np.ones(self.num_total_assets) * trans_cost
@@ -196,6 +200,36 @@ class Strategy(object):
             date=date, price_return=price_return, annualize_factor=annualize_factor
         )
 
+    def assign_block(
+        self,
+        dates: list,
+        price_returns: np.ndarray,
+        annualize_factor: int = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Transform and assign a block of returns to the actual calculator
+        Same result as calling assign for each date of the block,
+        snapshot data in kwargs belongs to the last date of the block
+
+        Parameters
+        ----------
+        dates: list
+            dates of snapshots
+        price_returns: np.array
+            zero base price returns of universe, one row per date
+        annualize_factor: int, optional
+            factor depending on data frequency
+        """
+        self.stop_loss.assign_block(
+            dates=dates[:-1],
+            price_returns=price_returns[:-1],
+            annualize_factor=annualize_factor,
+        )
+        kwargs["date"] = dates[-1]
+        kwargs["price_return"] = price_returns[-1]
+        self.assign(annualize_factor=annualize_factor, **kwargs)
+
     def get_risk_budgets(self, date: datetime.date) -> dict:
         """
         get risk budgets for each allocation in allocation_engines_d
@@ -251,6 +285,43 @@ class Strategy(object):
         )
         return portfolio_return
 
+    def get_portfolio_stats_batch(
+        self,
+        allocations: np.ndarray,
+        next_allocations: np.ndarray,
+        allocation_models: list,
+    ) -> pd.DataFrame:
+        """
+        Portfolio level stats of all allocation models in one pass
+
+        Parameters
+        ----------
+        allocations: np.array
+            weight allocations in the order of universe_tickers,
+            one row per allocation model
+        next_allocations: np.array
+            weight allocations of next period, one row per allocation model
+        allocation_models: list
+            names of allocation models
+
+        Returns
+        -------
+        pd.DataFrame
+            returns in frequency over last rebalance period,
+            one column per allocation model
+        """
+        portfolio_returns = self.portfolio_return_engine.get_portfolio_returns(
+            allocations,
+            stopped_securities_matrix=np.array(
+                self.stop_loss.stopped_securities_matrix
+            ),
+            next_allocations=next_allocations,
+            trans_cost=self.trans_cost,
+            leverage=self.portfolio_leverage,
+            columns=allocation_models,
+        )
+        return portfolio_returns
+
     def get_allocation(self, date: datetime.date, allocation_model: str):
         """
         Get allocation and next for allocation model by accessing allocation history
@@ -273,9 +344,8 @@ class Strategy(object):
         allocations = self.allocation_engines_d.get(
             allocation_model
         ).allocations_history
-        allocation_pd = pd.DataFrame.from_dict(allocations, orient="index")
-        portfolio_allocation = allocation_pd.shift(1).loc[date].values
-        next_portfolio_allocation = allocation_pd.loc[date].values
+        portfolio_allocation = allocations.previous(date).copy()
+        next_portfolio_allocation = allocations[date].copy()
         return portfolio_allocation, next_portfolio_allocation
 
     def backtest(
@@ -309,21 +379,44 @@ class Strategy(object):
             )
             allocation_engine.allocate(date, self.selected_securities)
 
-        for allocation_model in self.allocation_engines_d:
-            ex_ante_allocation, ex_post_allocation = self.get_allocation(
-                date, allocation_model
+        if not self.allocation_engines_d:
+            return
+        allocation_models = list(self.allocation_engines_d)
+        allocations = [
+            self.get_allocation(date, allocation_model)
+            for allocation_model in allocation_models
+        ]
+        ex_ante_portfolio_returns = self.get_portfolio_stats_batch(
+            np.array([ex_ante for ex_ante, ex_post in allocations]),
+            np.array([ex_post for ex_ante, ex_post in allocations]),
+            allocation_models,
+        )
+        for allocation_model in allocation_models:
+            self.portfolio_store.append(
+                ex_ante_portfolio_returns.index,
+                {
+                    "portfolio_name": f"ex_ante_{allocation_model}",
+                    "return": ex_ante_portfolio_returns[allocation_model].to_numpy(),
+                },
             )
 
-            ex_ante_portfolio_return = self.get_portfolio_stats(
-                ex_ante_allocation, ex_post_allocation
-            )
-            ex_ante_portfolio_return["portfolio_name"] = f"ex_ante_{allocation_model}"
-            self.all_portfolios = pd.concat(
-                [self.all_portfolios, ex_ante_portfolio_return], axis=0
-            )
-            cum_return = ((ex_ante_portfolio_return["return"] + 1).cumprod() - 1)[
-                -1:
-            ].to_numpy()
+    @property
+    def all_portfolios(self) -> pd.DataFrame:
+        """
+        Portfolio returns of all allocation models
+
+        Returns
+        -------
+        pd.DataFrame
+            portfolio_name and return per date
+        """
+        return self.portfolio_store.to_frame()
+
+    @all_portfolios.setter
+    def all_portfolios(self, all_portfolios: pd.DataFrame) -> None:
+        self.portfolio_store = result_store.ResultStore.from_frame(
+            all_portfolios, columns=self.portfolio_store.columns
+        )
 
     @property
     def return_metrics_intuitive(self) -> np.ndarray:
@@ -350,6 +443,19 @@ class Strategy(object):
         """
         raise NotImplementedError()
 
+    def reset_results(self) -> None:
+        """
+        Clear allocation histories and portfolio returns,
+        p.e. to start an out-of-sample period from a warm state
+        """
+        for allocation_model, allocation_engine in self.allocation_engines_d.items():
+            allocation_engine.allocations_history = allocation_ledger.AllocationLedger(
+                allocation_engine.num_total_assets
+            )
+        self.portfolio_store = result_store.ResultStore(
+            columns=self.portfolio_store.columns
+        )
+
     def is_valid(self):
         """
         check if inputs are valid
@@ -0,0 +1,252 @@
+import pandas as pd
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import quantkit.utils.logging as logging
+import quantkit.utils.shared_arrays as shared_arrays
+import quantkit.utils.return_statistics as return_statistics
+import quantkit.backtester.runner_backtester as runner_backtester
+
+
+class WalkForward(object):
+    """
+    Walk-forward (rolling-origin) evaluation of all strategies of a runner
+
+    Test windows start on rebalance dates. Engines are warm-started: one pass over
+    the data updates all engines without optimizing and saves the state at the start
+    of each test window, so overlapping windows share the same history.
+    The warm-up is expanding, every window sees all history from the first date,
+    engines only forget data through their own window sizes.
+    Each window then starts from its state with empty allocation histories and is
+    backtested in a worker process. Portfolio returns after the test start are
+    out-of-sample and aggregated into one report.
+
+    Parameters
+    ----------
+    runner: Runner
+        initialized runner, used for the warm-up pass
+    min_history: int
+        minimum number of rebalance periods of history before first test window
+    test_size: int
+        number of rebalance periods per test window
+    step: int, optional
+        number of rebalance periods between test windows, default test_size
+    workers: int, optional
+        number of worker processes
+    """
+
+    def __init__(
+        self,
+        runner,
+        min_history: int,
+        test_size: int,
+        step: int = None,
+        workers: int = 1,
+    ) -> None:
+        self.runner = runner
+        self.min_history = min_history
+        self.test_size = test_size
+        self.step = test_size if step is None else step
+        self.workers = workers
+        self.windows = self.get_windows()
+        self.states = dict()
+        self.all_portfolios = pd.DataFrame(
+            columns=["window", "strategy", "portfolio_name", "return"]
+        )
+
+    def get_windows(self) -> pd.DataFrame:
+        """
+        Test windows on rebalance dates
+
+        Returns
+        -------
+        pd.DataFrame
+            test_start and test_end per window
+        """
+        rebalance_dates = self.runner.prices_datasource.rebalance_dates
+        windows = list()
+        for loc in range(
+            self.min_history, len(rebalance_dates) - self.test_size, self.step
+        ):
+            windows.append(
+                dict(
+                    window=len(windows),
+                    test_start=rebalance_dates[loc],
+                    test_end=rebalance_dates[loc + self.test_size],
+                )
+            )
+        return pd.DataFrame(
+            windows, columns=["window", "test_start", "test_end"]
+        ).set_index("window")
+
+    def warm_start(self) -> None:
+        """
+        Assign all returns up to the last test start to engines without optimizing,
+        save state before each test start
+        """
+        return_data = self.runner.get_return_data()
+        dates = return_data.index
+        returns = return_data.to_numpy(dtype=float)
+        rebalance_dates = set(self.runner.prices_datasource.rebalance_dates)
+        test_starts = set(self.windows["test_start"])
+
+        # each block ends on a rebalance date or before a test start
+        block_ends = [
+            i + 1
+            for i, date in enumerate(dates)
+            if date in rebalance_dates
+            or (i + 1 < len(dates) and dates[i + 1] in test_starts)
+        ]
+
+        block_start = 0
+        for block_end in block_ends:
+            if len(self.states) == len(test_starts):
+                break
+            if block_end > block_start:
+                assign_dict = self.runner.assign_block(
+                    dates[block_start:block_end], returns[block_start:block_end]
+                )
+                date = dates[block_end - 1]
+                if date in rebalance_dates:
+                    self.runner.rebalance(date, assign_dict, backtest=False)
+            if block_end < len(dates) and dates[block_end] in test_starts:
+                logging.log(f"Warm start {dates[block_end].strftime('%Y-%m-%d')}")
+                self.states[dates[block_end]] = pickle.dumps(
+                    self.runner.get_state(dates[block_end - 1]),
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            block_start = block_end
+
+    def run(self) -> pd.DataFrame:
+        """
+        Backtest all test windows from their warm state in worker processes
+
+        Returns
+        -------
+        pd.DataFrame
+            out-of-sample portfolio returns of all windows
+        """
+        if not len(self.windows):
+            raise RuntimeError("No walk forward windows for given sizes..")
+        self.warm_start()
+
+        shared, meta = self.runner.share_data()
+        try:
+            if self.workers > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [
+                        executor.submit(
+                            walk_forward_worker,
+                            shared.specs,
+                            meta,
+                            self.states[window["test_start"]],
+                            window["test_start"],
+                            window["test_end"],
+                        )
+                        for w, window in self.windows.iterrows()
+                    ]
+                    results = [future.result() for future in futures]
+            else:
+                results = [
+                    walk_forward_worker(
+                        shared.specs,
+                        meta,
+                        self.states[window["test_start"]],
+                        window["test_start"],
+                        window["test_end"],
+                    )
+                    for w, window in self.windows.iterrows()
+                ]
+        finally:
+            shared.unlink()
+
+        all_portfolios = list()
+        for w, result in zip(self.windows.index, results):
+            for strat, strat_portfolios in result.items():
+                strat_portfolios.insert(0, "strategy", strat)
+                strat_portfolios.insert(0, "window", w)
+                all_portfolios.append(strat_portfolios)
+        self.all_portfolios = pd.concat(all_portfolios, axis=0)
+        return self.all_portfolios
+
+    def report(self, by_window: bool = False) -> pd.DataFrame:
+        """
+        Out-of-sample portfolio statistics
+
+        Parameters
+        ----------
+        by_window: bool, optional
+            statistics per window, otherwise over all windows
+
+        Returns
+        -------
+        pd.DataFrame
+            one row per strategy and allocation model (and window)
+        """
+        frequency = self.runner.params["prices_datasource"]["frequency"]
+        groups = ["window"] if by_window else list()
+        groups += ["strategy", "portfolio_name"]
+
+        results = list()
+        for keys, return_series in self.all_portfolios.groupby(groups, sort=False):
+            row = dict(zip(groups, keys))
+            if not by_window:
+                # overlapping windows: keep first out-of-sample return per date
+                return_series = return_series[
+                    ~return_series.index.duplicated(keep="first")
+                ].sort_index()
+            row.update(
+                return_statistics.portfolio_stats(
+                    return_series.astype({"return": float}), frequency=frequency
+                )
+            )
+            results.append(row)
+        return pd.DataFrame(results)
+
+
+def walk_forward_worker(
+    specs: dict, meta: dict, state: bytes, test_start, test_end
+) -> dict:
+    """
+    Backtest one walk forward window in a worker process on data in shared memory
+
+    Parameters
+    ----------
+    specs: dict
+        shared memory specs, as in SharedArrays.specs
+    meta: dict
+        dates and tickers of shared arrays, as returned by Runner.share_data
+    state: bytes
+        pickled state before test start, as returned by Runner.get_state
+    test_start: datetime.date
+        first rebalance date of window
+    test_end: datetime.date
+        last rebalance date of window
+
+    Returns
+    -------
+    dict
+        out-of-sample portfolio returns per strategy
+    """
+    shared = shared_arrays.SharedArrays.attach(specs)
+    try:
+        runner = runner_backtester.Runner()
+        runner.checkpoint_params = dict()
+        runner.attach_data(shared, meta)
+        runner.set_state(pickle.loads(state))
+        for strat, strat_obj in runner.strategies.items():
+            strat_obj.reset_results()
+
+        return_data = runner.prices_datasource.return_data
+        return_data = return_data[
+            (return_data.index >= test_start) & (return_data.index <= test_end)
+        ]
+        runner.run_strategies(assign_weights=False, return_data=return_data)
+
+        results = dict()
+        for strat, strat_obj in runner.strategies.items():
+            all_portfolios = strat_obj.all_portfolios
+            results[strat] = all_portfolios[all_portfolios.index > test_start].copy()
+        del runner
+        return results
+    finally:
+        shared.close()
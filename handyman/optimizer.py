@@ -74,11 +74,7 @@ def minimum_variance(
             minvar_optimizer.update(selected_assets=selected_assets)
             minvar_optimizer.allocate(date=date, selected_assets=selected_assets)
 
-    weights = pd.DataFrame.from_dict(
-        minvar_optimizer.allocations_history,
-        orient="index",
-        columns=universe,
-    )
+    weights = minvar_optimizer.allocations_history.to_frame(columns=universe)
     return weights
 
 
@@ -178,11 +174,7 @@ def mean_variance(
                 )
 
             mvo_optimizer.allocate(date=date, selected_assets=selected_assets)
-    weights = pd.DataFrame.from_dict(
-        mvo_optimizer.allocations_history,
-        orient="index",
-        columns=universe,
-    )
+    weights = mvo_optimizer.allocations_history.to_frame(columns=universe)
     return weights
 
 
@@ -267,9 +259,5 @@ def volatility_target(
                     )
             vol_optimizer.update(selected_assets=selected_assets)
             vol_optimizer.allocate(date=date, selected_assets=selected_assets)
-    weights = pd.DataFrame.from_dict(
-        vol_optimizer.allocations_history,
-        orient="index",
-        columns=universe,
-    )
+    weights = vol_optimizer.allocations_history.to_frame(columns=universe)
     return weights
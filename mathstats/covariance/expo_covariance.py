@@ -1,6 +1,8 @@
 import numpy as np
+from typing import Union
 import quantkit.mathstats.covariance.simple_covariance as simple_covariance
 import quantkit.mathstats.mean.expo_weighted_mean as expo_weighted_mean
+import quantkit.mathstats.streaming_base.streaming_base as streaming_base
 
 
 class ExponentialWeightedCovariance(simple_covariance.Covariance):
@@ -16,18 +18,36 @@ class ExponentialWeightedCovariance(simple_covariance.Covariance):
         Number of observed data inputs before output is generated
     adjust: bool, optional
         calculate on adjusted or unadjusted version
+    retention: str | int, optional
+        history of data streams, "full", "none" or number of last observations
+    dtype: type, optional
+        float dtype of incoming data and data streams,
+        mean and covariance are accumulated in float64
     """
 
     def __init__(
-        self, num_ind_variables: int, min_observations: int = 1, adjust=True, **kwargs
+        self,
+        num_ind_variables: int,
+        min_observations: int = 1,
+        adjust=True,
+        retention: Union[str, int] = "none",
+        dtype: type = np.float64,
+        **kwargs,
     ) -> None:
         super().__init__(
-            num_ind_variables=num_ind_variables, min_observations=min_observations
+            num_ind_variables=num_ind_variables,
+            min_observations=min_observations,
+            retention=retention,
+            dtype=dtype,
         )
         self.adjust = adjust
 
         self.mean_calculator = expo_weighted_mean.ExponentialWeightedMean(
-            num_ind_variables=num_ind_variables, adjust=adjust, **kwargs
+            num_ind_variables=num_ind_variables,
+            adjust=adjust,
+            retention=retention,
+            dtype=dtype,
+            **kwargs,
         )
 
     def update_demeaned(
@@ -60,6 +80,90 @@ class ExponentialWeightedCovariance(simple_covariance.Covariance):
                 **kwargs,
             )
 
+    def adjustment_block(self, n_obs: int, batch_weight: float = 1) -> np.ndarray:
+        """
+        Adjustment of previous covariance for each of the next n_obs observations,
+        evaluated before the mean calculator is updated
+
+        Parameters
+        ----------
+        n_obs: int
+            number of observations in block
+        batch_weight: float
+            Weight
+
+        Returns
+        -------
+        np.array
+            adjustment per observation
+        """
+        batch_weight = np.ravel(batch_weight)
+        if not self.adjust:
+            return np.full(shape=n_obs, fill_value=batch_weight[0])
+
+        exponents = self.mean_calculator.total_iterations + np.arange(n_obs)
+        weight_sum = np.cumsum(
+            np.concatenate(
+                [np.ravel(self.mean_calculator.weight_sum), batch_weight**exponents]
+            )
+        )
+        return (weight_sum[1:] - 1) / np.maximum(weight_sum[:-1], 1)
+
+    def update_demeaned_block(
+        self,
+        vector_calc: np.ndarray,
+        adjustment: np.ndarray,
+        batch_weight: int = 1,
+        indexes: list = None,
+    ) -> None:
+        """
+        Update covariance calculation with a block of vectors,
+        one vector per observation
+
+        Parameters
+        ----------
+        vector_calc : np.array
+            vectors of second summand of covariance calculation
+        adjustment: np.array
+            adjustment of previous covariance per observation
+        batch_weight: float
+            Weight
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        self.demean_squared.update_block(
+            new_vectors=vector_calc,
+            batch_weight=1 if self.adjust else (1 - batch_weight),
+            adjustment=adjustment,
+            indexes=indexes,
+        )
+
+    def merge_weights(self, other, batch_weight: float = 1) -> tuple:
+        """
+        Weights to merge co-moments of a later chunk of data,
+        own co-moments decay over all observations of other.
+        Only available for adjusted version.
+
+        Parameters
+        ----------
+        other: ExponentialWeightedCovariance
+            covariance of later chunk of data
+        batch_weight: float
+            decay factor
+
+        Returns
+        -------
+        tuple
+            adjustment of own co-moments, weight of outer product of difference of means
+        """
+        if not self.adjust or not other.adjust:
+            raise RuntimeError("Merge is only available for adjusted version..")
+        decay = batch_weight**other.mean_calculator.total_iterations
+        weight_sum_a = decay * self.mean_calculator.weight_sum
+        weight_sum_b = other.mean_calculator.weight_sum
+        weight_sum = weight_sum_a + weight_sum_b
+        return decay, weight_sum_a * weight_sum_b / max(weight_sum, 1e-300)
+
     @property
     def results(self) -> dict:
         """
@@ -84,3 +188,220 @@ class ExponentialWeightedCovariance(simple_covariance.Covariance):
         self._results["mean"] = self.mean_calculator.mean
         self._results["gmean"] = self.mean_calculator.gmean
         return self._results
+
+
+class ExponentialWeightedCovarianceBank(streaming_base.StreamingBase):
+    """
+    Exponential Weighted Covariance Matrices for several decay factors in one pass
+    Adjusted version, same as pd.DataFrame.ewm(alpha=1 - decay_factor).cov(bias=True)
+
+    Calculation in Incremental way:
+
+        Incoming variables are shifted by their first observation, the outer product
+        of the shifted variables is calculated once and added to all K decayed sums
+
+            S_k = decay_k * S_k + x x'
+            M_k = decay_k * M_k + x
+            W_k = decay_k * W_k + 1
+
+        covariance_k = S_k / W_k - (M_k / W_k) (M_k / W_k)'
+
+    Missing values don't contribute to the sums, covariances are divided by the smaller
+    weight sum of both variables.
+    Memory is K x N x N, an update costs one outer product and K x N x N multiply-adds.
+
+    Parameters
+    ----------
+    num_ind_variables : int
+        Number of of independent variables
+    decay_factors: list, optional
+        decay factors, more can be added before first update
+    min_observations : int, optional
+        Number of observed data inputs before output is generated
+    dtype: type, optional
+        float dtype of incoming data, p.e. np.float32,
+        sums are accumulated in float64
+    """
+
+    def __init__(
+        self,
+        num_ind_variables: int,
+        decay_factors: list = None,
+        min_observations: int = 1,
+        dtype: type = np.float64,
+        **kwargs,
+    ) -> None:
+        super().__init__(num_ind_variables=num_ind_variables)
+        self.min_observations = min_observations
+        self.dtype = dtype
+        self.decay_factors = np.zeros(0)
+        self._shift = np.full(num_ind_variables, np.nan)
+        self._weight_sum = np.zeros((0, num_ind_variables))
+        self._mean_sum = np.zeros((0, num_ind_variables))
+        self._cross_sum = np.zeros((0, num_ind_variables, num_ind_variables))
+        for decay_factor in decay_factors or list():
+            self.add_decay_factor(decay_factor)
+
+    def add_decay_factor(self, decay_factor: float) -> int:
+        """
+        Add decay factor to bank, only possible before first update
+
+        Parameters
+        ----------
+        decay_factor: float
+            weight of previous observations, between 0 and 1
+
+        Returns
+        -------
+        int
+            position of decay factor in bank
+        """
+        if decay_factor in self.decay_factors:
+            return self.decay_index(decay_factor)
+        if self.total_iterations > 0:
+            raise RuntimeError(
+                f"Decay factor {decay_factor} can only be added before first update.."
+            )
+        self.decay_factors = np.append(self.decay_factors, decay_factor)
+        n_decays = len(self.decay_factors)
+        num_variables = self.num_ind_variables
+        self._weight_sum = np.zeros((n_decays, num_variables))
+        self._mean_sum = np.zeros((n_decays, num_variables))
+        self._cross_sum = np.zeros((n_decays, num_variables, num_variables))
+        return n_decays - 1
+
+    def decay_index(self, decay_factor: float) -> int:
+        """
+        Position of decay factor in bank
+
+        Parameters
+        ----------
+        decay_factor: float
+            decay factor
+
+        Returns
+        -------
+        int
+            position of decay factor
+        """
+        positions = np.flatnonzero(self.decay_factors == decay_factor)
+        if len(positions) == 0:
+            raise RuntimeError(f"Decay factor {decay_factor} is not in bank..")
+        return positions[0]
+
+    def get_mean(self, decay_factor: float) -> np.ndarray:
+        """
+        Exponential weighted mean for one decay factor
+
+        Parameters
+        ----------
+        decay_factor: float
+            decay factor
+
+        Returns
+        -------
+        np.array
+            mean
+        """
+        k = self.decay_index(decay_factor)
+        weight_sum = self._weight_sum[k]
+        return np.where(
+            weight_sum > 0,
+            self._mean_sum[k] / np.where(weight_sum > 0, weight_sum, 1) + self._shift,
+            np.nan,
+        )
+
+    def get_cov(self, decay_factor: float) -> np.ndarray:
+        """
+        Exponential weighted covariance matrix for one decay factor
+
+        Parameters
+        ----------
+        decay_factor: float
+            decay factor
+
+        Returns
+        -------
+        np.array
+            covariance matrix
+        """
+        k = self.decay_index(decay_factor)
+        weight_sum = self._weight_sum[k]
+        pair_weight_sum = np.minimum(weight_sum[:, np.newaxis], weight_sum)
+        shifted_mean = np.where(
+            weight_sum > 0,
+            self._mean_sum[k] / np.where(weight_sum > 0, weight_sum, 1),
+            0,
+        )
+        cov = self._cross_sum[k] / np.where(
+            pair_weight_sum > 0, pair_weight_sum, 1
+        ) - np.outer(shifted_mean, shifted_mean)
+        return np.where(pair_weight_sum > 0, cov, np.nan)
+
+    @property
+    def results(self) -> dict:
+        """
+        Generate a dictionary of results containing covariance matrices and means
+
+        Returns
+        -------
+        dict
+            cov: covariance matrix per decay factor
+            mean: mean per decay factor
+        """
+        if self.total_iterations < self.min_observations:
+            return
+
+        self._results["cov"] = np.array([self.get_cov(d) for d in self.decay_factors])
+        self._results["mean"] = np.array([self.get_mean(d) for d in self.decay_factors])
+        return self._results
+
+    def update(self, batch_ind: np.ndarray, **kwargs) -> None:
+        """
+        Update covariance matrices of all decay factors with new data streamed in
+
+        Parameters
+        ----------
+        batch_ind : np.array
+            Independent variable data
+        """
+        batch_ind = np.asarray(batch_ind, dtype=self.dtype).astype(np.float64)
+        self.total_iterations += 1
+        self._shift = np.where(np.isnan(self._shift), batch_ind, self._shift)
+
+        # shared by all decay factors
+        is_valid = ~np.isnan(batch_ind)
+        shifted = np.where(is_valid, batch_ind - self._shift, 0)
+        outer = np.outer(shifted, shifted)
+
+        decay_factors = self.decay_factors[:, np.newaxis]
+        self._weight_sum *= decay_factors
+        self._weight_sum += is_valid
+        self._mean_sum *= decay_factors
+        self._mean_sum += shifted
+        self._cross_sum *= decay_factors[:, :, np.newaxis]
+        self._cross_sum += outer
+
+    def update_block(self, batch_ind: np.ndarray, **kwargs) -> None:
+        """
+        Update covariance matrices of all decay factors with a block of new data,
+        one row per observation. Same result as calling update for each row.
+
+        Parameters
+        ----------
+        batch_ind : np.array
+            Independent variable data, one row per observation
+        """
+        for row in batch_ind:
+            self.update(row)
+
+    def is_valid(self):
+        """
+        check if inputs are valid
+
+        Returns
+        -------
+        bool
+            True if inputs are valid, false otherwise
+        """
+        return self.total_iterations >= self.min_observations
@@ -0,0 +1,278 @@
+import quantkit.mathstats.streaming_base.streaming_base as streaming_base
+import quantkit.mathstats.time_series.decay as decay
+import numpy as np
+
+
+class FactorCovarianceMatrix(object):
+    r"""
+    Covariance matrix in factored form
+
+    Calculation
+    -----------
+        \Sigma = L L' + diag(d)
+
+    The dense (N x N) matrix is only created on demand, subsetting with
+    np.ix_ and products with vectors stay in factored form.
+
+    Parameters
+    ----------
+    factor_loadings: np.array
+        (N x K) loadings L of variables on factors, scaled by factor volatility
+    specific_variance: np.array
+        (N) specific variance d of variables not explained by factors
+    """
+
+    def __init__(
+        self, factor_loadings: np.ndarray, specific_variance: np.ndarray
+    ) -> None:
+        self.factor_loadings = factor_loadings
+        self.specific_variance = specific_variance
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Returns
+        -------
+        tuple
+            shape of dense covariance matrix
+        """
+        return (len(self.specific_variance), len(self.specific_variance))
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            dense covariance matrix
+        """
+        return self.factor_loadings @ self.factor_loadings.T + np.diag(
+            self.specific_variance
+        )
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self.to_dense() if dtype is None else self.to_dense().astype(dtype)
+
+    def __getitem__(self, key):
+        """
+        Subset of covariance matrix, p.e. matrix[np.ix_(assets, assets)]
+        Same rows and columns stay in factored form
+
+        Parameters
+        ----------
+        key
+            index of rows and columns
+
+        Returns
+        -------
+        FactorCovarianceMatrix | np.array
+            subset of covariance matrix
+        """
+        if isinstance(key, tuple) and len(key) == 2:
+            rows, columns = np.ravel(key[0]), np.ravel(key[1])
+            if np.array_equal(rows, columns):
+                return FactorCovarianceMatrix(
+                    factor_loadings=self.factor_loadings[rows],
+                    specific_variance=self.specific_variance[rows],
+                )
+        return self.to_dense()[key]
+
+    def __matmul__(self, other: np.ndarray) -> np.ndarray:
+        """
+        Product of covariance matrix and vector without dense matrix
+
+        Parameters
+        ----------
+        other: np.array
+            vector, p.e. weights
+
+        Returns
+        -------
+        np.array
+            covariance matrix @ other
+        """
+        return self.factor_loadings @ (
+            self.factor_loadings.T @ other
+        ) + self.specific_variance * np.asarray(other)
+
+
+class FactorCovariance(streaming_base.StreamingBase):
+    r"""
+    Streaming statistical factor covariance with K factors and specific risk
+    Exponentially weighted covariance is kept as rank K eigen decomposition
+    (incremental PCA) plus its exact diagonal, memory O(N * K).
+
+    Calculation
+    -----------
+    Weighted Welford update with decay a, weight sum W_t = a * W_{t-1} + 1:
+
+        delta = x_t - mean_{t-1}
+        S_t = a * S_{t-1} + a * W_{t-1} / W_t * delta * delta'
+
+    S is approximated by U diag(s) U'. The rank-one update is calculated in the
+    (K+1) dimensional space spanned by U and the residual of delta, only the
+    K largest eigenvalues are kept, O(N * K^2) per update.
+
+        Cov = S / W = L L' + diag(d)
+
+    with loadings L = U sqrt(s / W) and specific variance d = diag(S) / W - diag(L L').
+    Missing values are treated as equal to the current mean.
+
+    Parameters
+    ----------
+    num_ind_variables : int
+        Number of variables
+    num_factors: int, optional
+        Number of statistical factors K
+    span: int, optional
+        span of exponential weights, decay = 1 - 2 / (span + 1)
+    min_observations : int, optional
+        Number of observed data inputs before output is generated, default span
+    dtype: type, optional
+        float dtype of incoming data, p.e. np.float32,
+        factors are calculated in float64
+    """
+
+    def __init__(
+        self,
+        num_ind_variables: int,
+        num_factors: int = 5,
+        span: int = 63,
+        min_observations: int = None,
+        dtype: type = np.float64,
+        **kwargs,
+    ) -> None:
+        super().__init__(num_ind_variables=num_ind_variables)
+        self.dtype = dtype
+        self.num_factors = min(num_factors, num_ind_variables)
+        self.decay = 1 - decay.decay_span(span)
+        self.min_observations = span if min_observations is None else min_observations
+
+        self.weight_sum = 0.0
+        self._mean = np.full(num_ind_variables, np.nan)
+        self._eigenvectors = np.zeros((num_ind_variables, self.num_factors))
+        self._eigenvalues = np.zeros(self.num_factors)
+        self._variance_sum = np.zeros(num_ind_variables)
+
+    @property
+    def mean(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            exponentially weighted mean
+        """
+        return self._mean
+
+    @property
+    def factor_loadings(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            (N x K) loadings on factors, scaled by factor volatility
+        """
+        return self._eigenvectors * np.sqrt(
+            self._eigenvalues / max(self.weight_sum, 1e-300)
+        )
+
+    @property
+    def specific_variance(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            variance not explained by factors
+        """
+        variance = self._variance_sum / max(self.weight_sum, 1e-300)
+        return np.maximum(variance - np.sum(self.factor_loadings**2, axis=1), 0)
+
+    @property
+    def results(self) -> dict:
+        """
+        Generate a dictionary of results
+
+        Returns
+        -------
+        dict
+            cov: covariance matrix in factored form
+            factor_loadings: loadings on factors
+            specific_variance: variance not explained by factors
+            mean: mean
+        """
+        if self.total_iterations < self.min_observations:
+            return self._results
+
+        factor_loadings = self.factor_loadings
+        specific_variance = self.specific_variance
+        self._results["cov"] = FactorCovarianceMatrix(
+            factor_loadings=factor_loadings, specific_variance=specific_variance
+        )
+        self._results["factor_loadings"] = factor_loadings
+        self._results["specific_variance"] = specific_variance
+        self._results["mean"] = self._mean
+        return self._results
+
+    def update(self, batch_ind: np.ndarray, **kwargs) -> None:
+        """
+        Update mean, factors and specific variance with new data
+
+        Parameters
+        ----------
+        batch_ind : np.array
+            incoming variables
+        """
+        batch_ind = np.asarray(batch_ind, dtype=self.dtype).astype(np.float64)
+        self.total_iterations += 1
+
+        previous_weight_sum = self.weight_sum
+        self.weight_sum = self.decay * previous_weight_sum + 1
+        weight = self.decay * previous_weight_sum / self.weight_sum
+
+        delta = np.nan_to_num(batch_ind - self._mean)
+        self._mean = np.where(
+            np.isnan(self._mean), batch_ind, self._mean + delta / self.weight_sum
+        )
+        self._variance_sum = self.decay * self._variance_sum + weight * delta**2
+
+        # rank-one update in space of eigenvectors and residual
+        projection = self._eigenvectors.T @ delta
+        residual = delta - self._eigenvectors @ projection
+        residual_norm = np.linalg.norm(residual)
+        if residual_norm > 0:
+            residual = residual / residual_norm
+
+        coefficients = np.append(projection, residual_norm)
+        small_matrix = np.diag(np.append(self.decay * self._eigenvalues, 0))
+        small_matrix += weight * np.outer(coefficients, coefficients)
+        eigenvalues, eigenvectors = np.linalg.eigh(small_matrix)
+
+        # eigh sorts ascending, keep K largest
+        largest = np.argsort(eigenvalues)[::-1][: self.num_factors]
+        self._eigenvalues = np.maximum(eigenvalues[largest], 0)
+        self._eigenvectors = self._eigenvectors @ eigenvectors[:-1, largest] + np.outer(
+            residual, eigenvectors[-1, largest]
+        )
+
+    def update_block(self, batch_ind: np.ndarray, **kwargs) -> None:
+        """
+        Update mean, factors and specific variance with a block of data,
+        one row per observation. Same result as calling update for each row.
+
+        Parameters
+        ----------
+        batch_ind : np.array
+            incoming variables, one row per observation
+        """
+        for row in batch_ind:
+            self.update(row)
+
+    def is_valid(self) -> bool:
+        """
+        check if inputs are valid
+
+        Returns
+        -------
+        bool
+            True if inputs are valid, false otherwise
+        """
+        return self.total_iterations >= self.min_observations
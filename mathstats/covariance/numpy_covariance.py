@@ -16,14 +16,22 @@ class NumpyCovariance(streaming_base.StreamingBase):
         Size of the rolling window
     ddof: int
         degrees of freedom
+    dtype: type, optional
+        float dtype of data stream, covariance is calculated in float64
     """
 
-    def __init__(self, num_ind_variables: int, ddof: int = 0, **kwargs) -> None:
+    def __init__(
+        self,
+        num_ind_variables: int,
+        ddof: int = 0,
+        dtype: type = np.float64,
+        **kwargs,
+    ) -> None:
         super().__init__(num_ind_variables=num_ind_variables)
         self.ddof = ddof
 
         self.data_stream = weighted_base.WeightedBase(
-            matrix_shape=(1, num_ind_variables)
+            matrix_shape=(1, num_ind_variables), dtype=dtype
         )
 
     @property
@@ -39,11 +47,16 @@ class NumpyCovariance(streaming_base.StreamingBase):
             gmean: gmean
         """
         self._results["cov"] = np.cov(
-            self.data_stream.matrix.squeeze(), rowvar=0, ddof=self.ddof
+            self.data_stream.matrix.squeeze(),
+            rowvar=0,
+            ddof=self.ddof,
+            dtype=np.float64,
         )
         self._results["variance"] = np.diagonal(self._results["cov"])
 
-        self._results["mean"] = np.mean(self.data_stream.matrix.squeeze(), axis=0)
+        self._results["mean"] = np.mean(
+            self.data_stream.matrix.squeeze(), axis=0, dtype=np.float64
+        )
         return self._results
 
     def update(self, batch_ind: np.ndarray, batch_weight: float = 1, **kwargs) -> None:
@@ -63,6 +76,34 @@ class NumpyCovariance(streaming_base.StreamingBase):
             np.expand_dims(batch_ind, axis=0), batch_weight=batch_weight, **kwargs
         )
 
+    def update_block(
+        self,
+        batch_ind: np.ndarray,
+        batch_weight: float = 1,
+        indexes: list = None,
+        **kwargs,
+    ) -> None:
+        """
+        Updates the covariance matrix with a block of new streamed data.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        batch_ind : np.array
+            Independent variable data, one row per observation
+        batch_weight: float
+            Weight
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        self.total_iterations += len(batch_ind)
+
+        self.data_stream.update_block(
+            np.expand_dims(batch_ind, axis=1),
+            batch_weight=batch_weight,
+            indexes=indexes,
+        )
+
     def is_valid(self):
         """
         check if inputs are valid
@@ -87,10 +128,17 @@ class NumpyWindowCovariance(streaming_base.StreamingBase):
         Size of the rolling window
     ddof: int
         degrees of freedom
+    dtype: type, optional
+        float dtype of data stream, covariance is calculated in float64
     """
 
     def __init__(
-        self, num_ind_variables: int, window_size: int, ddof: int = 0, **kwargs
+        self,
+        num_ind_variables: int,
+        window_size: int,
+        ddof: int = 0,
+        dtype: type = np.float64,
+        **kwargs,
     ) -> None:
         super().__init__(num_ind_variables=num_ind_variables)
         self.window_size = window_size
@@ -99,6 +147,7 @@ class NumpyWindowCovariance(streaming_base.StreamingBase):
         self.data_stream = window_base.WindowBase(
             window_shape=(window_size, 1, num_ind_variables),
             window_size=window_size,
+            dtype=dtype,
         )
 
     @property
@@ -114,11 +163,16 @@ class NumpyWindowCovariance(streaming_base.StreamingBase):
             gmean: gmean
         """
         self._results["cov"] = np.cov(
-            self.data_stream.matrix.squeeze(), rowvar=0, ddof=self.ddof
+            self.data_stream.matrix.squeeze(),
+            rowvar=0,
+            ddof=self.ddof,
+            dtype=np.float64,
         )
         self._results["variance"] = np.diagonal(self._results["cov"])
 
-        self._results["mean"] = np.mean(self.data_stream.matrix.squeeze(), axis=0)
+        self._results["mean"] = np.mean(
+            self.data_stream.matrix.squeeze(), axis=0, dtype=np.float64
+        )
         return self._results
 
     def update(self, batch_ind: np.ndarray, **kwargs) -> None:
@@ -134,6 +188,26 @@ class NumpyWindowCovariance(streaming_base.StreamingBase):
 
         self.data_stream.update(np.expand_dims(batch_ind, axis=0), **kwargs)
 
+    def update_block(
+        self, batch_ind: np.ndarray, indexes: list = None, **kwargs
+    ) -> None:
+        """
+        Updates the window covariance matrix with a block of new streamed data.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        batch_ind : np.array
+            Independent variable data, one row per observation
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        self.total_iterations += len(batch_ind)
+
+        self.data_stream.update_block(
+            np.expand_dims(batch_ind, axis=1), indexes=indexes
+        )
+
     def is_valid(self):
         """
         check if inputs are valid
@@ -2,6 +2,7 @@ import quantkit.mathstats.streaming_base.streaming_base as streaming_base
 import quantkit.mathstats.streaming_base.weighted_base as weighted_base
 import quantkit.mathstats.mean.simple_mean as simple_mean
 import numpy as np
+from typing import Union
 
 
 class Covariance(streaming_base.StreamingBase):
@@ -21,21 +22,42 @@ class Covariance(streaming_base.StreamingBase):
         Number of of independent variables
     min_observations : int, optional
         Number of observed data inputs before output is generated
+    retention: str | int, optional
+        history of data streams, "full", "none" or number of last observations
+    dtype: type, optional
+        float dtype of incoming data and data streams,
+        mean and covariance are accumulated in float64
     """
 
     def __init__(
-        self, num_ind_variables: int, min_observations: int = 1, **kwargs
+        self,
+        num_ind_variables: int,
+        min_observations: int = 1,
+        retention: Union[str, int] = "none",
+        dtype: type = np.float64,
+        **kwargs,
     ) -> None:
         super().__init__(num_ind_variables=num_ind_variables)
         self.min_observations = min_observations
+        self.dtype = dtype
 
         self.mean_calculator = simple_mean.SimpleMean(
-            num_ind_variables=num_ind_variables, **kwargs
+            num_ind_variables=num_ind_variables,
+            retention=retention,
+            dtype=dtype,
+            **kwargs,
         )
         self.demean_squared = weighted_base.WeightedBase(
-            matrix_shape=(num_ind_variables, num_ind_variables)
+            matrix_shape=(num_ind_variables, num_ind_variables),
+            retention=retention,
+            dtype=dtype,
         )
 
+        # scratch arrays for in place update
+        self._previous_mean = np.zeros(shape=num_ind_variables)
+        self._this_mean = np.zeros(shape=num_ind_variables)
+        self._vector_calc = np.zeros(shape=(num_ind_variables, num_ind_variables))
+
     @property
     def results(self) -> dict:
         """
@@ -94,21 +116,182 @@ class Covariance(streaming_base.StreamingBase):
         batch_weight: float
             Weight
         """
+        batch_ind = np.asarray(batch_ind, dtype=self.dtype)
         self.total_iterations += 1
-        previous_mean = np.expand_dims(self.mean_calculator.mean, axis=0)
+        previous_mean = self.mean_calculator.calculate_mean(out=self._previous_mean)
         self.mean_calculator.update(
             incoming_variables=batch_ind, batch_weight=batch_weight, **kwargs
         )
+        this_mean = self.mean_calculator.calculate_mean(out=self._this_mean)
 
-        this_mean = np.expand_dims(self.mean_calculator.mean, axis=0)
-        batch_ind_array = np.expand_dims(batch_ind, axis=0)
-        vector_calc = (batch_ind_array - this_mean).T @ (
-            batch_ind_array - previous_mean
-        )
+        # outer product of demeaned variables, means are overwritten
+        np.subtract(batch_ind, this_mean, out=this_mean)
+        np.subtract(batch_ind, previous_mean, out=previous_mean)
+        np.multiply.outer(this_mean, previous_mean, out=self._vector_calc)
 
         self.update_demeaned(
-            vector_calc=vector_calc, batch_weight=batch_weight, **kwargs
+            vector_calc=self._vector_calc, batch_weight=batch_weight, **kwargs
+        )
+
+    def adjustment_block(self, n_obs: int, batch_weight: float = 1) -> np.ndarray:
+        """
+        Adjustment of previous covariance for each of the next n_obs observations,
+        evaluated before the mean calculator is updated
+
+        Parameters
+        ----------
+        n_obs: int
+            number of observations in block
+        batch_weight: float
+            Weight
+
+        Returns
+        -------
+        np.array
+            adjustment per observation
+        """
+        return np.ones(shape=n_obs)
+
+    def update_demeaned_block(
+        self,
+        vector_calc: np.ndarray,
+        adjustment: np.ndarray,
+        batch_weight: int = 1,
+        indexes: list = None,
+    ) -> None:
+        """
+        Update covariance calculation with a block of vectors,
+        one vector per observation
+
+        Parameters
+        ----------
+        vector_calc : np.array
+            vectors of second summand of covariance calculation
+        adjustment: np.array
+            adjustment of previous covariance per observation
+        batch_weight: float
+            Weight
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        self.demean_squared.update_block(
+            new_vectors=vector_calc,
+            batch_weight=batch_weight,
+            adjustment=adjustment,
+            indexes=indexes,
+        )
+
+    def update_block(
+        self,
+        batch_ind: np.ndarray,
+        batch_weight: float = 1,
+        indexes: list = None,
+        **kwargs,
+    ) -> None:
+        """
+        Update the covariance matrix with a block of new data streamed in.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        batch_ind : np.array
+            Independent variable data, one row per observation
+        batch_weight: float
+            Weight
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        if len(batch_ind) == 0:
+            return
+        batch_ind = np.asarray(batch_ind, dtype=self.dtype)
+
+        self.total_iterations += len(batch_ind)
+        previous_mean = self.mean_calculator.mean
+        adjustment = self.adjustment_block(len(batch_ind), batch_weight)
+        this_means = self.mean_calculator.update_block(
+            incoming_variables=batch_ind, batch_weight=batch_weight, indexes=indexes
+        )
+        previous_means = np.concatenate(
+            [np.expand_dims(previous_mean, axis=0), this_means[:-1]]
+        )
+
+        # one outer product per observation
+        vector_calc = np.einsum(
+            "ti,tj->tij", batch_ind - this_means, batch_ind - previous_means
+        )
+
+        self.update_demeaned_block(
+            vector_calc=vector_calc,
+            adjustment=adjustment,
+            batch_weight=batch_weight,
+            indexes=indexes,
+        )
+
+    def merge_weights(self, other, batch_weight: float = 1) -> tuple:
+        """
+        Weights to merge co-moments of a later chunk of data
+
+        Parameters
+        ----------
+        other: Covariance
+            covariance of later chunk of data
+        batch_weight: float
+            Weight
+
+        Returns
+        -------
+        tuple
+            adjustment of own co-moments, weight of outer product of difference of means
+        """
+        iterations_a = self.mean_calculator.iterations
+        iterations_b = other.mean_calculator.iterations
+        iterations = iterations_a + iterations_b
+        return 1, iterations_a * iterations_b / np.where(iterations > 0, iterations, 1)
+
+    def merge(self, other, batch_weight: float = 1) -> None:
+        """
+        Merge covariance of a later chunk of data into this covariance,
+        p.e. from parallel workers.
+        Same result as calling update for each row of the later chunk (up to rounding)
+        for pairs of variables observed in the same rows, p.e. variances or variables
+        without missing values. Co-moments of pairs with different observations,
+        p.e. a variable starting later than the others, depend on the means of the
+        sequential update of each variable and are approximated.
+        Vectors stored in data streams are kept as calculated in each chunk.
+
+        Calculation
+        -----------
+        Pairwise update of Chan et al.
+
+            co-moments = co-moments * adjustment + co-moments of other
+                + weight * (mean of other - mean) (mean of other - mean)'
+
+        with weight = count * count of other / (count + count of other)
+
+        see https://fanf2.user.srcf.net/hermes/doc/antiforgery/stats.pdf chapter 3
+
+        Parameters
+        ----------
+        other: Covariance
+            covariance of later chunk of data with same number of variables
+        batch_weight: float
+            Weight used for the incoming stream of data
+        """
+        if other.num_ind_variables != self.num_ind_variables:
+            raise RuntimeError(
+                f"Number of variables {other.num_ind_variables} does not match {self.num_ind_variables}.."
+            )
+        adjustment, mean_weight = self.merge_weights(other, batch_weight)
+        delta = (other.mean_calculator.mean - self.mean_calculator.mean) * np.sqrt(
+            mean_weight
+        )
+
+        self.mean_calculator.merge(other.mean_calculator, batch_weight=batch_weight)
+        self.demean_squared.merge(other.demean_squared, adjustment=adjustment)
+        self.demean_squared.current_vector = self.demean_squared.current_vector + (
+            np.nan_to_num(np.outer(delta, delta))
         )
+        self.total_iterations += other.total_iterations
 
     def is_valid(self):
         """
@@ -9,6 +9,14 @@ class WindowCovariance(streaming_base.StreamingBase):
     Rolling window covariance matrix calculation
     Implementation of pd.DataFrame.rolling().cov()
 
+    Calculation in Incremental way:
+
+        previous pair mean + (incoming outer product - outgoing outer product) / window size
+        covariance = pair mean - sample mean' * mean
+
+    The outgoing outer product is recalculated from the outgoing row of the window,
+    so only one (N x N) array of pair means is kept.
+
     Parameters
     ----------
     num_ind_variables : int
@@ -37,15 +45,8 @@ class WindowCovariance(streaming_base.StreamingBase):
             ddof=ddof,
             **kwargs,
         )
-        self._pair_mean = [
-            rolling_mean.RollingMean(
-                num_ind_variables=num_ind_variables,
-                window_size=window_size,
-                ddof=ddof,
-                **kwargs,
-            )
-            for _i in range(num_ind_variables)
-        ]
+        self.pair_window_size = window_size - ddof
+        self._pair_mean = np.zeros(shape=(num_ind_variables, num_ind_variables))
 
     @property
     def results(self) -> dict:
@@ -61,12 +62,9 @@ class WindowCovariance(streaming_base.StreamingBase):
         """
         mean_vec = np.expand_dims(np.array(self.rolling_mean.mean), axis=0)
         sample_mean_vec = np.expand_dims(np.array(self._mean_sample.mean), axis=0)
-        pair_mean_matrix = np.stack(
-            [self._pair_mean[i].mean for i in range(len(self._pair_mean))]
-        )
 
         self._results["cov"] = np.asarray(
-            pair_mean_matrix - sample_mean_vec.T @ mean_vec
+            self._pair_mean - sample_mean_vec.T @ mean_vec
         )
         self._results["variance"] = np.diagonal(self._results["cov"])
 
@@ -74,6 +72,40 @@ class WindowCovariance(streaming_base.StreamingBase):
         self._results["gmean"] = self.rolling_mean.gmean
         return self._results
 
+    def update_pair_mean(
+        self, incoming_rows: np.ndarray, outgoing_rows: np.ndarray
+    ) -> None:
+        """
+        Update mean of outer products in place, one row after the other,
+        so a block gives the same result as single updates
+
+        Calculation
+        -----------
+        previous pair mean + (incoming outer product - outgoing outer product) / window size
+
+        Both outer products are calculated in one matrix product
+        [incoming, -outgoing]' @ [incoming, outgoing], missing values count as 0.
+
+        Parameters
+        ----------
+        incoming_rows : np.array
+            Incoming variables, one row per observation
+        outgoing_rows : np.array
+            Outgoing variables, one row per observation
+        """
+        pairs = np.nan_to_num(
+            np.stack(
+                [
+                    np.asarray(incoming_rows, dtype=float),
+                    np.asarray(outgoing_rows, dtype=float),
+                ],
+                axis=1,
+            )
+        )
+        signs = np.array([[1.0], [-1.0]])
+        for v in pairs:
+            self._pair_mean += (signs * v).T @ v / self.pair_window_size
+
     def update(self, batch_ind: np.ndarray, **kwargs) -> None:
         """
         Updates the window covariance matrix with new streamed data
@@ -85,23 +117,44 @@ class WindowCovariance(streaming_base.StreamingBase):
         """
         self.total_iterations += 1
 
-        outgoing_row_expanded = self.rolling_mean.windowed_outgoing_row
-        outgoing_row = np.squeeze(outgoing_row_expanded, axis=0)
-        batch_ind_expanded = np.expand_dims(batch_ind, axis=0)
+        outgoing_row = np.squeeze(self.rolling_mean.windowed_outgoing_row, axis=0)
 
         self._mean_sample.update(
             incoming_variables=batch_ind, outgoing_variables=outgoing_row, **kwargs
         )
-
-        pair_product = batch_ind_expanded.T @ batch_ind_expanded
-        outgoing_pair_product = outgoing_row_expanded.T @ outgoing_row_expanded
-        for i, (x, y) in enumerate(zip(pair_product, outgoing_pair_product)):
-            self._pair_mean[i].update(x, y, **kwargs)
+        self.update_pair_mean(
+            np.expand_dims(batch_ind, axis=0), np.expand_dims(outgoing_row, axis=0)
+        )
 
         self.rolling_mean.update(
             incoming_variables=batch_ind, outgoing_variables=outgoing_row, **kwargs
         )
 
+    def update_block(
+        self, batch_ind: np.ndarray, indexes: list = None, **kwargs
+    ) -> None:
+        """
+        Updates the window covariance matrix with a block of new streamed data.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        batch_ind : np.array
+            Independent variable data, one row per observation
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        self.total_iterations += len(batch_ind)
+
+        outgoing_rows = np.concatenate(
+            [self.rolling_mean.data_stream.values[:, 0, :], batch_ind]
+        )[: len(batch_ind)]
+
+        self._mean_sample.update_block(incoming_variables=batch_ind, indexes=indexes)
+        self.update_pair_mean(batch_ind, outgoing_rows)
+
+        self.rolling_mean.update_block(incoming_variables=batch_ind, indexes=indexes)
+
     def is_valid(self):
         """
         check if inputs are valid
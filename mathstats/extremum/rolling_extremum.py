@@ -0,0 +1,228 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+import quantkit.mathstats.streaming_base.window_base as window_base
+
+
+class RollingExtremum(object):
+    """
+    Rolling Extremum Calculation
+    Base class for rolling maximum and minimum of each column of an np.array,
+    missing values are skipped
+    Calculation in Incremental way (van Herk / Gil-Werman block decomposition):
+
+        The stream is split into blocks of window_size observations, a window
+        spans the tail of the previous block and the head of the current block.
+
+            extremum = extremum(suffix extremum of previous block, prefix extremum of current block)
+
+        The prefix extremum is updated with each incoming row, suffix extrema
+        are calculated once per completed block, amortized O(1) per column.
+
+    Parameters
+    ----------
+    num_ind_variables : int
+        Number of variables
+    window_size: int
+        lookback window
+    """
+
+    # ufunc comparing two values, skipping missing values
+    comparison = None
+
+    def __init__(
+        self,
+        num_ind_variables: int,
+        window_size: int,
+        **kwargs,
+    ) -> None:
+        self.total_iterations = 0
+        self.window_size = window_size
+        self.num_ind_variables = num_ind_variables
+        self._extremum = np.full(num_ind_variables, np.nan)
+        self._prefix = np.full(num_ind_variables, np.nan)
+        # suffix extrema of previous block, last row empty for windows within one block
+        self._suffix = np.full((window_size + 1, num_ind_variables), np.nan)
+
+        self.data_stream = window_base.WindowBase(
+            window_shape=(window_size, 1, num_ind_variables),
+            window_size=window_size,
+        )
+
+    @property
+    def extremum(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            extremum of current window
+        """
+        return self._extremum.copy()
+
+    def calculate_state(self) -> None:
+        """
+        Calculate suffix extrema of ring buffer and prefix extremum of current block
+        Ring buffer positions coincide with positions in block, positions before
+        current location hold the current block, all others the previous block.
+        """
+        values = self.data_stream.matrix[:, 0, :]
+        self.comparison.accumulate(values[::-1], axis=0, out=self._suffix[:-1][::-1])
+        self.comparison.reduce(
+            values[: self.data_stream.current_loc],
+            axis=0,
+            initial=np.nan,
+            out=self._prefix,
+        )
+
+    def update(
+        self,
+        incoming_variables: Union[np.ndarray, pd.Series],
+        **kwargs,
+    ) -> None:
+        """
+        Update the current extremum with newly streamed in data
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming stream of data
+        """
+        incoming_variables = np.asarray(incoming_variables, dtype=float)
+        if incoming_variables.shape != (self.num_ind_variables,):
+            raise RuntimeError(
+                f"Incoming Variables shape {incoming_variables.shape} does not match number of variables {self.num_ind_variables}.."
+            )
+
+        self.total_iterations += 1
+        loc = self.data_stream.current_loc
+        self.data_stream.update(np.expand_dims(incoming_variables, axis=0), **kwargs)
+
+        self.comparison(self._prefix, incoming_variables, out=self._prefix)
+        self.comparison(self._suffix[loc + 1], self._prefix, out=self._extremum)
+
+        # block completed, suffix extrema are used by next window_size windows
+        if self.data_stream.current_loc == 0:
+            self.calculate_state()
+
+    def update_block(
+        self,
+        incoming_variables: np.ndarray,
+        indexes: list = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Update the current extremum with a block of newly streamed in data.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming block of data, one row per observation
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+
+        Returns
+        -------
+        np.array
+            extremum after each row of the block
+        """
+        incoming_variables = np.asarray(incoming_variables, dtype=float)
+        if incoming_variables.shape[1:] != (self.num_ind_variables,):
+            raise RuntimeError(
+                f"Incoming Variables shape {incoming_variables.shape[1:]} does not match number of variables {self.num_ind_variables}.."
+            )
+
+        n_obs = len(incoming_variables)
+        if n_obs == 0:
+            return np.empty((0, self.num_ind_variables))
+        self.total_iterations += n_obs
+
+        # current window and block in chronological order, split into blocks
+        values = np.concatenate([self.data_stream.values[:, 0, :], incoming_variables])
+        n_blocks = -(-len(values) // self.window_size)
+        blocks = np.full((n_blocks * self.window_size, self.num_ind_variables), np.nan)
+        blocks[: len(values)] = values
+        blocks = blocks.reshape(n_blocks, self.window_size, self.num_ind_variables)
+        prefix = self.comparison.accumulate(blocks, axis=1).reshape(
+            -1, self.num_ind_variables
+        )
+        suffix = self.comparison.accumulate(blocks[:, ::-1], axis=1)[:, ::-1]
+        suffix = suffix.reshape(-1, self.num_ind_variables)
+
+        # window ending at row i of values starts at row i - window_size + 1
+        extrema = self.comparison(
+            suffix[1 : n_obs + 1],
+            prefix[self.window_size : self.window_size + n_obs],
+        )
+
+        self.data_stream.update_block(
+            np.expand_dims(incoming_variables, axis=1), indexes=indexes
+        )
+        np.copyto(self._extremum, extrema[-1])
+        self.calculate_state()
+        return extrema
+
+    def is_valid(self):
+        """
+        check if inputs are valid
+
+        Returns
+        -------
+        bool
+            True if inputs are valid, false otherwise
+        """
+        return self.total_iterations >= self.window_size
+
+
+class RollingMax(RollingExtremum):
+    """
+    Rolling Maximum Calculation
+    Calculates rolling maximum of each column of an np.array,
+    same as np.nanmax of the window
+
+    Parameters
+    ----------
+    num_ind_variables : int
+        Number of variables
+    window_size: int
+        lookback window
+    """
+
+    comparison = np.fmax
+
+    @property
+    def maximum(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            maximum of current window
+        """
+        return self.extremum
+
+
+class RollingMin(RollingExtremum):
+    """
+    Rolling Minimum Calculation
+    Calculates rolling minimum of each column of an np.array,
+    same as np.nanmin of the window
+
+    Parameters
+    ----------
+    num_ind_variables : int
+        Number of variables
+    window_size: int
+        lookback window
+    """
+
+    comparison = np.fmin
+
+    @property
+    def minimum(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            minimum of current window
+        """
+        return self.extremum
@@ -26,17 +26,24 @@ class ExponentialWeightedMean(simple_mean.SimpleMean):
         self.weight_sum = 0
         self.adjust = adjust
 
-    @property
-    def mean(self) -> np.ndarray:
+    def calculate_mean(self, out: np.ndarray) -> np.ndarray:
         """
+        Write mean of current array into preallocated array
+
+        Parameters
+        ----------
+        out: np.array
+            preallocated array
+
         Returns
         -------
         np.array
-            mean of current array
+            out
         """
         if self.adjust:
-            return self._mean / np.max([self.weight_sum, 1])
-        return self._mean
+            return np.divide(self._mean, max(self.weight_sum, 1), out=out)
+        np.copyto(out, self._mean)
+        return out
 
     @property
     def gmean(self) -> np.ndarray:
@@ -51,130 +58,90 @@ class ExponentialWeightedMean(simple_mean.SimpleMean):
             np.where(self._gmean == 0, np.nan, np.exp(adjusted_gmean)) - self.geo_base
         )
 
-    def calculate_adjusted(
-        self,
-        prev_average: np.ndarray,
-        incoming_variables: np.ndarray,
-        batch_weight: int = 1,
-        **kwargs,
-    ) -> np.ndarray:
+    def update_moments(
+        self, incoming_variables: np.ndarray, batch_weight: int = 1, **kwargs
+    ) -> None:
         """
-        Calculate average on adjusted version.
-
-        Calculation
-        -----------
-        previous average * batch weight + incoming variables
+        Update mean, geometric mean and weight sum with newly streamed in data,
+        without storing the data in the data stream
 
         Parameters
         ----------
-        prev_average : np.array
-            Previous Average
         incoming_variables : np.array
-            Incoming variables
-        batch_weight : int, optional
-            batch weight
-
-        Returns
-        -------
-        np.array
-            Newly calculated average
+            Incoming stream of data
+        batch_weight : int, default 1
+            Weight for the incoming stream of data
         """
-        new_average = prev_average * batch_weight + incoming_variables
-        return new_average
-
-    def calculate_unadjusted(
-        self,
-        prev_average: np.ndarray,
-        incoming_variables: np.ndarray,
-        batch_weight: int = 1,
-        **kwargs,
-    ) -> np.ndarray:
+        geo_incoming = self.calculate_log(
+            incoming_variables, self._geo_incoming, self._missing
+        )
+
+        if self.adjust:
+            # previous average * batch weight + incoming variables
+            np.multiply(self._mean, batch_weight, out=self._mean)
+            np.add(self._mean, incoming_variables, out=self._mean)
+        elif self.total_iterations == 0:
+            np.copyto(self._mean, incoming_variables)
+        else:
+            # (1 - batch weight) * incoming variables + batch weight * previous average
+            np.multiply(incoming_variables, 1 - batch_weight, out=self._scratch)
+            np.multiply(self._mean, batch_weight, out=self._mean)
+            np.add(self._scratch, self._mean, out=self._mean)
+
+        # geometric mean stays missing after first missing value
+        np.isnan(geo_incoming, out=self._gmean_missing)
+        np.isnan(self._gmean, out=self._missing)
+        np.logical_or(self._gmean_missing, self._missing, out=self._gmean_missing)
+        np.multiply(self._gmean, batch_weight, out=self._gmean)
+        np.add(self._gmean, geo_incoming, out=self._gmean)
+        np.copyto(self._gmean, np.nan, where=self._gmean_missing)
+
+        self.previous_weight_sum = deepcopy(self.weight_sum)
+        self.weight_sum += batch_weight**self.total_iterations
+
+        self.total_iterations += 1
+        np.isnan(incoming_variables, out=self._valid)
+        np.logical_not(self._valid, out=self._valid)
+        np.add(self.iterations, 1, out=self.iterations, where=self._valid)
+
+    def merge(self, other, batch_weight: int = 1) -> None:
         """
-        Calculate average on unadjusted version
+        Merge mean of a later chunk of data into this mean, p.e. from parallel workers
+        Same result as calling update for each row of the later chunk (up to rounding)
+        Only available for adjusted version.
 
         Calculation
         -----------
-        previous average * batch weight + (1 - batch weight) * incoming variables
+        Weights of this mean decay over all observations of other:
 
-        Parameters
-        ----------
-        prev_average : np.array
-            Previous Average
-        incoming_variables : np.array
-            Incoming variables
-        batch_weight : int, optional
-            batch weight
-
-        Returns
-        -------
-        np.array
-            Newly calculated average
-        """
-        if self.total_iterations == 0:
-            new_average = incoming_variables
-            return new_average
-        new_average = (
-            1 - batch_weight
-        ) * incoming_variables + batch_weight * prev_average
-        return new_average
-
-    def update(
-        self, incoming_variables: np.ndarray, batch_weight: int = 1, **kwargs
-    ) -> None:
-        """
-        Update the current mean array with newly streamed in data.
+            weighted sum = weighted sum * decay^n + weighted sum of other
+            weight sum = weight sum * decay^n + weight sum of other
 
         Parameters
         ----------
-        incoming_variables : np.array
-            Incoming stream of data
-        batch_weight : int, default 1
-            Weight for the incoming stream of data
+        other: ExponentialWeightedMean
+            mean of later chunk of data with same number of variables
+        batch_weight : int, optional
+            decay factor used for the incoming stream of data
         """
-        if self._mean.shape != incoming_variables.shape:
+        if not self.adjust or not other.adjust:
+            raise RuntimeError("Merge is only available for adjusted version..")
+        if other._mean.shape != self._mean.shape:
             raise RuntimeError(
-                f"Incoming Variables shape {incoming_variables.shape} does not match Mean shape {self._mean.shape}"
+                f"Mean shape {other._mean.shape} does not match Mean shape {self._mean.shape}.."
             )
+        decay = batch_weight**other.total_iterations
 
-        geo_incoming = incoming_variables + self.geo_base
-        geo_incoming = np.log(np.where(geo_incoming <= 0, np.nan, geo_incoming))
-
-        if self.adjust:
-            self._mean = self.calculate_adjusted(
-                prev_average=self._mean,
-                incoming_variables=incoming_variables,
-                batch_weight=batch_weight,
-                **kwargs,
-            )
-
-        else:
-            self._mean = self.calculate_unadjusted(
-                prev_average=self._mean,
-                incoming_variables=incoming_variables,
-                batch_weight=batch_weight,
-                **kwargs,
-            )
-
-        new_geometric_mean = self.calculate_adjusted(
-            prev_average=self._gmean,
-            incoming_variables=geo_incoming,
-            batch_weight=batch_weight,
-            **kwargs,
-        )
+        self._mean = self._mean * decay + other._mean
         self._gmean = np.where(
-            np.logical_or(np.isnan(geo_incoming), np.isnan(self._gmean)),
+            np.logical_or(np.isnan(self._gmean), np.isnan(other._gmean)),
             np.nan,
-            new_geometric_mean,
+            self._gmean * decay + other._gmean,
         )
-
-        self.previous_weight_sum = deepcopy(self.weight_sum)
-        self.weight_sum += batch_weight**self.total_iterations
-
-        self.total_iterations += 1
-        self.iterations = self.iterations + np.where(np.isnan(incoming_variables), 0, 1)
-
-        self.data_stream.update(
-            new_vector=np.expand_dims(incoming_variables, axis=0),
-            batch_weight=batch_weight,
-            **kwargs,
+        self.weight_sum = self.weight_sum * decay + other.weight_sum
+        self.total_iterations += other.total_iterations
+        self.previous_weight_sum = self.weight_sum - batch_weight ** (
+            self.total_iterations - 1
         )
+        self.iterations = self.iterations + other.iterations
+        self.data_stream.merge(other.data_stream)
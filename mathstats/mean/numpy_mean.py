@@ -87,6 +87,29 @@ class NumpyWindowMean(object):
 
         self.data_stream.update(np.expand_dims(incoming_variables, axis=0), **kwargs)
 
+    def update_block(
+        self,
+        incoming_variables: np.ndarray,
+        indexes: list = None,
+        **kwargs,
+    ) -> None:
+        """
+        Update the current mean array with a block of newly streamed in data.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming block of data, one row per observation
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        self.total_iterations += len(incoming_variables)
+
+        self.data_stream.update_block(
+            np.expand_dims(incoming_variables, axis=1), indexes=indexes
+        )
+
     def is_valid(self):
         """
         check if inputs are valid
@@ -44,6 +44,7 @@ class RollingMean(simple_mean.SimpleMean):
             window_shape=(window_size, 1, num_ind_variables),
             window_size=window_size,
         )
+        self.init_buffers(num_ind_variables)
 
     @property
     def gmean(self) -> np.ndarray:
@@ -103,30 +104,121 @@ class RollingMean(simple_mean.SimpleMean):
 
         self.total_iterations += 1
 
-        self._mean = self.calculate_average(
+        self.calculate_average(
             prev_average=self._mean,
             incoming_variables=incoming_variables,
             outgoing_variables=outgoing_variables,
             num_variables=self.window_size,
+            out=self._mean,
         )
 
-        geo_incoming = incoming_variables + self.geo_base
-        geo_incoming = np.log(np.where(geo_incoming <= 0, np.nan, geo_incoming))
-
-        geo_outgoing = outgoing_variables + self.geo_base
-        geo_outgoing = np.log(np.where(geo_outgoing <= 0, np.nan, geo_outgoing))
-
-        self._gmean = self.calculate_average(
+        geo_incoming = self.calculate_log(
+            incoming_variables, self._geo_incoming, self._missing
+        )
+        geo_outgoing = self.calculate_log(
+            outgoing_variables, self._geo_outgoing, self._missing
+        )
+        self.calculate_average(
             prev_average=self._gmean,
             incoming_variables=geo_incoming,
             outgoing_variables=geo_outgoing,
             num_variables=self.window_size,
+            out=self._gmean,
         )
 
         self.data_stream.update(
             np.expand_dims(incoming_variables, axis=0), incoming_variables, **kwargs
         )
 
+    def update_block(
+        self,
+        incoming_variables: np.ndarray,
+        indexes: list = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Update the current mean array with a block of newly streamed in data.
+        Outgoing variables are taken from the rolling window.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming block of data, one row per observation
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+
+        Returns
+        -------
+        np.array
+            mean after each row of the block
+        """
+        if self._mean.shape != incoming_variables.shape[1:]:
+            raise RuntimeError(
+                f"Incoming Variables shape {incoming_variables.shape[1:]} does not match Mean shape {self._mean.shape}"
+            )
+
+        n_obs = len(incoming_variables)
+        self.total_iterations += n_obs
+
+        outgoing_variables = np.concatenate(
+            [self.data_stream.values[:, 0, :], incoming_variables]
+        )[:n_obs]
+
+        geo_incoming = incoming_variables + self.geo_base
+        geo_incoming = np.log(np.where(geo_incoming <= 0, np.nan, geo_incoming))
+        geo_outgoing = outgoing_variables + self.geo_base
+        geo_outgoing = np.log(np.where(geo_outgoing <= 0, np.nan, geo_outgoing))
+
+        means = self.calculate_average_block(
+            self._mean, incoming_variables, outgoing_variables
+        )
+        gmeans = self.calculate_average_block(self._gmean, geo_incoming, geo_outgoing)
+        if n_obs > 0:
+            np.copyto(self._mean, means[-1])
+            np.copyto(self._gmean, gmeans[-1])
+
+        self.data_stream.update_block(
+            np.expand_dims(incoming_variables, axis=1), indexes=indexes
+        )
+        return means
+
+    def calculate_average_block(
+        self,
+        prev_average: np.ndarray,
+        incoming_variables: np.ndarray,
+        outgoing_variables: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Calculate average after each row of a block as running sum of
+        the incremental changes, same rounding as calculate_average
+
+        Parameters
+        ----------
+        prev_average : np.array
+            Previous Average
+        incoming_variables : np.array
+            Incoming variables, one row per observation
+        outgoing_variables : np.array
+            Outgoing variables, one row per observation
+
+        Returns
+        -------
+        np.array
+            average after each row
+        """
+        changes = np.where(np.isnan(incoming_variables), 0, incoming_variables)
+        changes = changes + np.where(
+            np.isnan(outgoing_variables), 0, -outgoing_variables
+        )
+        summands = np.concatenate(
+            [
+                np.expand_dims(np.where(np.isnan(prev_average), 0, prev_average), 0),
+                changes / self.window_size,
+            ]
+        )
+        return np.cumsum(summands, axis=0)[1:]
+
     def is_valid(self):
         """
         check if inputs are valid
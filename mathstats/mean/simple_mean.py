@@ -1,6 +1,7 @@
 from typing import Union
 import numpy as np
 import quantkit.mathstats.streaming_base.weighted_base as weighted_base
+import quantkit.mathstats.streaming_base.kernels as kernels
 
 
 class SimpleMean(object):
@@ -14,24 +15,57 @@ class SimpleMean(object):
 
     see https://fanf2.user.srcf.net/hermes/doc/antiforgery/stats.pdf chapter 1
 
+    Mean and geometric mean are updated in place with preallocated scratch arrays,
+    an update doesn't allocate new arrays.
+
     Parameters
     ----------
     num_ind_variables : int
         Number of variables
     geo_base: int, optional
         geo base for geometric mean calculation
+    retention: str | int, optional
+        history of data stream, "full", "none" or number of last observations
+    dtype: type, optional
+        float dtype of incoming data and data stream, mean is accumulated in float64
     """
 
-    def __init__(self, num_ind_variables: int, geo_base: int = 0, **kwargs) -> None:
+    def __init__(
+        self,
+        num_ind_variables: int,
+        geo_base: int = 0,
+        retention: Union[str, int] = "full",
+        dtype: type = np.float64,
+        **kwargs,
+    ) -> None:
         self.geo_base = geo_base
+        self.dtype = dtype
         self._mean = np.zeros(shape=num_ind_variables)
         self._gmean = np.zeros(shape=num_ind_variables)
 
         self.data_stream = weighted_base.WeightedBase(
-            matrix_shape=(1, num_ind_variables)
+            matrix_shape=(1, num_ind_variables), retention=retention, dtype=dtype
         )
         self.iterations = np.zeros(shape=num_ind_variables)
         self.total_iterations = 0
+        self.init_buffers(num_ind_variables)
+
+    def init_buffers(self, num_ind_variables: int) -> None:
+        """
+        Preallocate scratch arrays for in place updates
+
+        Parameters
+        ----------
+        num_ind_variables : int
+            Number of variables
+        """
+        self._change = np.zeros(shape=num_ind_variables)
+        self._scratch = np.zeros(shape=num_ind_variables)
+        self._geo_incoming = np.zeros(shape=num_ind_variables)
+        self._geo_outgoing = np.zeros(shape=num_ind_variables)
+        self._missing = np.zeros(shape=num_ind_variables, dtype=bool)
+        self._valid = np.zeros(shape=num_ind_variables, dtype=bool)
+        self._gmean_missing = np.zeros(shape=num_ind_variables, dtype=bool)
 
     @property
     def mean(self) -> np.ndarray:
@@ -41,7 +75,24 @@ class SimpleMean(object):
         np.array
             mean of current array
         """
-        return self._mean
+        return self.calculate_mean(out=np.empty(self._mean.shape))
+
+    def calculate_mean(self, out: np.ndarray) -> np.ndarray:
+        """
+        Write mean of current array into preallocated array
+
+        Parameters
+        ----------
+        out: np.array
+            preallocated array
+
+        Returns
+        -------
+        np.array
+            out
+        """
+        np.copyto(out, self._mean)
+        return out
 
     @property
     def gmean(self) -> np.ndarray:
@@ -59,9 +110,10 @@ class SimpleMean(object):
         incoming_variables: np.ndarray,
         outgoing_variables: np.ndarray,
         num_variables: Union[np.ndarray, int],
+        out: np.ndarray = None,
     ) -> np.ndarray:
         """
-        Calculate average
+        Calculate average, missing values are skipped
 
         Calculation
         -----------
@@ -77,23 +129,58 @@ class SimpleMean(object):
             Outgoing variables
         num_variables : np.array | int
             number of variables
+        out: np.array, optional
+            preallocated array for new average, can be prev_average itself
 
         Returns
         -------
         np.array
             Newly calculated average
         """
+        if out is None:
+            out = np.empty(np.shape(prev_average))
 
-        new_average = np.nansum(
-            [
-                prev_average,
-                np.nansum([incoming_variables, -outgoing_variables], axis=0)
-                / num_variables,
-            ],
-            axis=0,
+        # (incoming - outgoing) / number of variables, missing values as zero
+        kernels.nan_to_zero(incoming_variables, self._change, self._missing)
+        np.negative(outgoing_variables, out=self._scratch)
+        kernels.add_nan_to_zero(
+            self._change, self._scratch, self._scratch, self._missing
         )
+        # variables without observations give missing values, not warnings
+        with np.errstate(invalid="ignore", divide="ignore"):
+            np.divide(self._change, num_variables, out=self._change)
+
+        kernels.nan_to_zero(prev_average, out, self._missing)
+        kernels.add_nan_to_zero(out, self._change, self._change, self._missing)
+        return out
+
+    def calculate_log(
+        self, variables: np.ndarray, out: np.ndarray, mask: np.ndarray
+    ) -> np.ndarray:
+        """
+        Logarithm of variables plus geo base, missing for non-positive values
 
-        return new_average
+        Parameters
+        ----------
+        variables : np.array
+            variables
+        out: np.array
+            preallocated array
+        mask: np.array
+            preallocated boolean array
+
+        Returns
+        -------
+        np.array
+            out
+        """
+        # same precision as variables, p.e. float32
+        dtype = np.result_type(variables, self.geo_base, 0.0)
+        np.add(variables, self.geo_base, out=out, dtype=dtype)
+        np.less_equal(out, 0, out=mask)
+        np.copyto(out, np.nan, where=mask)
+        np.log(out, out=out, dtype=dtype, casting="same_kind")
+        return out
 
     def update(
         self, incoming_variables: np.ndarray, batch_weight: int = 1, **kwargs
@@ -108,42 +195,143 @@ class SimpleMean(object):
         batch_weight : int, optional
             Weight for the incoming stream of data
         """
+        incoming_variables = np.asarray(incoming_variables, dtype=self.dtype)
         if self._mean.shape != incoming_variables.shape:
             raise RuntimeError(
                 f"Incoming Variables shape {incoming_variables.shape} does not match Mean shape {self._mean.shape}"
             )
 
+        self.update_moments(incoming_variables, batch_weight=batch_weight)
+
+        self.data_stream.update(
+            new_vector=np.expand_dims(incoming_variables, axis=0),
+            batch_weight=batch_weight,
+            **kwargs,
+        )
+
+    def update_moments(
+        self, incoming_variables: np.ndarray, batch_weight: int = 1, **kwargs
+    ) -> None:
+        """
+        Update mean and geometric mean with newly streamed in data,
+        without storing the data in the data stream
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming stream of data
+        batch_weight : int, optional
+            Weight for the incoming stream of data
+        """
         self.total_iterations += 1
-        self.iterations = self.iterations + np.where(np.isnan(incoming_variables), 0, 1)
+        np.isnan(incoming_variables, out=self._valid)
+        np.logical_not(self._valid, out=self._valid)
+        np.add(self.iterations, 1, out=self.iterations, where=self._valid)
 
-        self._mean = self.calculate_average(
+        self.calculate_average(
             prev_average=self._mean,
             incoming_variables=incoming_variables,
             outgoing_variables=self._mean,
             num_variables=self.iterations,
+            out=self._mean,
         )
 
-        geo_incoming = incoming_variables + self.geo_base
-        geo_incoming = np.log(np.where(geo_incoming <= 0, np.nan, geo_incoming))
-
-        new_geometric_mean = self.calculate_average(
+        geo_incoming = self.calculate_log(
+            incoming_variables, self._geo_incoming, self._missing
+        )
+        # geometric mean stays missing after first missing value
+        np.isnan(geo_incoming, out=self._gmean_missing)
+        np.isnan(self._gmean, out=self._missing)
+        np.logical_or(self._gmean_missing, self._missing, out=self._gmean_missing)
+        self.calculate_average(
             prev_average=self._gmean,
             incoming_variables=geo_incoming,
             outgoing_variables=self._gmean,
             num_variables=self.iterations,
+            out=self._gmean,
         )
+        np.copyto(self._gmean, np.nan, where=self._gmean_missing)
 
-        self._gmean = np.where(
-            np.logical_or(np.isnan(geo_incoming), np.isnan(self._gmean)),
-            np.nan,
-            new_geometric_mean,
-        )
+    def update_block(
+        self,
+        incoming_variables: np.ndarray,
+        batch_weight: int = 1,
+        indexes: list = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Update the current mean array with a block of newly streamed in data.
+        Same result as calling update for each row of the block.
 
-        self.data_stream.update(
-            new_vector=np.expand_dims(incoming_variables, axis=0),
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming block of data, one row per observation
+        batch_weight : int, optional
+            Weight for the incoming stream of data
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+
+        Returns
+        -------
+        np.array
+            mean after each row of the block
+        """
+        incoming_variables = np.asarray(incoming_variables, dtype=self.dtype)
+        if self._mean.shape != incoming_variables.shape[1:]:
+            raise RuntimeError(
+                f"Incoming Variables shape {incoming_variables.shape[1:]} does not match Mean shape {self._mean.shape}"
+            )
+
+        means = np.zeros(shape=incoming_variables.shape)
+        for i, incoming_row in enumerate(incoming_variables):
+            self.update_moments(incoming_row, batch_weight=batch_weight)
+            self.calculate_mean(out=means[i])
+
+        self.data_stream.update_block(
+            new_vectors=np.expand_dims(incoming_variables, axis=1),
             batch_weight=batch_weight,
-            **kwargs,
+            indexes=indexes,
+        )
+        return means
+
+    def merge(self, other, batch_weight: int = 1) -> None:
+        """
+        Merge mean of a later chunk of data into this mean, p.e. from parallel workers
+        Same result as calling update for each row of the later chunk (up to rounding),
+        if variables have no missing values after their first observation
+
+        Calculation
+        -----------
+        Pairwise update of Chan et al. per variable
+
+            mean = mean + (mean of other - mean) * count of other / (count + count of other)
+
+        see https://fanf2.user.srcf.net/hermes/doc/antiforgery/stats.pdf chapter 3
+
+        Parameters
+        ----------
+        other: SimpleMean
+            mean of later chunk of data with same number of variables
+        batch_weight : int, optional
+            Weight used for the incoming stream of data
+        """
+        if other._mean.shape != self._mean.shape:
+            raise RuntimeError(
+                f"Mean shape {other._mean.shape} does not match Mean shape {self._mean.shape}.."
+            )
+        iterations = self.iterations + other.iterations
+        share = other.iterations / np.where(iterations > 0, iterations, 1)
+
+        self._mean = self._mean + (other._mean - self._mean) * share
+        self._gmean = np.where(
+            np.logical_or(np.isnan(self._gmean), np.isnan(other._gmean)),
+            np.nan,
+            self._gmean + (other._gmean - self._gmean) * share,
         )
+        self.iterations = iterations
+        self.total_iterations += other.total_iterations
+        self.data_stream.merge(other.data_stream)
 
     def is_valid(self):
         """
@@ -3,40 +3,210 @@ import numpy as np
 from typing import Union
 
 
-class Quantiles(object):
+class Quantiles(sb.StreamingBase):
     """
-    Class for calculating quantiles and median of datapoints
+    Class for calculating quantiles and median of datapoints in constant memory
+
+    Datapoints are collected in a buffer. As long as all datapoints fit into the buffer,
+    quantiles are exact. Once the buffer is full, it is compressed into a merging
+    t-digest: datapoints are sorted, grouped into centroids (mean, weight) with the
+    arcsine scale function, so centroids are small in the tails and larger around
+    the median. Quantiles are interpolated between centroids and the exact min and max.
+
+    Each variable (column) has its own digest, all digests are updated together.
+    Memory is (compression / 2 + buffer size) x number of variables, independent of
+    the number of datapoints.
+
+    Error
+    -----
+    Rank error is bounded by the size of the centroids, at most about pi / compression
+    around the median and shrinking towards the tails. In practice it is much smaller,
+    p.e. below 0.001 for the default compression of 200 on 200,000 lognormal datapoints
+
+    see https://arxiv.org/abs/1902.04023
+
+    Parameters
+    ----------
+    num_ind_variables: int, optional
+        number of variables, one digest per variable
+    compression: int, optional
+        number of centroids is at most compression / 2 + 1
+    buffer_size: int, optional
+        number of datapoints collected before compression
     """
 
-    def __init__(self) -> None:
-        self.streaming_base = sb.StreamingBase()
+    def __init__(
+        self,
+        num_ind_variables: int = 1,
+        compression: int = 200,
+        buffer_size: int = 1000,
+    ) -> None:
+        super().__init__(num_ind_variables=num_ind_variables)
+        self.compression = compression
+        self.num_centroids = compression // 2 + 1
+        self.buffer = np.full((buffer_size, num_ind_variables), np.nan)
+        self.buffer_loc = 0
+        self.centroid_means = np.full((self.num_centroids, num_ind_variables), np.nan)
+        self.centroid_weights = np.zeros((self.num_centroids, num_ind_variables))
+        self.minimum = np.full(num_ind_variables, np.nan)
+        self.maximum = np.full(num_ind_variables, np.nan)
+        self.is_compressed = False
+
+    def add_value(self, value: Union[float, np.ndarray]) -> None:
+        """
+        add data point to digest
+
+        Parameters
+        ----------
+        value: float | np.array
+            new data point, one value per variable
+        """
+        self.add_values(np.reshape(value, (1, self.num_ind_variables)))
 
-    def add_value(self, value: float) -> None:
+    def add_values(self, values: np.ndarray) -> None:
         """
-        add data point to saved values
+        add block of data points to digest
 
         Parameters
         ----------
-        value: float
-            new data point
+        values: np.array
+            new data points, one row per data point and one column per variable
         """
-        self.streaming_base.add_value(value)
+        values = np.reshape(
+            np.asarray(values, dtype=float), (-1, self.num_ind_variables)
+        )
+        self.total_iterations += len(values)
+        self.minimum = np.fmin(self.minimum, np.nanmin(values, axis=0, initial=np.inf))
+        self.maximum = np.fmax(self.maximum, np.nanmax(values, axis=0, initial=-np.inf))
+        self.minimum[np.isinf(self.minimum)] = np.nan
+        self.maximum[np.isinf(self.maximum)] = np.nan
+
+        start = 0
+        while start < len(values):
+            n_write = min(len(values) - start, len(self.buffer) - self.buffer_loc)
+            self.buffer[self.buffer_loc : self.buffer_loc + n_write] = values[
+                start : start + n_write
+            ]
+            self.buffer_loc += n_write
+            start += n_write
+            if self.buffer_loc == len(self.buffer):
+                self.compress()
+
+    def compress(self) -> None:
+        """
+        Merge buffer into centroids
+        """
+        if self.buffer_loc == 0:
+            return
+        buffer = self.buffer[: self.buffer_loc]
+        self.merge_centroids(
+            means=np.concatenate([self.centroid_means, buffer]),
+            weights=np.concatenate(
+                [self.centroid_weights, np.where(np.isnan(buffer), 0.0, 1.0)]
+            ),
+        )
+        self.buffer_loc = 0
+
+    def merge_centroids(self, means: np.ndarray, weights: np.ndarray) -> None:
+        """
+        Group sorted centroids into new centroids of at most a unit of the scale function
+
+        Calculation
+        -----------
+        k(q) = compression / (2 pi) * arcsin(2q - 1)
+
+        Parameters
+        ----------
+        means: np.array
+            centroid means, one column per variable
+        weights: np.array
+            centroid weights, one column per variable, zero for missing values
+        """
+        means = np.where(weights > 0, means, np.inf)
+        order = np.argsort(means, axis=0, kind="stable")
+        means = np.take_along_axis(means, order, axis=0)
+        weights = np.take_along_axis(weights, order, axis=0)
+
+        total_weights = np.sum(weights, axis=0)
+        q_mid = (np.cumsum(weights, axis=0) - weights / 2) / np.maximum(
+            total_weights, 1
+        )
+        bins = np.floor(
+            self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+            + self.compression / 4
+        ).astype(int)
+        bins = np.clip(bins, 0, self.num_centroids - 1)
+
+        is_valid = weights > 0
+        columns = np.broadcast_to(np.arange(self.num_ind_variables), bins.shape)
+        new_weights = np.zeros((self.num_centroids, self.num_ind_variables))
+        new_sums = np.zeros((self.num_centroids, self.num_ind_variables))
+        np.add.at(new_weights, (bins[is_valid], columns[is_valid]), weights[is_valid])
+        np.add.at(
+            new_sums,
+            (bins[is_valid], columns[is_valid]),
+            means[is_valid] * weights[is_valid],
+        )
+
+        # move empty centroids to the end
+        order = np.argsort(new_weights == 0, axis=0, kind="stable")
+        self.centroid_weights = np.take_along_axis(new_weights, order, axis=0)
+        new_sums = np.take_along_axis(new_sums, order, axis=0)
+        self.centroid_means = np.where(
+            self.centroid_weights > 0,
+            new_sums / np.where(self.centroid_weights > 0, self.centroid_weights, 1),
+            np.nan,
+        )
+        self.is_compressed = True
+
+    def merge(self, other) -> None:
+        """
+        Merge digest of other datapoints into this digest, p.e. from parallel workers
+
+        Parameters
+        ----------
+        other: Quantiles
+            digest with same number of variables
+        """
+        if other.num_ind_variables != self.num_ind_variables:
+            raise RuntimeError(
+                f"Number of variables {other.num_ind_variables} does not match {self.num_ind_variables}.."
+            )
+        buffer = self.buffer[: self.buffer_loc]
+        other_buffer = other.buffer[: other.buffer_loc]
+        self.merge_centroids(
+            means=np.concatenate(
+                [self.centroid_means, buffer, other.centroid_means, other_buffer]
+            ),
+            weights=np.concatenate(
+                [
+                    self.centroid_weights,
+                    np.where(np.isnan(buffer), 0.0, 1.0),
+                    other.centroid_weights,
+                    np.where(np.isnan(other_buffer), 0.0, 1.0),
+                ]
+            ),
+        )
+        self.buffer_loc = 0
+        self.total_iterations += other.total_iterations
+        self.minimum = np.fmin(self.minimum, other.minimum)
+        self.maximum = np.fmax(self.maximum, other.maximum)
 
     @property
-    def median(self) -> float:
+    def median(self) -> Union[float, np.ndarray]:
         """
-        calculate median from saved values
+        calculate median from digest
 
         Returns
         -------
-        float
-            median
+        float | np.array
+            median, one value per variable
         """
-        return np.median(np.array(self.streaming_base.values))
+        return self.quantiles(0.5)
 
     def quantiles(self, q: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
-        calculate q-th quantile from saved values
+        calculate q-th quantile from digest
 
         Parameters
         ----------
@@ -46,7 +216,71 @@ class Quantiles(object):
         Returns
         -------
         float | np.array
-            If q is a single quantile, then the result is a scalar.
+            If q is a single quantile, then the result is a scalar (one value per variable).
             If multiple quantiles are given, first axis of the result corresponds to the quantiles.
         """
-        return np.quantile(self.streaming_base.values, q)
+        quantiles = np.reshape(q, (-1, 1))
+        if not self.is_compressed and self.buffer_loc == 0:
+            result = np.full((len(quantiles), self.num_ind_variables), np.nan)
+        elif not self.is_compressed:
+            result = np.nanquantile(
+                self.buffer[: self.buffer_loc], quantiles[:, 0], axis=0
+            )
+        else:
+            self.compress()
+            result = self.interpolate(quantiles)
+
+        if self.num_ind_variables == 1:
+            result = result[:, 0]
+        if np.ndim(q) == 0:
+            result = result[0]
+        return result
+
+    def interpolate(self, quantiles: np.ndarray) -> np.ndarray:
+        """
+        Interpolate quantiles between centroid centers, min and max
+
+        Parameters
+        ----------
+        quantiles: np.array
+            quantiles as column vector
+
+        Returns
+        -------
+        np.array
+            one row per quantile and one column per variable
+        """
+        weights = self.centroid_weights
+        num_valid = np.sum(weights > 0, axis=0)
+        total_weights = np.sum(weights, axis=0)
+        columns = np.arange(self.num_ind_variables)
+
+        # knots: min at rank 0, centroid means at their centers, max at total weight
+        ranks = np.full((self.num_centroids + 2, self.num_ind_variables), np.inf)
+        values = np.full((self.num_centroids + 2, self.num_ind_variables), np.nan)
+        ranks[0] = 0
+        values[0] = self.minimum
+        ranks[1:-1] = np.where(
+            weights > 0, np.cumsum(weights, axis=0) - weights / 2, np.inf
+        )
+        values[1:-1] = self.centroid_means
+        ranks[num_valid + 1, columns] = total_weights
+        values[num_valid + 1, columns] = self.maximum
+
+        targets = quantiles * total_weights
+        upper = np.sum(ranks[np.newaxis] <= targets[:, np.newaxis], axis=1)
+        upper = np.minimum(upper, num_valid + 1)
+        lower = np.maximum(upper - 1, 0)
+        lower_rank = ranks[lower, columns]
+        upper_rank = ranks[upper, columns]
+        lower_value = values[lower, columns]
+        upper_value = values[upper, columns]
+
+        distance = upper_rank - lower_rank
+        fraction = np.where(
+            distance > 0,
+            (targets - lower_rank) / np.where(distance > 0, distance, 1),
+            0,
+        )
+        result = lower_value + fraction * (upper_value - lower_value)
+        return np.where(total_weights > 0, result, np.nan)
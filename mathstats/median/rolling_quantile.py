@@ -0,0 +1,270 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+import quantkit.mathstats.streaming_base.window_base as window_base
+
+
+class RollingQuantile(object):
+    """
+    Rolling Quantile Calculation
+    Calculates rolling quantiles (p.e. median) of each column of an np.array
+    Calculation in Incremental way:
+
+        Each column keeps its window in sorted order, missing values at the end.
+        On update the outgoing value is removed and the incoming value is inserted
+        at positions found by binary search, O(N log w) comparisons for N columns.
+        The values between both positions are shifted by one row in place,
+        which costs O(w * N) per update in the worst case.
+        Quantiles are read from the sorted window with linear interpolation,
+        same as np.nanquantile of the window.
+
+    Parameters
+    ----------
+    num_ind_variables : int
+        Number of variables
+    window_size: int
+        lookback window
+    quantile: float, optional
+        default quantile, between 0 and 1
+    """
+
+    def __init__(
+        self,
+        num_ind_variables: int,
+        window_size: int,
+        quantile: float = 0.5,
+        **kwargs,
+    ) -> None:
+        self.quantile = quantile
+        self.total_iterations = 0
+        self.window_size = window_size
+        self.num_ind_variables = num_ind_variables
+        self._sorted = np.full((window_size, num_ind_variables), np.nan)
+        self._num_valid = np.zeros(num_ind_variables, dtype=int)
+        self._columns = np.arange(num_ind_variables)
+        self._rows = np.arange(window_size)[:, np.newaxis]
+        self._previous = np.empty((window_size, num_ind_variables))
+        self._is_shifted = np.empty((window_size, num_ind_variables), dtype=bool)
+        self._is_between = np.empty((window_size, num_ind_variables), dtype=bool)
+
+        self.data_stream = window_base.WindowBase(
+            window_shape=(window_size, 1, num_ind_variables),
+            window_size=window_size,
+        )
+
+    @property
+    def median(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            median of current window
+        """
+        return self.get_quantiles(0.5)
+
+    @property
+    def quantiles(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            default quantile of current window
+        """
+        return self.get_quantiles(self.quantile)
+
+    @property
+    def sorted_window(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            window sorted per column, missing values at the end
+        """
+        return self._sorted
+
+    @property
+    def windowed_outgoing_row(self) -> np.ndarray:
+        """
+        Return the outgoing row (FIFO - first in first out)
+        of the rolling window
+
+        Returns
+        -------
+        np.array
+            outgoing row
+        """
+        return self.data_stream.matrix[self.data_stream.current_loc, :, :]
+
+    def search(self, sorted_window: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        Binary search per column for first position not smaller than value,
+        missing values are treated as larger than all numbers
+
+        Parameters
+        ----------
+        sorted_window: np.array
+            window sorted per column
+        values: np.array
+            one value per column
+
+        Returns
+        -------
+        np.array
+            position per column
+        """
+        lower = np.zeros(self.num_ind_variables, dtype=int)
+        upper = np.full(self.num_ind_variables, len(sorted_window))
+        for _ in range(len(sorted_window).bit_length()):
+            is_active = lower < upper
+            middle = np.minimum((lower + upper) // 2, len(sorted_window) - 1)
+            is_smaller = sorted_window[middle, self._columns] < values
+            lower = np.where(is_active & is_smaller, middle + 1, lower)
+            upper = np.where(is_active & ~is_smaller, middle, upper)
+        return lower
+
+    def update(
+        self,
+        incoming_variables: Union[np.ndarray, pd.Series],
+        outgoing_variables: np.ndarray,
+        **kwargs,
+    ) -> None:
+        """
+        Update the sorted windows with newly streamed in data
+        Only rows between outgoing and incoming position are shifted, in place
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming stream of data
+        outgoing_variables : np.array
+            Outgoing stream of data
+        """
+        incoming_variables = np.asarray(incoming_variables, dtype=float)
+        outgoing_variables = np.asarray(outgoing_variables, dtype=float)
+        if incoming_variables.shape != (self.num_ind_variables,):
+            raise RuntimeError(
+                f"Incoming Variables shape {incoming_variables.shape} does not match number of variables {self.num_ind_variables}.."
+            )
+
+        self.total_iterations += 1
+
+        # outgoing value, missing outgoing values are the first missing value
+        outgoing_nan = np.isnan(outgoing_variables)
+        outgoing_loc = np.where(
+            outgoing_nan,
+            self._num_valid,
+            self.search(self._sorted, outgoing_variables),
+        )
+        outgoing_loc = np.minimum(outgoing_loc, self.window_size - 1)
+        self._num_valid -= ~outgoing_nan
+
+        # incoming position after removing outgoing value, missing values at the end
+        incoming_nan = np.isnan(incoming_variables)
+        incoming_loc = self.search(self._sorted, incoming_variables)
+        incoming_loc -= outgoing_loc < incoming_loc
+        incoming_loc[incoming_nan] = self.window_size - 1
+        self._num_valid += ~incoming_nan
+
+        # shift rows between both positions by one, only in rows touched by any column
+        start = min(outgoing_loc.min(), incoming_loc.min())
+        end = max(outgoing_loc.max(), incoming_loc.max()) + 1
+        window = self._sorted[start:end]
+        previous = self._previous[: end - start]
+        is_shifted = self._is_shifted[: end - start]
+        is_between = self._is_between[: end - start]
+        rows = self._rows[start:end]
+        np.copyto(previous, window)
+
+        # outgoing before incoming position: rows move up
+        np.greater_equal(rows, outgoing_loc, out=is_shifted)
+        np.less(rows, incoming_loc, out=is_between)
+        is_shifted &= is_between
+        np.copyto(window[:-1], previous[1:], where=is_shifted[:-1])
+
+        # incoming before outgoing position: rows move down
+        np.greater(rows, incoming_loc, out=is_shifted)
+        np.less_equal(rows, outgoing_loc, out=is_between)
+        is_shifted &= is_between
+        np.copyto(window[1:], previous[:-1], where=is_shifted[1:])
+
+        window[incoming_loc - start, self._columns] = incoming_variables
+
+        self.data_stream.update(np.expand_dims(incoming_variables, axis=0), **kwargs)
+
+    def update_block(
+        self,
+        incoming_variables: np.ndarray,
+        indexes: list = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Update the sorted windows with a block of newly streamed in data.
+        Outgoing variables are taken from the rolling window.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming block of data, one row per observation
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+
+        Returns
+        -------
+        np.array
+            default quantile after each row of the block
+        """
+        results = np.full((len(incoming_variables), self.num_ind_variables), np.nan)
+        for i in range(len(incoming_variables)):
+            self.update(
+                incoming_variables[i],
+                np.squeeze(self.windowed_outgoing_row, axis=0),
+                index=None if indexes is None else indexes[i],
+            )
+            results[i] = self.quantiles
+        return results
+
+    def get_quantiles(self, q: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        calculate q-th quantile of each column in current window
+
+        Parameters
+        ----------
+        q: float | np.array
+           Quantile or sequence of quantiles to compute, which must be between 0 and 1 inclusive
+
+        Returns
+        -------
+        np.array
+            If q is a single quantile, then the result has one value per variable.
+            If multiple quantiles are given, first axis of the result corresponds to the quantiles.
+        """
+        quantiles = np.reshape(q, (-1, 1))
+        position = quantiles * (self._num_valid - 1)
+        lower = np.clip(np.floor(position).astype(int), 0, self.window_size - 1)
+        upper = np.clip(np.ceil(position).astype(int), 0, self.window_size - 1)
+        fraction = position - np.floor(position)
+        lower_value = self._sorted[lower, self._columns]
+        upper_value = self._sorted[upper, self._columns]
+
+        # same interpolation as numpy
+        result = np.where(
+            fraction >= 0.5,
+            upper_value - (upper_value - lower_value) * (1 - fraction),
+            lower_value + (upper_value - lower_value) * fraction,
+        )
+        result = np.where(self._num_valid > 0, result, np.nan)
+        if np.ndim(q) == 0:
+            result = result[0]
+        return result
+
+    def is_valid(self):
+        """
+        check if inputs are valid
+
+        Returns
+        -------
+        bool
+            True if inputs are valid, false otherwise
+        """
+        return self.total_iterations >= self.window_size
@@ -85,6 +85,69 @@ class RollingCumProd(simple_cumprod.SimpleCumProd):
             np.expand_dims(incoming_variables, axis=0), incoming_variables, **kwargs
         )
 
+    def update_block(
+        self,
+        incoming_variables: np.ndarray,
+        indexes: list = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Update the current cumprod array with a block of newly streamed in data.
+        Outgoing variables are taken from the rolling window.
+        Same result as calling update for each row of the block.
+
+        Multiplication and division alternate, so the recurrence runs row by row
+        with vectorized operations across variables to keep the same rounding.
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming block of data, one row per observation
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+
+        Returns
+        -------
+        np.array
+            cumulative product after each row of the block
+        """
+        if self._cumprod.shape != incoming_variables.shape[1:]:
+            raise RuntimeError(
+                f"Incoming Variables shape {incoming_variables.shape[1:]} does not match Cumprod shape {self._cumprod.shape}"
+            )
+
+        n_obs = len(incoming_variables)
+        self.total_iterations += n_obs
+
+        outgoing_variables = np.concatenate(
+            [self.data_stream.values[:, 0, :], incoming_variables]
+        )[:n_obs]
+        outgoing_variables = np.where(
+            np.isnan(outgoing_variables), 1, outgoing_variables
+        )
+        incoming_nan = np.isnan(incoming_variables)
+        incoming_factors = np.where(incoming_nan, 1, incoming_variables)
+
+        cumprods = np.zeros(shape=incoming_variables.shape)
+        cumprod = self._cumprod
+        for i in range(n_obs):
+            cumprod_nan = np.isnan(cumprod)
+            cumprod = (
+                np.where(
+                    np.logical_and(cumprod_nan, incoming_nan[i]),
+                    np.nan,
+                    np.where(cumprod_nan, 1, cumprod) * incoming_factors[i],
+                )
+                / outgoing_variables[i]
+            )
+            cumprods[i] = cumprod
+        self._cumprod = cumprod
+
+        self.data_stream.update_block(
+            np.expand_dims(incoming_variables, axis=1), indexes=indexes
+        )
+        return cumprods
+
     def is_valid(self):
         """
         check if inputs are valid
@@ -1,4 +1,5 @@
 import numpy as np
+from typing import Union
 import quantkit.mathstats.streaming_base.weighted_base as weighted_base
 import quantkit.utils.dataframe_utils as dataframe_utils
 
@@ -15,12 +16,19 @@ class SimpleCumProd(object):
     ----------
     num_ind_variables : int
         Number of variables
+    retention: str | int, optional
+        history of data stream, "full", "none" or number of last observations
     """
 
-    def __init__(self, num_ind_variables: int, **kwargs) -> None:
+    def __init__(
+        self,
+        num_ind_variables: int,
+        retention: Union[str, int] = "full",
+        **kwargs,
+    ) -> None:
         self._cumprod = np.ones(shape=num_ind_variables) * np.nan
         self.data_stream = weighted_base.WeightedBase(
-            matrix_shape=(1, num_ind_variables)
+            matrix_shape=(1, num_ind_variables), retention=retention
         )
         self.iterations = np.zeros(shape=num_ind_variables)
         self.total_iterations = 0
@@ -103,6 +111,57 @@ class SimpleCumProd(object):
             **kwargs,
         )
 
+    def update_block(
+        self, incoming_variables: np.ndarray, indexes: list = None, **kwargs
+    ) -> np.ndarray:
+        """
+        Update the current cumprod array with a block of newly streamed in data.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming block of data, one row per observation
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+
+        Returns
+        -------
+        np.array
+            cumulative product after each row of the block
+        """
+        if self._cumprod.shape != incoming_variables.shape[1:]:
+            raise RuntimeError(
+                f"Incoming Variables shape {incoming_variables.shape[1:]} does not match Cumprod shape {self._cumprod.shape}"
+            )
+
+        n_obs = len(incoming_variables)
+        self.total_iterations += n_obs
+        self.iterations = self.iterations + np.sum(
+            ~np.isnan(incoming_variables), axis=0
+        )
+
+        factors = np.concatenate(
+            [np.expand_dims(self._cumprod, axis=0), incoming_variables]
+        )
+        # product stays nan until the first valid factor
+        has_value = np.cumsum(~np.isnan(factors), axis=0) > 0
+        cumprods = np.where(
+            has_value,
+            np.cumprod(np.where(np.isnan(factors), 1, factors), axis=0),
+            np.nan,
+        )[1:]
+
+        if n_obs > 0:
+            self._cumprod = cumprods[-1]
+
+        self.data_stream.update_block(
+            new_vectors=np.expand_dims(incoming_variables, axis=1),
+            batch_weight=1,
+            indexes=indexes,
+        )
+        return cumprods
+
     def is_valid(self):
         """
         check if inputs are valid
@@ -1,7 +1,5 @@
 import quantkit.mathstats.streaming_base.streaming_base as streaming_base
 import quantkit.mathstats.streaming_base.window_base as window_base
-import quantkit.mathstats.covariance.window_covariance as window_covariance
-import quantkit.mathstats.matrix.correlation as correlation
 import numpy as np
 
 
@@ -21,6 +19,21 @@ class OrdinaryLR(streaming_base.StreamingBase):
     beta = (X'X)^{-1}X'Y
     (see https://stats.stackexchange.com/questions/6920/efficient-online-linear-regression/56642#56642)
 
+    The inverse (X'X)^{-1} is kept up to date with Sherman-Morrison rank-one updates
+    (recursive least squares) as rows enter and leave the window, O(K^2) per update:
+
+    (A + w x x')^{-1} = A^{-1} - w A^{-1} x x' A^{-1} / (1 + w x' A^{-1} x)
+
+    It is refactorized with np.linalg.pinv on first use and whenever an update
+    would make the matrix ill-conditioned.
+
+    All dependent variables (p.e. thousands of asset returns regressed on a few factors)
+    share X'X and its inverse, only X'Y and Y'Y are kept per dependent variable.
+    The window stores the rows of X and Y, products of outgoing rows are recalculated
+    on removal, so memory is O(window_size * (N + K) + N * K) for N dependent
+    and K independent variables. Betas, intercepts and R squared of all dependent
+    variables are calculated with batched matrix operations.
+
     Parameters
     ----------
     num_ind_variables : int
@@ -29,6 +42,9 @@ class OrdinaryLR(streaming_base.StreamingBase):
         Total number of dependent variables to be used in regression
     window_size : int, optional
         window size of the rolling regression
+    tolerance: float, optional
+        refactorize inverse if a rank-one update denominator falls below tolerance
+        or the condition number of X'X exceeds 1 / tolerance
     """
 
     def __init__(
@@ -36,41 +52,63 @@ class OrdinaryLR(streaming_base.StreamingBase):
         num_ind_variables: int,
         num_dep_variables: int,
         window_size: int = 1,
+        tolerance: float = 1e-10,
     ) -> None:
         super().__init__(num_ind_variables=num_ind_variables)
         self.number_of_dep_variables = num_dep_variables
         self.window_size = window_size
+        self.tolerance = tolerance
+        self._wxx_inv = None
 
-        self.wxx = window_base.WindowStream(
-            window_shape=(
-                window_size,
-                num_ind_variables + 1,
-                num_ind_variables + 1,
-            ),
-            curr_shape=(num_ind_variables + 1, num_ind_variables + 1),
-            window_size=window_size,
-        )
+        # running sums over window, X'X shared by all dependent variables
+        self.sum_xx = np.zeros((num_ind_variables + 1, num_ind_variables + 1))
+        self.sum_xy = np.zeros((num_ind_variables + 1, num_dep_variables))
+        self.sum_yy = np.zeros(num_dep_variables)
+        self._num_valid = np.zeros(num_dep_variables, dtype=int)
 
-        self.wxy = window_base.WindowStream(
-            curr_shape=(num_ind_variables + 1, num_dep_variables),
-            window_shape=(
-                window_size,
-                num_ind_variables + 1,
-                num_dep_variables,
-            ),
+        # rows and weights of window to remove outgoing products
+        self._rows = window_base.WindowBase(
+            window_shape=(window_size, 1, num_ind_variables + 1),
             window_size=window_size,
         )
-
-        self._mask = window_base.WindowBase(
+        self._dep_rows = window_base.WindowBase(
             window_shape=(window_size, 1, num_dep_variables),
             window_size=window_size,
         )
-
-        self.cov_calculator = window_covariance.WindowCovariance(
-            num_ind_variables=num_ind_variables + num_dep_variables,
+        self._weights = window_base.WindowBase(
+            window_shape=(window_size, 1, 1),
             window_size=window_size,
         )
 
+    @property
+    def regularization(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            matrix added to X'X before inversion, zero for OLS
+        """
+        return np.zeros((self.num_ind_variables + 1, self.num_ind_variables + 1))
+
+    @property
+    def wxx_inv(self) -> np.ndarray:
+        """
+        Inverse of X'X (plus regularization), refactorized if not kept up to date
+
+        Returns
+        -------
+        np.array
+            inverse matrix
+        """
+        if self._wxx_inv is not None:
+            return self._wxx_inv
+
+        _S_wxx = self.sum_xx + self.regularization
+        _S_wxx_inv = np.linalg.pinv(_S_wxx)
+        if np.linalg.cond(_S_wxx) < 1 / self.tolerance:
+            self._wxx_inv = _S_wxx_inv
+        return _S_wxx_inv
+
     @property
     def results(self) -> dict:
         r"""
@@ -78,11 +116,9 @@ class OrdinaryLR(streaming_base.StreamingBase):
 
         Note
         ----
-        R squared can be calculated by
+        R squared is calculated from the windowed sums of squares
 
-        r'_{y,x} * r_{x,x} * r_{y,x}
-
-        See https://stats.stackexchange.com/questions/314926/can-you-calculate-r2-from-correlation-coefficents-in-multiple-linear-regressi/364630#364630
+        1 - (Y'Y - 2 m'X'Y + m'X'X m) / (Y'Y - n * mean(Y)^2)
 
         Returns
         -------
@@ -95,18 +131,22 @@ class OrdinaryLR(streaming_base.StreamingBase):
             return self._results
 
         _mask_current = np.where(
-            np.sum(self._mask.matrix, axis=0) == self.window_size, 1, np.nan
+            self._num_valid[np.newaxis, :] == self.window_size, 1, np.nan
         )
 
         m = self.calculate_vector(_mask_current)
 
-        _corr = correlation.cov_to_corr(self.cov_calculator.results["cov"])
-        _ryx = _corr[: self.num_ind_variables, self.num_ind_variables :]
-        _rxx = np.linalg.pinv(_corr[: self.num_ind_variables, : self.num_ind_variables])
+        # R squared from sums of squares: SSE = Y'Y - 2 m'X'Y + m'X'X m
+        _sse = (
+            self.sum_yy
+            - 2 * np.sum(m * self.sum_xy, axis=0)
+            + np.sum(m * (self.sum_xx @ np.nan_to_num(m)), axis=0)
+        )
+        _sst = self.sum_yy - self.sum_xy[0] ** 2 / self.sum_xx[0, 0]
 
         self._results["beta"] = m[1:]
         self._results["sigma"] = m[0]
-        self._results["r_squared"] = np.diag(_ryx.T @ _rxx @ _ryx) * _mask_current
+        self._results["r_squared"] = (1 - _sse / _sst) * _mask_current
         return self._results
 
     def calculate_vector(self, mask_current: np.ndarray) -> np.ndarray:
@@ -124,14 +164,105 @@ class OrdinaryLR(streaming_base.StreamingBase):
             vector
         """
 
-        if self.wxx.matrix.shape[0] == 1:
-            _S_wxx_inv = 1 / self.wxx.curr_vector
-            m = (_S_wxx_inv * self.wxy.curr_vector) * mask_current
+        if self.window_size == 1:
+            _S_wxx_inv = 1 / self.sum_xx
+            m = (_S_wxx_inv * self.sum_xy) * mask_current
         else:
-            _S_wxx_inv = np.linalg.pinv(self.wxx.curr_vector)
-            m = (_S_wxx_inv @ self.wxy.curr_vector) * mask_current
+            m = (self.wxx_inv @ self.sum_xy) * mask_current
         return m
 
+    def update_inverse(
+        self,
+        incoming_row: np.ndarray,
+        incoming_weight: float,
+        outgoing_row: np.ndarray,
+        outgoing_weight: float,
+    ) -> None:
+        """
+        Sherman-Morrison update of inverse: add incoming row, remove outgoing row.
+        Inverse is dropped and refactorized on next use if an update is ill-conditioned.
+
+        Parameters
+        ----------
+        incoming_row: np.array
+            incoming independent variables with intercept
+        incoming_weight: float
+            weight of incoming row
+        outgoing_row: np.array
+            outgoing independent variables with intercept, nan if window is not full
+        outgoing_weight: float
+            weight of outgoing row, nan if window is not full
+        """
+        if self._wxx_inv is None:
+            return
+
+        _S_wxx_inv = self._wxx_inv
+        for row, weight in [
+            (incoming_row, incoming_weight),
+            (outgoing_row, -outgoing_weight),
+        ]:
+            if np.isnan(weight):
+                continue
+            _px = _S_wxx_inv @ row
+            _denominator = 1 + weight * (row @ _px)
+            if _denominator < self.tolerance:
+                self._wxx_inv = None
+                return
+            _S_wxx_inv -= weight / _denominator * np.outer(_px, _px)
+
+    def window_sum(
+        self, current_sum: np.ndarray, incoming: np.ndarray, outgoing: np.ndarray
+    ) -> np.ndarray:
+        """
+        Running sum over window, missing values are skipped
+
+        Parameters
+        ----------
+        current_sum: np.array
+            current sum
+        incoming: np.array
+            incoming products, one per observation
+        outgoing: np.array
+            outgoing products, one per observation
+
+        Returns
+        -------
+        np.array
+            sum after adding incoming and removing outgoing products
+        """
+        # interleave incoming and outgoing products, so that a block is summed
+        # in the same order as row by row updates
+        summands = np.empty((2 * len(incoming) + 1,) + current_sum.shape)
+        summands[0] = current_sum
+        summands[1::2] = incoming
+        summands[2::2] = outgoing
+        summands[2::2] *= -1
+        summands[np.isnan(summands)] = 0
+        return np.sum(summands, axis=0)
+
+    def outgoing_rows(
+        self, window: window_base.WindowBase, incoming_rows: np.ndarray
+    ) -> np.ndarray:
+        """
+        Rows leaving the window when a block of rows is added
+
+        Parameters
+        ----------
+        window: WindowBase
+            window of rows
+        incoming_rows: np.array
+            incoming rows, one per observation
+
+        Returns
+        -------
+        np.array
+            outgoing rows, one per observation
+        """
+        n_obs = len(incoming_rows)
+        if n_obs <= self.window_size:
+            return window.values[:n_obs, 0]
+        return np.concatenate([window.values[:, 0], incoming_rows])[:n_obs]
+
     def update(
         self,
         batch_ind: np.ndarray,
@@ -139,7 +270,7 @@ class OrdinaryLR(streaming_base.StreamingBase):
         batch_weight: float = 1,
     ) -> None:
         """
-        Update cov caclulator and rolling regression with new dependent and independent variable data
+        Update rolling regression with new dependent and independent variable data
 
         Parameters
         ----------
@@ -150,18 +281,80 @@ class OrdinaryLR(streaming_base.StreamingBase):
         batch_weight : float, default 1
             The weight for this batch
         """
-        batch_dep = batch_dep[np.newaxis, :]
-        batch_ind = batch_ind[np.newaxis, :]
-        _all_batch = np.append(batch_ind, batch_dep, 1).squeeze()
-        self.cov_calculator.update(_all_batch)
+        self.update_block(
+            batch_ind=batch_ind[np.newaxis, :],
+            batch_dep=batch_dep[np.newaxis, :],
+            batch_weight=batch_weight,
+        )
 
-        self.total_iterations += 1
+    def update_block(
+        self,
+        batch_ind: np.ndarray,
+        batch_dep: np.ndarray,
+        batch_weight: float = 1,
+        indexes: list = None,
+    ) -> None:
+        """
+        Update rolling regression with a block of new dependent
+        and independent variable data.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        batch_ind : (T, number_ind_variables) numpy array
+            The independent variables, one row per observation
+        batch_dep : (T, number_of_dep_variables) numpy array
+            All of the dependant variables we want to regress on, one row per observation
+        batch_weight : float, default 1
+            The weight for this batch
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        n_obs = len(batch_ind)
+        if n_obs == 0:
+            return
+        self.total_iterations += n_obs
         batch_ind = np.insert(batch_ind, 0, 1, axis=1)
+        batch_weights = np.full(n_obs, batch_weight, dtype=float)
+
+        # outgoing rows, missing while window is not full
+        rows_out = self.outgoing_rows(self._rows, batch_ind)
+        dep_rows_out = self.outgoing_rows(self._dep_rows, batch_dep)
+        weights_out = self.outgoing_rows(self._weights, batch_weights[:, np.newaxis])
+        weights_out = weights_out[:, 0]
 
-        _s_wxy_new = batch_dep * batch_ind.T * batch_weight
-        _S_wxx_new = batch_ind.T @ batch_ind * batch_weight
-        _mask_new = np.where(np.isnan(batch_dep), 0, 1)
+        if self._wxx_inv is not None:
+            for i in range(n_obs):
+                self.update_inverse(
+                    np.nan_to_num(batch_ind[i]),
+                    batch_weight,
+                    np.nan_to_num(rows_out[i]),
+                    weights_out[i],
+                )
 
-        self.wxy.update(new_vector=_s_wxy_new)
-        self.wxx.update(new_vector=_S_wxx_new)
-        self._mask.update(new_vector=_mask_new)
+        self.sum_xx = self.window_sum(
+            self.sum_xx,
+            np.einsum("ti,tj->tij", batch_ind, batch_ind) * batch_weight,
+            np.einsum("ti,tj->tij", rows_out, rows_out)
+            * weights_out[:, np.newaxis, np.newaxis],
+        )
+        self.sum_xy = self.window_sum(
+            self.sum_xy,
+            np.einsum("tk,td->tkd", batch_ind, batch_dep) * batch_weight,
+            np.einsum("tk,td->tkd", rows_out, dep_rows_out)
+            * weights_out[:, np.newaxis, np.newaxis],
+        )
+        self.sum_yy = self.window_sum(
+            self.sum_yy,
+            batch_dep**2 * batch_weight,
+            dep_rows_out**2 * weights_out[:, np.newaxis],
+        )
+        self._num_valid += np.sum(~np.isnan(batch_dep), axis=0) - np.sum(
+            ~np.isnan(dep_rows_out), axis=0
+        )
+
+        self._rows.update_block(
+            new_vectors=np.expand_dims(batch_ind, axis=1), indexes=indexes
+        )
+        self._dep_rows.update_block(new_vectors=np.expand_dims(batch_dep, axis=1))
+        self._weights.update_block(new_vectors=batch_weights[:, np.newaxis, np.newaxis])
@@ -18,6 +18,8 @@ class RidgeLR(ols_regression.OrdinaryLR):
     beta = (X'X + alpha I)^{-1}X'Y
     (see https://stats.stackexchange.com/a/602415)
 
+    The inverse is kept up to date with rank-one updates as in OrdinaryLR
+
     Parameters
     ----------
     num_ind_variables : int
@@ -28,6 +30,9 @@ class RidgeLR(ols_regression.OrdinaryLR):
         window size of the rolling regression
     alpha: float, optional
         ridge paramater
+    tolerance: float, optional
+        refactorize inverse if a rank-one update denominator falls below tolerance
+        or the condition number of X'X + alpha I exceeds 1 / tolerance
     """
 
     def __init__(
@@ -36,10 +41,23 @@ class RidgeLR(ols_regression.OrdinaryLR):
         num_dep_variables: int,
         window_size: int = 1,
         alpha: float = 1,
+        tolerance: float = 1e-10,
     ) -> None:
-        super().__init__(num_ind_variables, num_dep_variables, window_size)
+        super().__init__(num_ind_variables, num_dep_variables, window_size, tolerance)
         self.alpha = alpha
 
+    @property
+    def regularization(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            alpha I added to X'X before inversion, intercept not regularized
+        """
+        _Identity = self.alpha * np.identity(self.num_ind_variables + 1)
+        _Identity[0, 0] = 0
+        return _Identity
+
     def calculate_vector(self, mask_current: np.ndarray) -> np.ndarray:
         """
         Calculate regression specific vector
@@ -54,12 +72,9 @@ class RidgeLR(ols_regression.OrdinaryLR):
         np.array
             vector
         """
-        if self.wxx.matrix.shape[0] == 1:
-            _S_wxx_inv = 1 / self.wxx.curr_vector + self.alpha
-            m = (_S_wxx_inv * self.wxy.curr_vector) * mask_current
+        if self.window_size == 1:
+            _S_wxx_inv = 1 / self.sum_xx + self.alpha
+            m = (_S_wxx_inv * self.sum_xy) * mask_current
         else:
-            _Identity = self.alpha * np.identity(self.num_ind_variables + 1)
-            _Identity[0, 0] = 0
-            _S_wxx_inv = np.linalg.pinv(self.wxx.curr_vector + _Identity)
-            m = (_S_wxx_inv @ self.wxy.curr_vector) * mask_current
+            m = (self.wxx_inv @ self.sum_xy) * mask_current
         return m
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+def nan_to_zero(values: np.ndarray, out: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Copy values into preallocated array, missing values replaced by zero
+
+    Parameters
+    ----------
+    values: np.array
+        input values
+    out: np.array
+        preallocated output, can be values itself
+    mask: np.array
+        preallocated boolean array of same shape
+
+    Returns
+    -------
+    np.array
+        out
+    """
+    np.isnan(values, out=mask)
+    if out is not values:
+        np.copyto(out, values)
+    np.copyto(out, 0, where=mask)
+    return out
+
+
+def add_nan_to_zero(
+    out: np.ndarray, values: np.ndarray, scratch: np.ndarray, mask: np.ndarray
+) -> np.ndarray:
+    """
+    Add values to preallocated array in place, missing values are added as zero
+    Same rounding as np.nansum of out and values if out has no missing values
+
+    Parameters
+    ----------
+    out: np.array
+        preallocated array, updated in place
+    values: np.array
+        values to add
+    scratch: np.array
+        preallocated float array of same shape
+    mask: np.array
+        preallocated boolean array of same shape
+
+    Returns
+    -------
+    np.array
+        out
+    """
+    nan_to_zero(values, scratch, mask)
+    np.add(out, scratch, out=out)
+    return out
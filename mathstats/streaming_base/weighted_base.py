@@ -1,23 +1,71 @@
 import numpy as np
 from collections import deque
-from typing import Tuple
+from typing import Tuple, Union
+import quantkit.mathstats.streaming_base.kernels as kernels
 
 
 class WeightedBase(object):
     """
     Base class for working with weighted streams
 
+    Streamed vectors are stored in a preallocated array and handed out as views.
+    The history kept is set by retention:
+
+        - "full": all vectors, capacity doubles when full
+        - "none": no vectors, only the weighted current vector
+        - k: last k vectors in a buffer of size 2k, moved to the front when full
+
+    Missing values in the stored vectors are counted per element
+    as vectors are stored and dropped, so valid_mask is O(N).
+
     Parameters
     ----------
     matrix_shape : Tuple[int, ...]
         Tuple to specify matrix shape
+    retention: str | int, optional
+        "full", "none" or number of last vectors to keep
+    capacity: int, optional
+        number of preallocated vectors for full retention
+    dtype: type, optional
+        float dtype of stored vectors, the current vector is kept in float64
     """
 
-    def __init__(self, matrix_shape: Tuple[int, ...]) -> None:
-        self._matrix = []
+    def __init__(
+        self,
+        matrix_shape: Tuple[int, ...],
+        retention: Union[str, int] = "full",
+        capacity: int = 64,
+        dtype: type = np.float64,
+    ) -> None:
+        if retention == "full":
+            maxlen = None
+        elif retention == "none":
+            capacity = 0
+            maxlen = 0
+        elif isinstance(retention, (int, np.integer)) and retention > 0:
+            capacity = 2 * retention
+            maxlen = retention
+        else:
+            raise RuntimeError(
+                f"Retention {retention} should be 'full', 'none' or a positive integer.."
+            )
+
+        self.retention = retention
+        self._matrix = np.full(
+            (max(capacity, 0),) + tuple(matrix_shape), np.nan, dtype=dtype
+        )
+        self._start = 0
+        self._end = 0
         self.current_vector = np.ones(matrix_shape) * np.nan
         self.current_loc = 0
-        self._indexes = deque()
+        self._indexes = deque(maxlen=maxlen)
+
+        # scratch arrays for in place update of current vector
+        self._scratch = np.zeros(matrix_shape)
+        self._missing = np.zeros(matrix_shape, dtype=bool)
+
+        # number of missing values in stored vectors per element
+        self._num_missing = np.zeros(matrix_shape, dtype=int)
 
     @property
     def values(self) -> np.ndarray:
@@ -25,9 +73,9 @@ class WeightedBase(object):
         Returns
         -------
         np.array
-            array of current matrix
+            view of stored vectors, first axis is time
         """
-        return np.array(self._matrix)
+        return self._matrix[self._start : self._end]
 
     @property
     def matrix(self) -> np.ndarray:
@@ -35,9 +83,75 @@ class WeightedBase(object):
         Returns
         -------
         np.array
-            array of current matrix
+            view of stored vectors, first axis is time
+        """
+        return self._matrix[self._start : self._end]
+
+    @property
+    def num_missing(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            number of missing values in stored vectors per element
         """
-        return np.array(self._matrix)
+        return self._num_missing
+
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            elements without missing values in stored vectors
+        """
+        return self._num_missing == 0
+
+    def store(self, new_vectors: np.ndarray) -> None:
+        """
+        Write vectors into preallocated array according to retention
+
+        Parameters
+        ----------
+        new_vectors : np.ndarray
+            Input vectors, first axis is time
+        """
+        if self.retention == "none":
+            return
+
+        if self.retention == "full":
+            n_new = len(new_vectors)
+            capacity = self._matrix.shape[0]
+            if self._end + n_new > capacity:
+                new_matrix = np.full(
+                    (max(2 * capacity, self._end + n_new),) + self._matrix.shape[1:],
+                    np.nan,
+                    dtype=self._matrix.dtype,
+                )
+                new_matrix[: self._end] = self._matrix[: self._end]
+                self._matrix = new_matrix
+        else:
+            new_vectors = new_vectors[-self.retention :]
+            n_new = len(new_vectors)
+
+            # oldest vectors leaving the last k
+            n_dropped = max(self._end - self._start + n_new - self.retention, 0)
+            self._num_missing -= np.sum(
+                np.isnan(self._matrix[self._start : self._start + n_dropped]), axis=0
+            )
+            if self._end + n_new > self._matrix.shape[0]:
+                # move last vectors still in window to front of buffer
+                keep = min(self.retention - n_new, self._end - self._start)
+                self._matrix[:keep] = self._matrix[self._end - keep : self._end]
+                self._start, self._end = 0, keep
+
+        self._matrix[self._end : self._end + n_new] = new_vectors
+        self._num_missing += np.sum(
+            np.isnan(self._matrix[self._end : self._end + n_new]), axis=0
+        )
+        self._end += n_new
+        if self.retention != "full":
+            self._start = max(self._start, self._end - self.retention)
 
     @property
     def indexes(self) -> np.ndarray:
@@ -58,7 +172,7 @@ class WeightedBase(object):
         **kwargs,
     ) -> None:
         """
-        - Append new vector to matrix
+        - Store new vector according to retention
         - Update current vector for cov calculation
         - Append index to indexes
 
@@ -73,12 +187,106 @@ class WeightedBase(object):
         index: optional
             index to save for streaming data point, p.e. date
         """
-        self._matrix.append(new_vector)
-        self.current_vector = np.nansum(
-            [(self.current_vector * adjustment), (new_vector * batch_weight)], axis=0
+        self.store(np.expand_dims(new_vector, axis=0))
+
+        # current vector * adjustment + new vector * batch weight, missing values as zero
+        current_vector = self.current_vector
+        np.multiply(current_vector, adjustment, out=current_vector)
+        kernels.nan_to_zero(current_vector, current_vector, self._missing)
+        dtype = np.result_type(new_vector, batch_weight)
+        np.multiply(new_vector, batch_weight, out=self._scratch, dtype=dtype)
+        kernels.add_nan_to_zero(
+            current_vector, self._scratch, self._scratch, self._missing
         )
 
         this_index = index if index is not None else self.current_loc
         self._indexes.append(this_index)
 
         self.current_loc += 1
+
+    def update_block(
+        self,
+        new_vectors: np.ndarray,
+        batch_weight: float = 1,
+        adjustment: float = 1,
+        indexes: list = None,
+        **kwargs,
+    ) -> None:
+        """
+        - Store block of new vectors according to retention
+        - Update current vector for cov calculation
+        - Append indexes to indexes
+
+        Same result as calling update for each vector in new_vectors
+
+        Calculation
+        -----------
+        current vector * adjustment + new vector * batch weight, for each vector
+
+        Parameters
+        ----------
+        new_vectors : np.ndarray
+            Input vectors, first axis is time
+        batch_weight : float | np.array
+            Weight of incoming batch, scalar or one weight per vector
+        adjustment: float | np.array, optional
+            adjust weight of old vectors over time, scalar or one adjustment per vector
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        n_obs = len(new_vectors)
+        if n_obs == 0:
+            return
+
+        weight_shape = (-1,) + (1,) * (new_vectors.ndim - 1)
+        weighted = new_vectors * np.reshape(batch_weight, weight_shape)
+        weighted = np.where(np.isnan(weighted), 0, weighted)
+        current_vector = np.where(np.isnan(self.current_vector), 0, self.current_vector)
+
+        adjustment = np.broadcast_to(np.ravel(adjustment), (n_obs,))
+        if np.all(adjustment == 1):
+            # sequential sum, identical to repeated nansum
+            self.current_vector = np.sum(
+                np.concatenate([np.expand_dims(current_vector, axis=0), weighted]),
+                axis=0,
+            )
+        else:
+            # decay is applied vector by vector in place to keep the same rounding
+            # as the incremental calculation
+            for this_adjustment, this_weighted in zip(adjustment, weighted):
+                current_vector *= this_adjustment
+                current_vector += this_weighted
+            self.current_vector = current_vector
+
+        self.store(new_vectors)
+
+        this_indexes = (
+            indexes
+            if indexes is not None
+            else range(self.current_loc, self.current_loc + n_obs)
+        )
+        self._indexes.extend(this_indexes)
+
+        self.current_loc += n_obs
+
+    def merge(self, other, adjustment: float = 1) -> None:
+        """
+        Append stored vectors and indexes of other stream, p.e. of a later chunk of data
+
+        Calculation
+        -----------
+        current vector * adjustment + current vector of other
+
+        Parameters
+        ----------
+        other: WeightedBase
+            stream of later data with same matrix shape
+        adjustment: float, optional
+            adjust weight of own vectors for vectors of other stream
+        """
+        self.store(other.values)
+        self.current_vector = np.nansum(
+            [(self.current_vector * adjustment), other.current_vector], axis=0
+        )
+        self._indexes.extend(other._indexes)
+        self.current_loc += other.current_loc
@@ -1,40 +1,67 @@
 import numpy as np
 from collections import deque
 from typing import Tuple
+import quantkit.mathstats.streaming_base.kernels as kernels
 
 
 class WindowBase(object):
     """
     Base class for tracking matrix values in the rolling window
 
+    Vectors are written twice into a mirrored buffer of two windows,
+    so the window in chronological order is always one contiguous slice
+    of the buffer and can be returned as a view without copying.
+
+    Missing values in the window are counted per element and updated
+    as vectors enter and leave the window, so valid_mask is O(N).
+
     Parameters
     ----------
     window_shape : Tuple[int, ...]
         Shape of the window matrix
     window_size : int, optional
         Size of the rolling window
+    dtype: type, optional
+        float dtype of stored vectors, p.e. np.float32 to halve memory
     """
 
     def __init__(
         self,
         window_shape: Tuple[int, ...],
         window_size: int = 1,
+        dtype: type = np.float64,
     ) -> None:
-        self.matrix = np.ones(window_shape) * np.nan
+        self._buffer = np.full(
+            (2 * window_shape[0],) + tuple(window_shape[1:]), np.nan, dtype=dtype
+        )
         self.current_loc = 0
         self.window_size = window_size
         self._indexes = deque(maxlen=window_size)
 
+        # number of missing values in window per element, window starts empty
+        self._num_missing = np.full(tuple(window_shape[1:]), window_size, dtype=int)
+        self._missing_vector = np.zeros(tuple(window_shape[1:]), dtype=bool)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            view of window in ring buffer order,
+            next outgoing vector at current location
+        """
+        return self._buffer[: self.window_size]
+
     @property
     def values(self) -> np.ndarray:
         """
         Returns
         -------
         np.array
-            array of current matrix
+            view of window in chronological order, oldest vector first
         """
-        ix_order = np.roll(np.arange(self.window_size), -self.current_loc)
-        return self.matrix[ix_order]
+        return self._buffer[self.current_loc : self.current_loc + self.window_size]
 
     @property
     def indexes(self) -> np.ndarray:
@@ -46,6 +73,26 @@ class WindowBase(object):
         """
         return np.array(self._indexes)
 
+    @property
+    def num_missing(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            number of missing values in window per element
+        """
+        return self._num_missing
+
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.array
+            elements without missing values in window
+        """
+        return self._num_missing == 0
+
     def is_positive(self, adjustment=0) -> bool:
         """
         Returns
@@ -71,12 +118,56 @@ class WindowBase(object):
         index: optional
             index to save for streaming data point, p.e. date
         """
-        self.matrix[self.current_loc, :, :] = new_vector
+        # remove missing values of outgoing vector, add those of new vector
+        np.isnan(self._buffer[self.current_loc], out=self._missing_vector)
+        np.subtract(self._num_missing, self._missing_vector, out=self._num_missing)
+
+        self._buffer[self.current_loc, :, :] = new_vector
+        self._buffer[self.current_loc + self.window_size, :, :] = new_vector
+
+        np.isnan(self._buffer[self.current_loc], out=self._missing_vector)
+        np.add(self._num_missing, self._missing_vector, out=self._num_missing)
         self.current_loc = (self.current_loc + 1) % self.window_size
 
         if index is not None:
             self._indexes.append(index)
 
+    def update_block(
+        self,
+        new_vectors: np.ndarray,
+        batch_weight: float = 1,
+        indexes: list = None,
+        **kwargs,
+    ) -> None:
+        """
+        - Update window matrix with a block of new vectors
+        - Update location for window matrix
+
+        Same result as calling update for each vector in new_vectors
+
+        Parameters
+        ----------
+        new_vectors : np.array
+            Input vectors, first axis is time
+        batch_weight : float, optional
+            Weight of incoming batch
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        n_obs = len(new_vectors)
+        locs = (self.current_loc + np.arange(n_obs)) % self.window_size
+
+        # only the last window_size vectors survive in the ring buffer
+        keep = max(n_obs - self.window_size, 0)
+        self._num_missing -= np.sum(np.isnan(self._buffer[locs[keep:]]), axis=0)
+        self._buffer[locs[keep:]] = new_vectors[keep:]
+        self._buffer[locs[keep:] + self.window_size] = new_vectors[keep:]
+        self._num_missing += np.sum(np.isnan(self._buffer[locs[keep:]]), axis=0)
+        self.current_loc = (self.current_loc + n_obs) % self.window_size
+
+        if indexes is not None:
+            self._indexes.extend(indexes)
+
 
 class WindowStream(WindowBase):
     """
@@ -90,6 +181,8 @@ class WindowStream(WindowBase):
         Shape of current vector
     window_size : int, default 1
         Size of the rolling window
+    dtype: type, optional
+        float dtype of stored vectors, the current vector is kept in float64
     """
 
     def __init__(
@@ -97,10 +190,17 @@ class WindowStream(WindowBase):
         window_shape: Tuple[int, ...],
         curr_shape: Tuple[int, ...],
         window_size: int = 1,
+        dtype: type = np.float64,
     ):
-        super().__init__(window_shape=window_shape, window_size=window_size)
+        super().__init__(
+            window_shape=window_shape, window_size=window_size, dtype=dtype
+        )
         self.curr_vector = np.zeros(curr_shape) * np.nan
 
+        # scratch arrays for in place update of current vector
+        self._scratch = np.zeros(curr_shape)
+        self._missing = np.zeros(curr_shape, dtype=bool)
+
     def update(self, new_vector: np.ndarray, batch_weight: int = 1, **kwargs) -> None:
         """
         Sum vectors and update the window matrix of the new vector
@@ -114,7 +214,48 @@ class WindowStream(WindowBase):
         """
         # Update streaming module
         vector_three = self.matrix[self.current_loc, :, :]
-        self.curr_vector = np.nansum(
-            [self.curr_vector, new_vector, -1 * vector_three], axis=0
+
+        # current vector + new vector - outgoing vector, missing values as zero
+        curr_vector = self.curr_vector
+        kernels.nan_to_zero(curr_vector, curr_vector, self._missing)
+        kernels.add_nan_to_zero(curr_vector, new_vector, self._scratch, self._missing)
+        np.negative(vector_three, out=self._scratch)
+        kernels.add_nan_to_zero(
+            curr_vector, self._scratch, self._scratch, self._missing
         )
         super().update(new_vector=new_vector, **kwargs)
+
+    def update_block(
+        self,
+        new_vectors: np.ndarray,
+        batch_weight: int = 1,
+        indexes: list = None,
+        **kwargs,
+    ) -> None:
+        """
+        Sum block of vectors and update the window matrix of the new vectors
+        Same result as calling update for each vector in new_vectors
+
+        Parameters
+        ----------
+        new_vectors : np.array
+            Input vectors, first axis is time
+        batch_weight : float, optional
+            Weight of incoming batch
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+        """
+        n_obs = len(new_vectors)
+        if n_obs == 0:
+            return
+        outgoing_vectors = np.concatenate([self.values, new_vectors])[:n_obs]
+
+        # interleave incoming and outgoing vectors, so that the running sum
+        # adds them in the same order as the incremental calculation
+        summands = np.zeros(shape=(2 * n_obs + 1,) + self.curr_vector.shape)
+        summands[0] = self.curr_vector
+        summands[1::2] = new_vectors
+        summands[2::2] = -outgoing_vectors
+        summands = np.where(np.isnan(summands), 0, summands)
+        self.curr_vector = np.sum(summands, axis=0)
+        super().update_block(new_vectors=new_vectors, indexes=indexes, **kwargs)
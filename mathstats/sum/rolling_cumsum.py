@@ -38,6 +38,7 @@ class RollingCumSum(simple_cumsum.SimpleCumSum):
             window_shape=(window_size, 1, num_ind_variables),
             window_size=window_size,
         )
+        self.init_buffers(num_ind_variables)
 
     @property
     def windowed_outgoing_row(self) -> np.ndarray:
@@ -75,16 +76,66 @@ class RollingCumSum(simple_cumsum.SimpleCumSum):
 
         self.total_iterations += 1
 
-        self._cumsum = self.calculate_cumsum(
-            self._cumsum,
-            incoming_variables,
-            outgoing_variables,
+        self.calculate_cumsum(
+            self._cumsum, incoming_variables, outgoing_variables, out=self._cumsum
         )
 
         self.data_stream.update(
             np.expand_dims(incoming_variables, axis=0), incoming_variables, **kwargs
         )
 
+    def update_block(
+        self,
+        incoming_variables: np.ndarray,
+        indexes: list = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Update the current cumsum array with a block of newly streamed in data.
+        Outgoing variables are taken from the rolling window.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming block of data, one row per observation
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+
+        Returns
+        -------
+        np.array
+            cumulative sum after each row of the block
+        """
+        if self._cumsum.shape != incoming_variables.shape[1:]:
+            raise RuntimeError(
+                f"Incoming Variables shape {incoming_variables.shape[1:]} does not match Cumsum shape {self._cumsum.shape}"
+            )
+
+        n_obs = len(incoming_variables)
+        self.total_iterations += n_obs
+
+        outgoing_variables = np.concatenate(
+            [self.data_stream.values[:, 0, :], incoming_variables]
+        )[:n_obs]
+
+        # interleave incoming and outgoing variables, so that the running sum
+        # adds them in the same order as the incremental calculation
+        summands = np.zeros(shape=(2 * n_obs + 1,) + self._cumsum.shape)
+        summands[0] = self._cumsum
+        summands[1::2] = incoming_variables
+        summands[2::2] = -outgoing_variables
+        summands = np.where(np.isnan(summands), 0, summands)
+        cumsums = np.cumsum(summands, axis=0)[2::2]
+
+        if n_obs > 0:
+            np.copyto(self._cumsum, cumsums[-1])
+
+        self.data_stream.update_block(
+            np.expand_dims(incoming_variables, axis=1), indexes=indexes
+        )
+        return cumsums
+
     def is_valid(self):
         """
         check if inputs are valid
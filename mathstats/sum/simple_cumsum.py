@@ -1,5 +1,7 @@
 import numpy as np
+from typing import Union
 import quantkit.mathstats.streaming_base.weighted_base as weighted_base
+import quantkit.mathstats.streaming_base.kernels as kernels
 
 
 class SimpleCumSum(object):
@@ -14,15 +16,36 @@ class SimpleCumSum(object):
     ----------
     num_ind_variables : int
         Number of variables
+    retention: str | int, optional
+        history of data stream, "full", "none" or number of last observations
     """
 
-    def __init__(self, num_ind_variables: int, **kwargs) -> None:
+    def __init__(
+        self,
+        num_ind_variables: int,
+        retention: Union[str, int] = "full",
+        **kwargs,
+    ) -> None:
         self._cumsum = np.ones(shape=num_ind_variables) * np.nan
         self.data_stream = weighted_base.WeightedBase(
-            matrix_shape=(1, num_ind_variables)
+            matrix_shape=(1, num_ind_variables), retention=retention
         )
         self.iterations = np.zeros(shape=num_ind_variables)
         self.total_iterations = 0
+        self.init_buffers(num_ind_variables)
+
+    def init_buffers(self, num_ind_variables: int) -> None:
+        """
+        Preallocate scratch arrays for in place updates
+
+        Parameters
+        ----------
+        num_ind_variables : int
+            Number of variables
+        """
+        self._scratch = np.zeros(shape=num_ind_variables)
+        self._missing = np.zeros(shape=num_ind_variables, dtype=bool)
+        self._valid = np.zeros(shape=num_ind_variables, dtype=bool)
 
     @property
     def cumsum(self) -> np.ndarray:
@@ -32,16 +55,17 @@ class SimpleCumSum(object):
         np.array
             Cumulative Sum of current array
         """
-        return self._cumsum
+        return self._cumsum.copy()
 
     def calculate_cumsum(
         self,
         prev_sum: np.ndarray,
         incoming_variables: np.ndarray,
-        outgoing_variables: np.ndarray,
+        outgoing_variables: np.ndarray = None,
+        out: np.ndarray = None,
     ) -> np.ndarray:
         """
-        Calculate the cumulative sum
+        Calculate the cumulative sum, missing values are skipped
 
         Calculation
         -----------
@@ -53,22 +77,25 @@ class SimpleCumSum(object):
             previous sum
         incoming_variables: np.array
             new set of values
-        outgoing variables: np.array
+        outgoing variables: np.array, optional
             old set of values falling out of window size
+        out: np.array, optional
+            preallocated array for new sum, can be prev_sum itself
 
         Returns
         -------
         np.array
             cumulative sum
         """
-        outgoing_variables = np.where(
-            np.isnan(outgoing_variables), 0, outgoing_variables
-        )
+        if out is None:
+            out = np.empty(np.shape(prev_sum))
 
-        new_cumsum = np.nansum(
-            [prev_sum, incoming_variables, -outgoing_variables], axis=0
-        )
-        return new_cumsum
+        kernels.nan_to_zero(prev_sum, out, self._missing)
+        kernels.add_nan_to_zero(out, incoming_variables, self._scratch, self._missing)
+        if outgoing_variables is not None:
+            kernels.nan_to_zero(outgoing_variables, self._scratch, self._missing)
+            np.subtract(out, self._scratch, out=out)
+        return out
 
     def update(self, incoming_variables: np.ndarray, **kwargs) -> None:
         """
@@ -85,13 +112,11 @@ class SimpleCumSum(object):
             )
 
         self.total_iterations += 1
-        self.iterations = self.iterations + np.where(np.isnan(incoming_variables), 0, 1)
+        np.isnan(incoming_variables, out=self._valid)
+        np.logical_not(self._valid, out=self._valid)
+        np.add(self.iterations, 1, out=self.iterations, where=self._valid)
 
-        self._cumsum = self.calculate_cumsum(
-            self._cumsum,
-            incoming_variables,
-            np.ones(shape=self._cumsum.shape) * np.nan,
-        )
+        self.calculate_cumsum(self._cumsum, incoming_variables, out=self._cumsum)
 
         self.data_stream.update(
             new_vector=np.expand_dims(incoming_variables, axis=0),
@@ -99,6 +124,52 @@ class SimpleCumSum(object):
             **kwargs,
         )
 
+    def update_block(
+        self, incoming_variables: np.ndarray, indexes: list = None, **kwargs
+    ) -> np.ndarray:
+        """
+        Update the current cumsum array with a block of newly streamed in data.
+        Same result as calling update for each row of the block.
+
+        Parameters
+        ----------
+        incoming_variables : np.array
+            Incoming block of data, one row per observation
+        indexes: list, optional
+            indexes to save for streaming data points, p.e. dates
+
+        Returns
+        -------
+        np.array
+            cumulative sum after each row of the block
+        """
+        if self._cumsum.shape != incoming_variables.shape[1:]:
+            raise RuntimeError(
+                f"Incoming Variables shape {incoming_variables.shape[1:]} does not match Cumsum shape {self._cumsum.shape}"
+            )
+
+        n_obs = len(incoming_variables)
+        self.total_iterations += n_obs
+        self.iterations = self.iterations + np.sum(
+            ~np.isnan(incoming_variables), axis=0
+        )
+
+        summands = np.concatenate(
+            [np.expand_dims(self._cumsum, axis=0), incoming_variables]
+        )
+        summands = np.where(np.isnan(summands), 0, summands)
+        cumsums = np.cumsum(summands, axis=0)[1:]
+
+        if n_obs > 0:
+            np.copyto(self._cumsum, cumsums[-1])
+
+        self.data_stream.update_block(
+            new_vectors=np.expand_dims(incoming_variables, axis=1),
+            batch_weight=1,
+            indexes=indexes,
+        )
+        return cumsums
+
     def is_valid(self):
         """
         check if inputs are valid
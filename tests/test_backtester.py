@@ -0,0 +1,278 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import tempfile
+import numpy as np
+import pandas as pd
+from copy import deepcopy
+import quantkit.backtester.benchmark as bm
+import quantkit.backtester.allocation.allocation_ledger as allocation_ledger
+import quantkit.backtester.return_calc.return_metrics as return_metrics
+
+N_TICKERS = 60
+N_DAYS = 300
+
+
+def synthetic_runner(**params) -> bm.SyntheticRunner:
+    runner_params = deepcopy(bm.default_params)
+    runner_params.update(params)
+    runner = bm.SyntheticRunner()
+    runner.init(runner_params, n_tickers=N_TICKERS, n_days=N_DAYS, seed=0)
+    return runner
+
+
+def assert_same_results(runner, expected_runner, atol=0.0):
+    for strat, strat_obj in expected_runner.strategies.items():
+        expected = strat_obj.all_portfolios
+        assert len(expected) > 0
+        result = runner.strategies[strat].all_portfolios
+        assert list(result.index) == list(expected.index)
+        assert list(result["portfolio_name"]) == list(expected["portfolio_name"])
+        np.testing.assert_allclose(
+            result["return"].astype(float),
+            expected["return"].astype(float),
+            rtol=0,
+            atol=atol,
+        )
+        for model, allocation_engine in strat_obj.allocation_engines_d.items():
+            expected = allocation_engine.allocations_history.to_frame()
+            result = (
+                runner.strategies[strat]
+                .allocation_engines_d[model]
+                .allocations_history.to_frame()
+            )
+            assert list(result.index) == list(expected.index)
+            np.testing.assert_allclose(result, expected, rtol=0, atol=atol)
+
+
+def test_backtest_modes():
+    streaming = synthetic_runner(backtest_mode="streaming")
+    streaming.run(assign_weights=False)
+    vectorized = synthetic_runner(backtest_mode="vectorized")
+    vectorized.run(assign_weights=False)
+    assert_same_results(vectorized, streaming)
+
+
+def test_parallel():
+    streaming = synthetic_runner()
+    streaming.run_strategies(assign_weights=False)
+    for split in ["strategy", "allocation_model"]:
+        parallel = synthetic_runner()
+        parallel.run_strategies_parallel(workers=2, split=split, assign_weights=False)
+        assert_same_results(parallel, streaming, atol=1e-15)
+
+
+def test_checkpoint_resume():
+    with tempfile.TemporaryDirectory() as path:
+        full = synthetic_runner()
+        full.checkpoint_params = {"path": path, "frequency": 3, "keep": 0}
+        full.run_strategies(assign_weights=False)
+        checkpoints = full.get_checkpoints()
+        assert len(checkpoints) > 1
+
+        resumed = synthetic_runner()
+        resumed.checkpoint_params = {"path": path}
+        resumed.load_checkpoint(checkpoints[0])
+        assert resumed.resume_date == resumed.prices_datasource.rebalance_dates[2]
+        resumed.run_strategies(assign_weights=False)
+        assert_same_results(resumed, full)
+
+
+def test_append():
+    full = synthetic_runner()
+    full.run_strategies(assign_weights=False)
+
+    live = synthetic_runner()
+    return_data = live.prices_datasource.return_data
+    rebalance_dates = live.prices_datasource.rebalance_dates
+    warm_dates = return_data.index[:100]
+    live.prices_datasource.return_data = return_data.loc[warm_dates]
+    live.prices_datasource.rebalance_dates = [
+        date for date in rebalance_dates if date <= warm_dates[-1]
+    ]
+    live.run_strategies(assign_weights=False)
+    for start in range(100, len(return_data), 7):
+        chunk = return_data.iloc[start : start + 7]
+        live.append(
+            chunk,
+            rebalance_dates=[date for date in rebalance_dates if date in chunk.index],
+        )
+    assert live.prices_datasource.rebalance_dates == rebalance_dates
+    assert_same_results(live, full)
+
+
+def test_allocation_ledger():
+    dates = list(pd.bdate_range("2020-01-01", periods=5))
+    allocations = np.random.default_rng(0).random((5, 3))
+    allocations[1, 2] = np.nan
+    history = dict()
+    ledger = allocation_ledger.AllocationLedger(num_assets=3, capacity=2)
+    for date, allocation in zip(dates, allocations):
+        history[date] = allocation
+        ledger[date] = allocation
+    assert ledger.matrix.shape == (8, 3)
+    assert len(ledger) == 5
+    assert list(ledger) == dates
+
+    # overwrite allocation of existing date
+    history[dates[3]] = allocations[0]
+    ledger[dates[3]] = allocations[0]
+    assert len(ledger) == 5
+
+    allocation_pd = pd.DataFrame.from_dict(history, orient="index")
+    pd.testing.assert_frame_equal(ledger.to_frame(), allocation_pd, check_freq=False)
+    for date in dates:
+        np.testing.assert_array_equal(ledger[date], allocation_pd.loc[date].values)
+        np.testing.assert_array_equal(
+            ledger.previous(date), allocation_pd.shift(1).loc[date].values
+        )
+
+    # dates without allocation raise like a DataFrame lookup
+    for date in [
+        pd.Timestamp("2019-12-31"),
+        dates[1] + pd.Timedelta(hours=12),
+        pd.Timestamp("2020-02-03"),
+    ]:
+        for lookup in [ledger.__getitem__, ledger.previous]:
+            try:
+                lookup(date)
+            except KeyError:
+                pass
+            else:
+                raise AssertionError(f"no KeyError for {date}")
+            try:
+                allocation_pd.shift(1).loc[date]
+            except KeyError:
+                pass
+            else:
+                raise AssertionError(f"no KeyError for {date}")
+
+
+def portfolio_return(
+    allocation,
+    this_returns,
+    stopped_securities_matrix,
+    next_allocation,
+    trans_cost,
+    leverage,
+):
+    # one portfolio at a time, as before batching of allocation models
+    traded_m = np.bitwise_not(stopped_securities_matrix)
+    first_stop = (
+        stopped_securities_matrix.cumsum(axis=0).cumsum(axis=0) == 1
+    ) * trans_cost
+    this_returns = this_returns * traded_m * leverage
+    cumulative_returns = np.cumprod(this_returns + 1, axis=0)
+    cumulative_returns = np.where(np.isnan(cumulative_returns), 0, cumulative_returns)
+    allocation = allocation / leverage
+    ending_allocation = allocation * cumulative_returns
+    ending_allocation = (
+        ending_allocation.T / np.nansum(ending_allocation, axis=1)
+    ).T * leverage
+    stopped_ending = ending_allocation * traded_m
+
+    actual_returns = allocation @ cumulative_returns.T
+    actual_returns = np.insert(actual_returns, 0, 1)
+    actual_returns = np.diff(actual_returns) / actual_returns[:-1]
+
+    next_allocation_m = ending_allocation.copy()
+    next_allocation_m[-1] = next_allocation
+    trans_cost_m = np.zeros(this_returns.shape)
+    trans_cost_m[-1] = trans_cost
+    trans_cost_m = np.max([trans_cost_m, first_stop], axis=0)
+    turnover = abs(next_allocation_m - stopped_ending)
+    return actual_returns - (turnover * trans_cost_m).sum(axis=1)
+
+
+def test_portfolio_returns():
+    n_models, n_dates, n_assets = 4, 21, 6
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2020-01-01", periods=n_dates)
+    this_returns = rng.normal(0.0, 0.02, (n_dates, n_assets))
+    this_returns[0, 1] = np.nan
+    this_returns[5:9, 4] = np.nan
+    stopped_securities_matrix = np.zeros((n_dates, n_assets), dtype=bool)
+    stopped_securities_matrix[10:, 2] = True
+    allocations = rng.random((n_models, n_assets))
+    allocations[:, 3] = 0.0
+    allocations[1, :2] = 0.0
+    allocations /= allocations.sum(axis=1, keepdims=True)
+    next_allocations = rng.random((n_models, n_assets))
+    next_allocations[2] = 0.0
+
+    metrics = return_metrics.ReturnMetrics(universe=list(range(n_assets)))
+    for leverage in [1.0, 1.5]:
+        returns = metrics.get_portfolio_returns(
+            allocations=allocations,
+            this_returns=this_returns,
+            stopped_securities_matrix=stopped_securities_matrix,
+            indexes=dates,
+            next_allocations=next_allocations,
+            trans_cost=0.001,
+            leverage=leverage,
+        )
+        assert returns.shape == (n_dates, n_models)
+        for model in range(n_models):
+            expected = portfolio_return(
+                allocations[model],
+                this_returns,
+                stopped_securities_matrix,
+                next_allocations[model],
+                0.001,
+                leverage,
+            )
+            single = metrics.get_portfolio_return(
+                allocation=allocations[model],
+                this_returns=this_returns,
+                stopped_securities_matrix=stopped_securities_matrix,
+                indexes=dates,
+                next_allocation=next_allocations[model],
+                trans_cost=0.001,
+                leverage=leverage,
+            )
+            np.testing.assert_allclose(
+                returns.iloc[:, model], expected, rtol=0, atol=1e-15
+            )
+            np.testing.assert_allclose(single["return"], expected, rtol=0, atol=1e-15)
+
+
+def test_simple_risk_engine():
+    runners = dict()
+    for risk_dtype in ["float64", "float32"]:
+        strategies = deepcopy(bm.default_params["strategies"])
+        for strat_params in strategies.values():
+            strat_params["risk_engine"] = "simple"
+            strat_params["risk_dtype"] = risk_dtype
+        runners[risk_dtype] = synthetic_runner(strategies=strategies)
+        runners[risk_dtype].run_strategies(assign_weights=False)
+
+    for strat, strat_obj in runners["float64"].strategies.items():
+        risk_engine = strat_obj.risk_engine
+        risk_engine_32 = runners["float32"].strategies[strat].risk_engine
+        assert risk_engine_32.dtype == np.float32
+        assert risk_engine.valid_assets.shape == (N_TICKERS,)
+        assert risk_engine.valid_assets.any()
+        np.testing.assert_array_equal(
+            risk_engine_32.valid_assets, risk_engine.valid_assets
+        )
+        valid = np.ix_(risk_engine.valid_assets, risk_engine.valid_assets)
+        cov = risk_engine.window_cov[valid]
+        cov_32 = risk_engine_32.window_cov[valid]
+        vol_product = np.sqrt(np.outer(np.diag(cov), np.diag(cov)))
+        assert np.all(np.abs(cov_32 - cov) <= 1e-6 * vol_product)
+
+        all_portfolios = strat_obj.all_portfolios
+        all_portfolios_32 = runners["float32"].strategies[strat].all_portfolios
+        assert len(all_portfolios) > 0
+        assert list(all_portfolios_32.index) == list(all_portfolios.index)
+
+
+if __name__ == "__main__":
+    test_backtest_modes()
+    test_parallel()
+    test_checkpoint_resume()
+    test_append()
+    test_allocation_ledger()
+    test_portfolio_returns()
+    test_simple_risk_engine()
@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 from scipy.stats import gmean
 import quantkit.mathstats.covariance.simple_covariance as simple_covariance
+import quantkit.mathstats.mean.simple_mean as simple_mean
 import quantkit.mathstats.covariance.window_covariance as window_covariance
 import quantkit.mathstats.covariance.expo_covariance as expo_covariance
 import quantkit.mathstats.sum.simple_cumsum as simple_cumsum
@@ -13,6 +14,14 @@ import quantkit.mathstats.sum.rolling_cumsum as rolling_cumsum
 import quantkit.mathstats.product.simple_cumprod as simple_cumprod
 import quantkit.mathstats.product.rolling_cumprod as rolling_cumprod
 import quantkit.mathstats.matrix.correlation as correlation
+import quantkit.mathstats.covariance.numpy_covariance as numpy_covariance
+import quantkit.mathstats.regression.ols_regression as lr
+import quantkit.mathstats.median.median as median
+import quantkit.mathstats.median.rolling_quantile as rolling_quantile
+import quantkit.mathstats.covariance.factor_covariance as factor_covariance
+import quantkit.mathstats.streaming_base.window_base as window_base
+import quantkit.mathstats.streaming_base.weighted_base as weighted_base
+import quantkit.mathstats.extremum.rolling_extremum as rolling_extremum
 
 
 def test_integer_dataset():
@@ -271,9 +280,436 @@ def test_emwa_cov():
     )
 
 
+def test_emwa_cov_bank():
+    """
+    Use floats:
+    - Test quantkit exponential weighted covariance bank - compare to pd.ewm().cov() for each decay
+    - Test quantkit exponential weighted covariance bank - compare to exponential weighted covariance
+    """
+    np.random.seed(0)
+    data = np.random.rand(100, 3)
+    decay_factors = [0.8, 0.9, 0.97]
+
+    model = expo_covariance.ExponentialWeightedCovarianceBank(
+        num_ind_variables=3, decay_factors=decay_factors[:2]
+    )
+    model.add_decay_factor(decay_factors[2])
+    single_model = expo_covariance.ExponentialWeightedCovariance(num_ind_variables=3)
+    for i in range(len(data)):
+        model.update(data[i])
+        single_model.update(data[i], batch_weight=0.9)
+
+    for k, decay_factor in enumerate(decay_factors):
+        ewm = pd.DataFrame(data).ewm(alpha=1 - decay_factor, adjust=True)
+        assert np.allclose(model.results["cov"][k], ewm.cov(bias=True).loc[99])
+        assert np.allclose(model.results["mean"][k], ewm.mean().iloc[-1])
+    assert np.allclose(model.get_cov(0.9), single_model.results["cov"])
+
+
+def test_merge():
+    """
+    Use floats split into chunks:
+    - Test quantkit merge of mean - compare to sequential updates
+    - Test quantkit merge of covariance - compare to sequential updates
+    - Test quantkit merge of exponential weighted covariance - compare to sequential updates
+    - Test quantkit merge of covariance with a variable starting later - compare to sequential updates
+    """
+    np.random.seed(0)
+    data = np.random.uniform(-0.1, 0.1, [200, 4])
+    chunks = [data[:30], data[30:110], data[110:]]
+
+    for model_class, batch_weight in [
+        (simple_mean.SimpleMean, 1),
+        (simple_covariance.Covariance, 1),
+        (expo_covariance.ExponentialWeightedCovariance, 0.9),
+    ]:
+        model = model_class(num_ind_variables=4, geo_base=1)
+        chunk_models = [
+            model_class(num_ind_variables=4, geo_base=1) for chunk in chunks
+        ]
+        for i in range(len(data)):
+            model.update(data[i], batch_weight=batch_weight)
+        for chunk_model, chunk in zip(chunk_models, chunks):
+            for i in range(len(chunk)):
+                chunk_model.update(chunk[i], batch_weight=batch_weight)
+        for chunk_model in chunk_models[1:]:
+            chunk_models[0].merge(chunk_model, batch_weight=batch_weight)
+
+        if model_class == simple_mean.SimpleMean:
+            assert np.allclose(chunk_models[0].mean, model.mean)
+            assert np.allclose(chunk_models[0].gmean, model.gmean, equal_nan=True)
+        else:
+            results = chunk_models[0].results
+            assert np.allclose(results["cov"], model.results["cov"])
+            assert np.allclose(results["mean"], model.results["mean"], equal_nan=True)
+
+    # variable starting in second chunk: exact for pairs observed in the same rows
+    late_data = data.copy()
+    late_data[:50, 3] = np.nan
+    model = simple_covariance.Covariance(num_ind_variables=4)
+    chunk_models = [simple_covariance.Covariance(num_ind_variables=4) for i in range(2)]
+    for i in range(len(late_data)):
+        model.update(late_data[i])
+        chunk_models[i >= 30].update(late_data[i])
+    chunk_models[0].merge(chunk_models[1])
+    cov = model.results["cov"]
+    merged_cov = chunk_models[0].results["cov"]
+    vol_product = np.sqrt(np.outer(np.diag(cov), np.diag(cov)))
+    assert np.allclose(merged_cov[:3, :3], cov[:3, :3])
+    assert np.allclose(np.diag(merged_cov), np.diag(cov))
+    assert np.allclose(chunk_models[0].results["mean"], model.results["mean"])
+    assert np.all(np.abs(merged_cov - cov) < 0.05 * vol_product)
+
+
+def test_block_update():
+    """
+    Use floats with missing values and:
+    - Test quantkit block update of covariance - compare to sequential updates
+    - Test quantkit block update of exponential weighted covariance - compare to sequential updates
+    - Test quantkit block update of numpy window covariance - compare to sequential updates
+    - Test quantkit block update of rolling cumsum - compare to sequential updates
+    - Test quantkit block update of rolling window covariance - compare to sequential updates
+    - Test quantkit block update of rolling cumprod - compare to sequential updates
+    - Test quantkit block update of ols regression - compare to sequential updates
+    - Test quantkit window in chronological order - compare to last rows of input
+    """
+    np.random.seed(0)
+    data = np.random.uniform(-0.1, 0.1, [50, 5])
+    data[np.random.rand(50, 5) < 0.05] = np.nan
+    blocks = [(0, 1), (1, 12), (12, 13), (13, 50)]
+
+    cov_model = simple_covariance.Covariance(num_ind_variables=5)
+    cov_block = simple_covariance.Covariance(num_ind_variables=5)
+    expo_model = expo_covariance.ExponentialWeightedCovariance(num_ind_variables=5)
+    expo_block = expo_covariance.ExponentialWeightedCovariance(num_ind_variables=5)
+    window_model = numpy_covariance.NumpyWindowCovariance(
+        num_ind_variables=5, window_size=10, ddof=1
+    )
+    window_block = numpy_covariance.NumpyWindowCovariance(
+        num_ind_variables=5, window_size=10, ddof=1
+    )
+    sum_model = rolling_cumsum.RollingCumSum(num_ind_variables=5, window_size=10)
+    sum_block = rolling_cumsum.RollingCumSum(num_ind_variables=5, window_size=10)
+    rolling_model = window_covariance.WindowCovariance(
+        num_ind_variables=5, window_size=10
+    )
+    rolling_block = window_covariance.WindowCovariance(
+        num_ind_variables=5, window_size=10
+    )
+    prod_model = rolling_cumprod.RollingCumProd(num_ind_variables=5, window_size=10)
+    prod_block = rolling_cumprod.RollingCumProd(num_ind_variables=5, window_size=10)
+    ols_model = lr.OrdinaryLR(num_ind_variables=2, num_dep_variables=3, window_size=10)
+    ols_block = lr.OrdinaryLR(num_ind_variables=2, num_dep_variables=3, window_size=10)
+    filled = np.nan_to_num(data)
+
+    quantkit_cumsum = []
+    for i in range(len(data)):
+        batch_ind = np.array(data[i])
+        cov_model.update(batch_ind, index=i)
+        expo_model.update(batch_ind, batch_weight=0.9, index=i)
+        window_model.update(batch_ind, index=i)
+        sum_model.update(batch_ind, sum_model.windowed_outgoing_row.squeeze(), index=i)
+        quantkit_cumsum.append(sum_model.cumsum)
+        rolling_model.update(batch_ind)
+        prod_model.update(batch_ind + 1, prod_model.windowed_outgoing_row.squeeze())
+        ols_model.update(filled[i, :2], filled[i, 2:])
+
+    block_cumsum = []
+    for start, end in blocks:
+        indexes = list(range(start, end))
+        cov_block.update_block(data[start:end], indexes=indexes)
+        expo_block.update_block(data[start:end], batch_weight=0.9, indexes=indexes)
+        window_block.update_block(data[start:end], indexes=indexes)
+        block_cumsum.append(sum_block.update_block(data[start:end], indexes=indexes))
+        rolling_block.update_block(data[start:end])
+        prod_block.update_block(data[start:end] + 1)
+        ols_block.update_block(filled[start:end, :2], filled[start:end, 2:])
+
+    assert np.array_equal(
+        cov_model.results["cov"], cov_block.results["cov"], equal_nan=True
+    )
+    assert np.array_equal(
+        cov_model.mean_calculator.data_stream.indexes,
+        cov_block.mean_calculator.data_stream.indexes,
+    )
+    assert np.array_equal(
+        expo_model.results["cov"], expo_block.results["cov"], equal_nan=True
+    )
+    assert np.array_equal(
+        window_model.results["cov"], window_block.results["cov"], equal_nan=True
+    )
+    assert np.array_equal(
+        window_model.data_stream.indexes, window_block.data_stream.indexes
+    )
+    assert np.array_equal(quantkit_cumsum, np.concatenate(block_cumsum), equal_nan=True)
+    assert np.array_equal(
+        rolling_model.results["cov"], rolling_block.results["cov"], equal_nan=True
+    )
+    assert np.array_equal(prod_model.cumprod, prod_block.cumprod, equal_nan=True)
+    assert np.array_equal(ols_model.results["beta"], ols_block.results["beta"])
+    assert np.array_equal(
+        ols_model.results["r_squared"], ols_block.results["r_squared"]
+    )
+    assert np.array_equal(
+        window_block.data_stream.values[:, 0, :], data[-10:], equal_nan=True
+    )
+    assert np.shares_memory(
+        window_block.data_stream.values, window_block.data_stream.matrix
+    )
+
+
+def test_retention():
+    """
+    - Test quantkit data stream retention of full, last k and no history - compare to input
+    - Test quantkit covariance without history - compare to full history
+    """
+    np.random.seed(1)
+    data = np.random.uniform(-0.1, 0.1, [50, 4])
+
+    full_model = simple_mean.SimpleMean(num_ind_variables=4)
+    last_model = simple_mean.SimpleMean(num_ind_variables=4, retention=7)
+    none_model = simple_mean.SimpleMean(num_ind_variables=4, retention="none")
+    cov_full = simple_covariance.Covariance(num_ind_variables=4, retention="full")
+    cov_none = simple_covariance.Covariance(num_ind_variables=4)
+
+    for i in range(len(data)):
+        for model in [full_model, last_model, none_model]:
+            model.update(data[i], index=i)
+        cov_full.update(data[i])
+        cov_none.update(data[i])
+    last_model.update_block(data[:3], indexes=[50, 51, 52])
+
+    assert np.array_equal(full_model.data_stream.values[:, 0, :], data)
+    assert np.array_equal(
+        last_model.data_stream.values[:, 0, :], np.concatenate([data[-4:], data[:3]])
+    )
+    assert np.array_equal(last_model.data_stream.indexes, np.arange(46, 53))
+    assert none_model.data_stream.values.shape == (0, 1, 4)
+    assert np.array_equal(full_model.mean, none_model.mean)
+    assert np.array_equal(cov_full.results["cov"], cov_none.results["cov"])
+    assert cov_none.demean_squared.values.shape == (0, 4, 4)
+
+
+def test_float32():
+    """
+    - Test quantkit covariance on float32 data streams - compare to float64 within 1e-6 of vol product
+    - Test quantkit window covariance on float32 data streams - compare to float64 within 1e-6 of vol product
+    - Test quantkit exponential weighted covariance bank on float32 data - compare to float64 within 1e-6 of vol product
+    - Test quantkit factor covariance on float32 data - compare to float64 within 1e-6 of vol product
+    """
+    np.random.seed(2)
+    data = np.random.normal(0.0004, 0.02, [300, 6])
+
+    models = dict()
+    for dtype in [np.float64, np.float32]:
+        models[dtype] = [
+            simple_covariance.Covariance(num_ind_variables=6, dtype=dtype),
+            numpy_covariance.NumpyWindowCovariance(
+                num_ind_variables=6, window_size=63, ddof=1, dtype=dtype
+            ),
+            expo_covariance.ExponentialWeightedCovarianceBank(
+                num_ind_variables=6, decay_factors=[0.94], dtype=dtype
+            ),
+            factor_covariance.FactorCovariance(
+                num_ind_variables=6, num_factors=3, span=63, dtype=dtype
+            ),
+        ]
+        for model in models[dtype]:
+            model.update_block(data)
+
+    for model, model_32 in zip(models[np.float64], models[np.float32]):
+        cov = np.squeeze(model.results["cov"])
+        cov_32 = np.squeeze(model_32.results["cov"])
+        vol_product = np.sqrt(np.outer(np.diag(cov), np.diag(cov)))
+        assert cov_32.dtype == np.float64
+        assert not np.array_equal(cov_32, cov)
+        assert np.all(np.abs(cov_32 - cov) < 1e-6 * vol_product)
+    assert models[np.float32][1].data_stream.values.dtype == np.float32
+
+
+def test_quantiles():
+    """
+    Use floats and:
+    - Test quantkit quantiles before compression - compare to np.quantile()
+    - Test quantkit quantile sketch - compare rank of median to 0.5
+    - Test quantkit merge of quantile sketches - compare to sketch of all data
+    - Test quantkit quantiles without data - compare to nan
+    """
+    np.random.seed(0)
+    data = np.random.lognormal(0, 1, [50000, 3])
+
+    assert np.isnan(median.Quantiles().median)
+    empty_quantiles = median.Quantiles(num_ind_variables=3).quantiles([0.1, 0.5])
+    assert empty_quantiles.shape == (2, 3) and np.all(np.isnan(empty_quantiles))
+
+    exact_model = median.Quantiles(num_ind_variables=3)
+    exact_model.add_values(data[:100])
+    assert np.allclose(
+        exact_model.quantiles([0.1, 0.5, 0.9]),
+        np.quantile(data[:100], [0.1, 0.5, 0.9], axis=0),
+    )
+
+    model = median.Quantiles(num_ind_variables=3)
+    first_half = median.Quantiles(num_ind_variables=3)
+    second_half = median.Quantiles(num_ind_variables=3)
+    for i in range(len(data)):
+        model.add_value(data[i])
+    first_half.add_values(data[:25000])
+    second_half.add_values(data[25000:])
+    first_half.merge(second_half)
+
+    for sketch in [model, first_half]:
+        rank = np.mean(data <= sketch.median, axis=0)
+        assert np.all(np.abs(rank - 0.5) < 0.005)
+        assert np.array_equal(sketch.quantiles([0, 1]), [data.min(0), data.max(0)])
+
+
+def test_rolling_quantile():
+    """
+    Use floats with missing values and ties:
+    - Test quantkit rolling quantile calculation - compare to pd.rolling().quantile()
+    - Test quantkit rolling median calculation - compare to pd.rolling().median()
+    - Test quantkit block update of rolling quantile - compare to sequential updates
+    """
+    np.random.seed(0)
+    data = np.around(np.random.normal(0, 1, [200, 5]), 1)
+    data[np.random.rand(200, 5) < 0.05] = np.nan
+    df = pd.DataFrame(data)
+
+    model = rolling_quantile.RollingQuantile(
+        num_ind_variables=5, window_size=20, quantile=0.25
+    )
+    block_model = rolling_quantile.RollingQuantile(
+        num_ind_variables=5, window_size=20, quantile=0.25
+    )
+    quantkit_quantile = []
+    quantkit_median = []
+    for i in range(len(data)):
+        model.update(data[i], np.squeeze(model.windowed_outgoing_row, axis=0))
+        quantkit_quantile.append(model.quantiles)
+        quantkit_median.append(model.median)
+    block_quantile = np.concatenate(
+        [block_model.update_block(data[:50]), block_model.update_block(data[50:])]
+    )
+
+    expected_quantile = df.rolling(window=20, min_periods=1).quantile(0.25)
+    expected_median = df.rolling(window=20, min_periods=1).median()
+
+    assert np.allclose(quantkit_quantile, expected_quantile, equal_nan=True)
+    assert np.allclose(quantkit_median, expected_median, equal_nan=True)
+    assert np.array_equal(block_quantile, quantkit_quantile, equal_nan=True)
+    assert model.is_valid()
+
+
+def test_factor_covariance():
+    """
+    Use floats generated by two factors:
+    - Test quantkit factor covariance with all factors - compare to pd.ewm().cov()
+    - Test quantkit factor covariance with few factors - compare variances to pd.ewm().var()
+    - Test factored covariance matrix subset and product - compare to dense matrix
+    """
+    np.random.seed(0)
+    factors = np.random.normal(0, 1, [300, 2])
+    data = factors @ np.random.normal(0, 1, [2, 6]) + np.random.normal(0, 0.3, [300, 6])
+    df = pd.DataFrame(data)
+    alpha = 2 / (20 + 1)
+
+    full_model = factor_covariance.FactorCovariance(
+        num_ind_variables=6, num_factors=6, span=20
+    )
+    model = factor_covariance.FactorCovariance(
+        num_ind_variables=6, num_factors=2, span=20
+    )
+    full_model.update_block(data)
+    model.update_block(data)
+
+    expected_cov = df.ewm(alpha=alpha, adjust=True).cov(bias=True).loc[299]
+    expected_var = df.ewm(alpha=alpha, adjust=True).var(bias=True).iloc[-1]
+    cov = model.results["cov"]
+    assert np.allclose(full_model.results["cov"].to_dense(), expected_cov)
+    assert np.allclose(np.diag(cov.to_dense()), expected_var)
+    assert np.allclose(cov.to_dense(), expected_cov, atol=0.1)
+
+    assets = np.array([0, 2, 5])
+    weights = np.array([0.2, 0.3, 0.5])
+    subset = cov[np.ix_(assets, assets)]
+    dense_subset = cov.to_dense()[np.ix_(assets, assets)]
+    assert isinstance(subset, factor_covariance.FactorCovarianceMatrix)
+    assert np.allclose(subset.to_dense(), dense_subset)
+    assert np.allclose(subset @ weights, dense_subset @ weights)
+
+
+def test_valid_mask():
+    """
+    Use floats with missing values:
+    - Test missing value counters of rolling window - compare to scan of window
+    - Test missing value counters of weighted stream - compare to scan of stored vectors
+    """
+    np.random.seed(0)
+    data = np.random.uniform(-0.1, 0.1, [100, 5])
+    data[np.random.uniform(size=data.shape) < 0.05] = np.nan
+    data[40:60, 3] = np.nan
+
+    window = window_base.WindowBase(window_shape=(10, 1, 5), window_size=10)
+    block_window = window_base.WindowBase(window_shape=(10, 1, 5), window_size=10)
+    stream = weighted_base.WeightedBase(matrix_shape=(1, 5), retention=10)
+    for i in range(len(data)):
+        window.update(data[i][np.newaxis, :])
+        stream.update(data[i][np.newaxis, :], batch_weight=1)
+        assert np.array_equal(window.valid_mask, ~np.isnan(window.matrix).any(axis=0))
+        assert np.array_equal(stream.valid_mask, ~np.isnan(stream.values).any(axis=0))
+    for block in [data[:3], data[3:20], data[20:27], data[27:]]:
+        block_window.update_block(block[:, np.newaxis, :])
+        assert np.array_equal(
+            block_window.num_missing, np.isnan(block_window.matrix).sum(axis=0)
+        )
+    assert np.array_equal(block_window.num_missing, window.num_missing)
+
+
+def test_rolling_extremum():
+    """
+    Use floats with missing values:
+    - Test quantkit rolling maximum and minimum - compare to pandas rolling max and min
+    - Test quantkit block update - compare to sequential updates
+    """
+    np.random.seed(0)
+    data = np.random.uniform(-0.1, 0.1, [100, 5])
+    data[np.random.uniform(size=data.shape) < 0.1] = np.nan
+    data[40:60, 3] = np.nan
+    df = pd.DataFrame(data)
+
+    for model_class, expected in [
+        (rolling_extremum.RollingMax, df.rolling(7, min_periods=1).max()),
+        (rolling_extremum.RollingMin, df.rolling(7, min_periods=1).min()),
+    ]:
+        model = model_class(num_ind_variables=5, window_size=7)
+        block_model = model_class(num_ind_variables=5, window_size=7)
+        for i in range(len(data)):
+            model.update(data[i])
+            assert np.allclose(model.extremum, expected.iloc[i], equal_nan=True)
+        block_extrema = np.concatenate(
+            [
+                block_model.update_block(block)
+                for block in [data[:3], data[3:20], data[20:27], data[27:]]
+            ]
+        )
+        assert np.allclose(block_extrema, expected, equal_nan=True)
+        assert np.array_equal(block_model.extremum, model.extremum, equal_nan=True)
+
+
 if __name__ == "__main__":
     test_integer_dataset()
     test_float_dataset()
     test_rolling_integer_dataset()
     test_rolling_float_dataset()
     test_emwa_cov()
+    test_emwa_cov_bank()
+    test_merge()
+    test_block_update()
+    test_retention()
+    test_float32()
+    test_quantiles()
+    test_rolling_quantile()
+    test_factor_covariance()
+    test_valid_mask()
+    test_rolling_extremum()
@@ -59,6 +59,67 @@ def window_ols_dataset():
     )
 
 
+def window_ols_long_dataset():
+    """
+    For a long dataset with a collinear stretch, test quantkits rolling inverse
+    of X'X (rank-one updates, refactorized when ill-conditioned) against
+    np.linalg.pinv and the regression against scikit-learn
+    """
+    window_size = 20
+
+    dep_variables = np.random.uniform(-10, 10, [300, 3])
+    ind_variables = np.random.uniform(-4, 4, [300, 2])
+    ind_variables[100:130, 1] = ind_variables[100:130, 0]
+
+    regression = lr.OrdinaryLR(
+        window_size=window_size, num_dep_variables=3, num_ind_variables=2
+    )
+    for dep, ind in zip(dep_variables, ind_variables):
+        regression.update(ind, dep)
+        regression.results
+
+    reg = LinearRegression()
+    reg = reg.fit(ind_variables[-window_size:], dep_variables[-window_size:])
+
+    assert np.allclose(regression.wxx_inv, np.linalg.pinv(regression.sum_xx))
+    assert np.allclose(regression.results["beta"], reg.coef_.T)
+    assert np.allclose(regression.results["sigma"], reg.intercept_)
+
+
+def window_multi_target_dataset():
+    """
+    For many dependent variables sharing the same factors, test quantkits linear
+    regression against scikit-learn for all targets at once, especially
+    - beta = coef_
+    - sigma = intercept_
+    - r_squared
+    """
+    window_size = 30
+
+    ind_variables = np.random.normal(0, 1, [100, 3])
+    dep_variables = ind_variables @ np.random.normal(0, 1, [3, 200])
+    dep_variables += np.random.normal(0, 1, [100, 200])
+
+    regression = lr.OrdinaryLR(
+        window_size=window_size, num_dep_variables=200, num_ind_variables=3
+    )
+    regression.update_block(ind_variables[:50], dep_variables[:50])
+    for dep, ind in zip(dep_variables[50:], ind_variables[50:]):
+        regression.update(ind, dep)
+
+    reg = LinearRegression()
+    reg = reg.fit(ind_variables[-window_size:], dep_variables[-window_size:])
+    r_squared = r2_score(
+        dep_variables[-window_size:],
+        reg.predict(ind_variables[-window_size:]),
+        multioutput="raw_values",
+    )
+
+    assert np.allclose(regression.results["beta"], reg.coef_.T)
+    assert np.allclose(regression.results["sigma"], reg.intercept_)
+    assert np.allclose(regression.results["r_squared"].squeeze(), r_squared)
+
+
 def window_ridge_dataset():
     """
     For a dataset, test quantkits ridge regression against scikit-learn, especially
@@ -101,4 +162,6 @@ def window_ridge_dataset():
 
 if __name__ == "__main__":
     window_ols_dataset()
+    window_ols_long_dataset()
+    window_multi_target_dataset()
     window_ridge_dataset()
@@ -0,0 +1,41 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pandas as pd
+import quantkit.backtester.risk_management.stop_loss.high_to_low as high_to_low
+
+
+def test_high_to_low():
+    """
+    Use month with 23 trading days, log returns +0.1, -0.1, then flat, and a flat asset:
+    - Test quantkit high to low stop loss - high since rebalance date is kept
+      after the high leaves the 21 day return window, security is stopped on day 22
+    - Test quantkit block assign - compare to sequential assign
+    """
+    log_returns = np.zeros((23, 2))
+    log_returns[:2, 0] = [0.1, -0.1]
+    price_returns = np.exp(log_returns) - 1
+    dates = pd.bdate_range("2023-05-01", periods=23)
+
+    expected = np.zeros((23, 2), dtype=bool)
+    expected[21:, 0] = True
+
+    stop_loss = high_to_low.HighToLow(
+        universe=["A", "B"], stop_threshold=0.1, frequency="DAY", rebalance="MONTH"
+    )
+    for date, price_return in zip(dates, price_returns):
+        stop_loss.assign(date, price_return)
+    assert np.array_equal(np.array(stop_loss.stopped_securities_matrix), expected)
+
+    block_stop_loss = high_to_low.HighToLow(
+        universe=["A", "B"], stop_threshold=0.1, frequency="DAY", rebalance="MONTH"
+    )
+    block_stop_loss.assign_block(dates[:10], price_returns[:10])
+    block_stop_loss.assign_block(dates[10:], price_returns[10:])
+    assert np.array_equal(np.array(block_stop_loss.stopped_securities_matrix), expected)
+
+
+if __name__ == "__main__":
+    test_high_to_low()
@@ -0,0 +1,54 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pandas as pd
+import quantkit.utils.result_store as result_store
+
+
+def test_result_store():
+    columns = {"portfolio_name": "category", "return": float}
+    store = result_store.ResultStore(columns=columns, chunk_size=4)
+    dates = pd.bdate_range("2020-01-01", periods=12).as_unit("ns")
+    returns = np.random.default_rng(0).normal(size=12)
+    returns[5] = np.nan
+
+    frames = list()
+    for start, stop, portfolio_name in [
+        (0, 3, "ex_ante_hrp"),
+        (3, 4, "ex_post_hrp"),
+        (4, 10, "ex_ante_hrp"),
+        (10, 12, "ex_ante_min_variance"),
+    ]:
+        store.append(
+            dates[start:stop],
+            {"portfolio_name": portfolio_name, "return": returns[start:stop]},
+        )
+        frames.append(
+            pd.DataFrame(
+                {"portfolio_name": portfolio_name, "return": returns[start:stop]},
+                index=dates[start:stop],
+            )
+        )
+    assert len(store) == 12
+    assert len(store.chunks) == 3
+
+    expected = pd.concat(frames, axis=0)
+    df = store.to_frame()
+    assert df["portfolio_name"].dtype == expected["portfolio_name"].dtype
+    assert df["return"].dtype == expected["return"].dtype
+    assert all(isinstance(name, str) for name in df["portfolio_name"])
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+    # one name per row and round trip through DataFrame
+    names = np.array(expected["portfolio_name"], dtype=object)
+    store = result_store.ResultStore(columns=columns, chunk_size=5)
+    store.append(dates, {"portfolio_name": names, "return": returns})
+    pd.testing.assert_frame_equal(store.to_frame(), expected, check_freq=False)
+    store = result_store.ResultStore.from_frame(expected, columns, chunk_size=4)
+    pd.testing.assert_frame_equal(store.to_frame(), expected, check_freq=False)
+
+
+if __name__ == "__main__":
+    test_result_store()
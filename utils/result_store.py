@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+
+class ResultStore(object):
+    """
+    Append-only columnar store for results
+    Values are written into preallocated chunks, full chunks are kept and a new
+    chunk is started, so appending never copies earlier results.
+    A DataFrame is only created on demand.
+
+    Parameters
+    ----------
+    columns: dict
+        dtype per column, "category" stores strings as integer codes,
+        decoded into an object column by to_frame
+    index_dtype: str, optional
+        dtype of index
+    chunk_size: int, optional
+        number of rows per chunk
+
+    Usage
+    -----
+    store = ResultStore(columns={"portfolio_name": "category", "return": float})
+    store.append(dates, {"portfolio_name": "ex_ante_hrp", "return": returns})
+    df = store.to_frame()
+    """
+
+    def __init__(
+        self,
+        columns: dict,
+        index_dtype: str = "datetime64[ns]",
+        chunk_size: int = 4096,
+    ) -> None:
+        self.columns = dict(columns)
+        self.index_dtype = index_dtype
+        self.chunk_size = chunk_size
+        self.categories = dict(
+            [
+                (column, dict())
+                for column, dtype in self.columns.items()
+                if dtype == "category"
+            ]
+        )
+        self.chunks = list()
+        self.chunk_loc = 0
+        self.n_rows = 0
+        self.frame = None
+        self.new_chunk()
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def storage_dtype(self, column: str) -> np.dtype:
+        """
+        dtype of column in chunks
+
+        Parameters
+        ----------
+        column: str
+            column name
+
+        Returns
+        -------
+        np.dtype
+            storage dtype
+        """
+        if self.columns[column] == "category":
+            return np.dtype(np.int32)
+        return np.dtype(self.columns[column])
+
+    def new_chunk(self) -> None:
+        """
+        Start new empty chunk
+        """
+        chunk = dict(
+            [
+                (column, np.empty(self.chunk_size, dtype=self.storage_dtype(column)))
+                for column in self.columns
+            ]
+        )
+        chunk["index"] = np.empty(self.chunk_size, dtype=self.index_dtype)
+        self.chunks.append(chunk)
+        self.chunk_loc = 0
+
+    def encode(self, column: str, values) -> np.ndarray:
+        """
+        Translate category values into integer codes
+
+        Parameters
+        ----------
+        column: str
+            column name
+        values: str | np.array
+            category values
+
+        Returns
+        -------
+        np.array
+            integer codes
+        """
+        categories = self.categories[column]
+        values = np.atleast_1d(np.asarray(values, dtype=object))
+        return np.array(
+            [categories.setdefault(value, len(categories)) for value in values],
+            dtype=np.int32,
+        )
+
+    def append(self, index, values: dict) -> None:
+        """
+        Append rows to store
+
+        Parameters
+        ----------
+        index: np.array | pd.Index
+            index of new rows
+        values: dict
+            values per column, either one value per row or a single value for all rows
+        """
+        index = np.asarray(index, dtype=self.index_dtype)
+        n_rows = len(index)
+        if n_rows == 0:
+            return
+
+        rows = dict(index=index)
+        for column in self.columns:
+            column_values = values[column]
+            if self.columns[column] == "category":
+                column_values = self.encode(column, column_values)
+            rows[column] = np.broadcast_to(
+                np.asarray(column_values, dtype=self.storage_dtype(column)), n_rows
+            )
+
+        start = 0
+        while start < n_rows:
+            if self.chunk_loc == self.chunk_size:
+                self.new_chunk()
+            chunk = self.chunks[-1]
+            n_write = min(n_rows - start, self.chunk_size - self.chunk_loc)
+            for column, column_values in rows.items():
+                chunk[column][self.chunk_loc : self.chunk_loc + n_write] = (
+                    column_values[start : start + n_write]
+                )
+            self.chunk_loc += n_write
+            start += n_write
+
+        self.n_rows += n_rows
+        self.frame = None
+
+    def column(self, column: str) -> np.ndarray:
+        """
+        All values of column
+
+        Parameters
+        ----------
+        column: str
+            column name or "index"
+
+        Returns
+        -------
+        np.array
+            values in order of appending
+        """
+        parts = [chunk[column] for chunk in self.chunks[:-1]]
+        parts.append(self.chunks[-1][column][: self.chunk_loc])
+        return np.concatenate(parts)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        All results as DataFrame, cached until next append
+
+        Returns
+        -------
+        pd.DataFrame
+            one column per store column
+        """
+        if self.frame is None:
+            data = dict()
+            for column in self.columns:
+                if self.columns[column] == "category":
+                    # decoded into strings, same dtype as results before storing
+                    categories = np.array(list(self.categories[column]), dtype=object)
+                    data[column] = categories[self.column(column)]
+                else:
+                    data[column] = self.column(column)
+            self.frame = pd.DataFrame(data, index=self.column("index"))
+        return self.frame
+
+    def to_parquet(self, path: str, **kwargs) -> None:
+        """
+        Write all results into parquet file
+
+        Parameters
+        ----------
+        path: str
+            file path
+        kwargs: dict, optional
+            additional arguments for pd.DataFrame.to_parquet
+        """
+        self.to_frame().to_parquet(path, **kwargs)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: dict, **kwargs):
+        """
+        Create store from DataFrame
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            results with one column per store column
+        columns: dict
+            dtype per column, "category" stores strings as integer codes
+        kwargs: dict, optional
+            additional arguments for ResultStore
+
+        Returns
+        -------
+        ResultStore
+            store with rows of df
+        """
+        store = cls(columns=columns, **kwargs)
+        store.append(
+            df.index, dict([(column, df[column].to_numpy()) for column in columns])
+        )
+        return store
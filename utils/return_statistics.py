@@ -129,7 +129,7 @@ def total_return(return_series: pd.DataFrame) -> float:
     """
     return_series = return_series.dropna()
     return_series["return"] = return_series["return"] + 1
-    return return_series["return"].cumprod()[-1] - 1
+    return return_series["return"].cumprod().iloc[-1] - 1
 
 
 def ytd_return(return_series: pd.DataFrame) -> float:
@@ -384,6 +384,39 @@ def max_drawdown(return_series: pd.DataFrame):
     ).min() - 1
 
 
+def portfolio_stats(return_series: pd.DataFrame, frequency: str = "DAY") -> dict:
+    """
+    Calculate numeric return statistics for comparing portfolios,
+    empty if return series has less than two returns
+
+    Parameters
+    ----------
+    return_series: pd.DataFrame
+        return series of strategy
+    frequency: str, optional
+        frequency of data
+
+    Returns
+    -------
+    dict
+        statistics
+    """
+    stats_dict = dict()
+    if return_series["return"].count() < 2:
+        return stats_dict
+
+    stats_dict["total_return"] = total_return(return_series=return_series)
+    stats_dict["annualized_return"] = mean_return(
+        return_series=return_series, annualized=True, frequency=frequency
+    )
+    stats_dict["annualized_volatility"] = volatility(
+        return_series=return_series, annualized=True, frequency=frequency
+    )
+    stats_dict["sharpe"] = sharpe(return_series=return_series, frequency=frequency)
+    stats_dict["max_drawdown"] = max_drawdown(return_series=return_series)
+    return stats_dict
+
+
 def return_stats(return_series: pd.DataFrame, frequency: str = "DAY") -> dict:
     """
     Calculate return statistics
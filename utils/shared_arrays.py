@@ -0,0 +1,106 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+
+class SharedArrays(object):
+    """
+    Collection of numpy arrays stored in shared memory blocks,
+    so that worker processes can read them without copying
+
+    Usage
+    -----
+    In the parent process, add arrays and hand specs to the workers:
+
+        shared = SharedArrays()
+        shared.add("returns", returns)
+        specs = shared.specs
+
+    In the worker process, attach to the same memory:
+
+        shared = SharedArrays.attach(specs)
+        returns = shared["returns"]
+
+    The parent process owns the memory and has to call unlink() when done,
+    workers only call close().
+    """
+
+    def __init__(self) -> None:
+        self.blocks = dict()
+        self.arrays = dict()
+        self.specs = dict()
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.arrays
+
+    def add(self, name: str, array: np.ndarray) -> np.ndarray:
+        """
+        Copy array into a new shared memory block
+
+        Parameters
+        ----------
+        name: str
+            name of array
+        array: np.array
+            array to share
+
+        Returns
+        -------
+        np.array
+            array backed by shared memory
+        """
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared_array = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        shared_array[...] = array
+
+        self.blocks[name] = block
+        self.arrays[name] = shared_array
+        self.specs[name] = dict(
+            name=block.name, shape=array.shape, dtype=array.dtype.str
+        )
+        return shared_array
+
+    @classmethod
+    def attach(cls, specs: dict):
+        """
+        Attach to shared memory blocks created in another process
+
+        Parameters
+        ----------
+        specs: dict
+            block name, shape and dtype per array, as in SharedArrays.specs
+
+        Returns
+        -------
+        SharedArrays
+            arrays backed by shared memory
+        """
+        shared = cls()
+        for name, spec in specs.items():
+            block = shared_memory.SharedMemory(name=spec["name"])
+            shared.blocks[name] = block
+            shared.arrays[name] = np.ndarray(
+                spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=block.buf
+            )
+            shared.specs[name] = spec
+        return shared
+
+    def close(self) -> None:
+        """
+        Release arrays and close access to shared memory blocks
+        """
+        self.arrays = dict()
+        for block in self.blocks.values():
+            block.close()
+
+    def unlink(self) -> None:
+        """
+        Close and free shared memory blocks, only called by the owning process
+        """
+        self.close()
+        for block in self.blocks.values():
+            block.unlink()
+        self.blocks = dict()